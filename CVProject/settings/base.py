@@ -93,15 +93,103 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+REDIS_URL = env('REDIS_URL', default=CELERY_BROKER_URL)
+
+# Shared cache (use a redis:// URL when running more than one web process)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
 
 # SendGrid email configuration
 SENDGRID_API_KEY = env('SENDGRID_API_KEY', default=None)
 SENDGRID_FROM_EMAIL = env('SENDGRID_FROM_EMAIL', default='noreply@example.com')
+SENDGRID_API_HOST = env('SENDGRID_API_HOST', default='https://api.sendgrid.com')
 
 # OpenAI
 OPENAI_API_KEY = env('OPENAI_API_KEY', default=None)
 OPENAI_MODEL = env('OPENAI_MODEL', default='gpt-4o-mini')
 OPENAI_PROJECT = env('OPENAI_PROJECT', default=None)
+OPENAI_BASE_URL = env('OPENAI_BASE_URL', default=None)
+# Load testing without network: OPENAI_FAKE swaps in an in-process client; the fake_providers
+# command serves the same fakes over HTTP for OPENAI_BASE_URL / SENDGRID_API_HOST
+OPENAI_FAKE = env.bool('OPENAI_FAKE', default=False)
+FAKE_PROVIDER_LATENCY_P50 = env.float('FAKE_PROVIDER_LATENCY_P50', default=0.0)
+FAKE_PROVIDER_LATENCY_P99 = env.float('FAKE_PROVIDER_LATENCY_P99', default=0.0)
+FAKE_PROVIDER_ERROR_RATE = env.float('FAKE_PROVIDER_ERROR_RATE', default=0.0)
+FAKE_PROVIDER_SEED = env.int('FAKE_PROVIDER_SEED', default=0)
+# Per-call deadline, circuit breaker and optional hedged retries for OpenAI calls
+OPENAI_TIMEOUT_SECONDS = env.float('OPENAI_TIMEOUT_SECONDS', default=30.0)
+OPENAI_MAX_RETRIES = env.int('OPENAI_MAX_RETRIES', default=1)
+OPENAI_CIRCUIT_FAILURE_THRESHOLD = env.int('OPENAI_CIRCUIT_FAILURE_THRESHOLD', default=5)
+OPENAI_CIRCUIT_RESET_SECONDS = env.float('OPENAI_CIRCUIT_RESET_SECONDS', default=30.0)
+OPENAI_HEDGE_ENABLED = env.bool('OPENAI_HEDGE_ENABLED', default=False)
+OPENAI_HEDGE_MIN_SAMPLES = env.int('OPENAI_HEDGE_MIN_SAMPLES', default=20)
+# Cap on simultaneous OpenAI calls across all workers (Redis lease semaphore; 'local' limits per process)
+OPENAI_CONCURRENCY_LIMIT = env.int('OPENAI_CONCURRENCY_LIMIT', default=8)
+OPENAI_CONCURRENCY_BACKEND = env('OPENAI_CONCURRENCY_BACKEND', default='redis')
+OPENAI_CONCURRENCY_LEASE_SECONDS = env.float('OPENAI_CONCURRENCY_LEASE_SECONDS', default=120.0)
+OPENAI_CONCURRENCY_WAIT_SECONDS = env.float('OPENAI_CONCURRENCY_WAIT_SECONDS', default=60.0)
+# Upper bound for the CV part of analysis prompts; long fields are summarized to fit
+OPENAI_PROMPT_TOKEN_BUDGET = env.int('OPENAI_PROMPT_TOKEN_BUDGET', default=1500)
+
+# AI analysis streaming (Server-Sent Events); backend is 'redis' or 'memory' (single process/tests)
+ANALYSIS_STREAMING_ENABLED = env.bool('ANALYSIS_STREAMING_ENABLED', default=True)
+ANALYSIS_STREAM_BACKEND = env('ANALYSIS_STREAM_BACKEND', default='redis')
+ANALYSIS_STREAM_TTL = env.int('ANALYSIS_STREAM_TTL', default=600)
+# Each SSE response holds a server thread; keep it under gunicorn's --timeout (browsers reconnect
+# and the replay buffer picks up where they left off)
+ANALYSIS_STREAM_TIMEOUT = env.int('ANALYSIS_STREAM_TIMEOUT', default=25)
+# Identical analysis requests (same CV content, question and model) share one task for this long;
+# in-flight keys live in Redis ('cache' uses the Django cache: single process/tests)
+ANALYSIS_COALESCE_ENABLED = env.bool('ANALYSIS_COALESCE_ENABLED', default=True)
+ANALYSIS_COALESCE_BACKEND = env('ANALYSIS_COALESCE_BACKEND', default='redis')
+ANALYSIS_COALESCE_TTL = env.int('ANALYSIS_COALESCE_TTL', default=300)
+
+# Long translation fields are split into chunks of this many tokens and translated concurrently
+TRANSLATION_CHUNK_TOKENS = env.int('TRANSLATION_CHUNK_TOKENS', default=500)
+TRANSLATION_CHUNK_CONCURRENCY = env.int('TRANSLATION_CHUNK_CONCURRENCY', default=4)
+
+# Translation provider routing: EWMA smoothing, share of exploratory calls, providers raced per call
+TRANSLATION_ROUTER_ALPHA = env.float('TRANSLATION_ROUTER_ALPHA', default=0.2)
+TRANSLATION_ROUTER_EXPLORE_RATE = env.float('TRANSLATION_ROUTER_EXPLORE_RATE', default=0.05)
+TRANSLATION_ROUTER_RACE = env.int('TRANSLATION_ROUTER_RACE', default=1)
+# Route to the Google/Microsoft stubs as well (development only: they do not translate)
+TRANSLATION_PLACEHOLDER_PROVIDERS = env.bool('TRANSLATION_PLACEHOLDER_PROVIDERS', default=False)
+
+# Standard review checklist answered in a single multi-question analysis request
+ANALYSIS_CHECKLIST_QUESTIONS = env.list('ANALYSIS_CHECKLIST_QUESTIONS', default=[
+    'What are the strongest parts of this CV?',
+    'Which skills or experience are missing for a senior role?',
+    'How can the bio be made more compelling?',
+    'Are the projects described with measurable impact?',
+])
+
+# Bulk analysis: parallel provider calls per job and items handled per task run
+BULK_ANALYSIS_CONCURRENCY = env.int('BULK_ANALYSIS_CONCURRENCY', default=4)
+BULK_ANALYSIS_MAX_CONCURRENCY = env.int('BULK_ANALYSIS_MAX_CONCURRENCY', default=8)
+BULK_ANALYSIS_BATCH_SIZE = env.int('BULK_ANALYSIS_BATCH_SIZE', default=50)
+# Seconds after which a running item of a vanished worker may be claimed again by a resume
+BULK_ANALYSIS_CLAIM_TIMEOUT = env.int('BULK_ANALYSIS_CLAIM_TIMEOUT', default=600)
+
+# CVs per page on the list page (keyset pagination, so deep pages cost the same as the first)
+CV_LIST_PAGE_SIZE = env.int('CV_LIST_PAGE_SIZE', default=24)
+# List/search result pages are cached until any CV changes. Invalidation only reaches other
+# processes through a shared cache, so this stays off unless CACHE_URL points at one
+_SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CV_LIST_CACHE_ENABLED = env.bool('CV_LIST_CACHE_ENABLED', default=_SHARED_CACHE)
+CV_LIST_CACHE_TTL = env.int('CV_LIST_CACHE_TTL', default=300)
+# Bulk CV endpoints: items accepted per request, and rows written per transaction
+CV_BULK_MAX_ITEMS = env.int('CV_BULK_MAX_ITEMS', default=1000)
+CV_BULK_BATCH_SIZE = env.int('CV_BULK_BATCH_SIZE', default=500)
+# Rows validated and inserted per transaction by the import_cvs command
+CV_IMPORT_BATCH_SIZE = env.int('CV_IMPORT_BATCH_SIZE', default=2000)
+# Rows fetched per database round trip by the streaming CV export
+CV_EXPORT_CHUNK_SIZE = env.int('CV_EXPORT_CHUNK_SIZE', default=2000)
+# CV pages and API responses carry ETag/Last-Modified and answer unchanged repeats with 304
+CONDITIONAL_GET_ENABLED = env.bool('CONDITIONAL_GET_ENABLED', default=True)
 
 # Auth redirects for UI
 LOGIN_URL = 'login'
@@ -110,6 +198,11 @@ LOGIN_REDIRECT_URL = 'cv_list'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'main.api.pagination.DefaultPagination',
+    # orjson-backed; falls back to DRF's stdlib encoder only if orjson cannot be imported
+    'DEFAULT_RENDERER_CLASSES': (
+        'main.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'PAGE_SIZE': 5,
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
@@ -117,6 +117,10 @@ beat_schedule = {
         'task': 'celery_tasks.tasks.cleanup.cleanup_old_logs',
         'schedule': 86400.0,  # Daily
     },
+    'cleanup-old-results': {
+        'task': 'celery_tasks.tasks.cleanup.cleanup_old_results',
+        'schedule': 86400.0,  # Daily
+    },
     'cleanup-old-pdfs': {
         'task': 'celery_tasks.tasks.cleanup.cleanup_old_pdf_files',
         'schedule': 604800.0,  # Weekly
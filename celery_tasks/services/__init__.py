@@ -3,16 +3,21 @@ Services package for Celery tasks.
 """
 from .base_service import BaseService
 from .analysis_service import AnalysisService
+from .bulk_analysis_service import BulkAnalysisService
 from .pdf_service import PDFService
 from .translation_service import TranslationService
 from .sendgrid_service import SendGridService
+from .stream_service import get_stream_broker, analysis_channel
 
 __all__ = [
     'BaseService',
     'AnalysisService',
+    'BulkAnalysisService',
     'PDFService', 
     'TranslationService',
     'SendGridService',
+    'get_stream_broker',
+    'analysis_channel',
 ]
 
 
@@ -1,11 +1,58 @@
 """
 Analysis service for handling CV analysis operations.
 """
-from typing import Dict, Optional
+import logging
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
 from celery.result import AsyncResult
+from django.conf import settings
 from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from main.models import AnalysisResult, CV, question_hash
 from .base_service import BaseService
 
+logger = logging.getLogger(__name__)
+
+# Task states after which an in-flight analysis can no longer produce a result
+FAILED_STATES = ('FAILURE', 'REVOKED')
+
+
+class RedisInflightStore:
+    """
+    In-flight analysis keys in Redis, shared by every web and worker process.
+
+    Offers the ``add``/``get``/``set``/``delete`` subset of the Django cache API that
+    coalescing uses, so the per-process cache can stand in for it in tests.
+    """
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        import redis  # type: ignore
+
+        self._redis = redis.Redis.from_url(
+            url or getattr(settings, 'REDIS_URL', None) or settings.CELERY_BROKER_URL,
+            socket_connect_timeout=2,
+        )
+
+    def add(self, key: str, value: str, ttl: int) -> bool:
+        return bool(self._redis.set(key, value, nx=True, ex=ttl))
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._redis.get(key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._redis.set(key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(key)
+
+
+def get_inflight_store():
+    """Store configured by ``ANALYSIS_COALESCE_BACKEND`` ('redis', or 'cache' for the Django cache)."""
+    if getattr(settings, 'ANALYSIS_COALESCE_BACKEND', 'redis') == 'cache':
+        return cache
+    return RedisInflightStore()
+
 
 class AnalysisService(BaseService):
     """Service for handling CV analysis operations."""
@@ -34,19 +81,199 @@ class AnalysisService(BaseService):
             return {'error': 'Analysis already in progress'}
         
         try:
-            task = self._get_task().delay(cv_id, question)
-            self._store_task_info(session, task.id, question)
-            return {'success': True, 'task_id': task.id}
+            task_id, coalesced = self._start_or_join_task(cv_id, question)
+            self._store_task_info(session, task_id, question, cv_id)
+            return {'success': True, 'task_id': task_id, 'coalesced': coalesced}
         except Exception as e:
             return {'error': str(e)}
     
-    def check_analysis_status(self, task_id: str, session: Session) -> Dict[str, str]:
+    def _start_or_join_task(self, cv_id: int, question: str) -> Tuple[str, bool]:
+        """
+        Queue an analysis task, or attach to an identical one that is already in flight.
+        
+        Requests are identical when the CV content, the normalized question and the model
+        match. The key is reserved with an atomic add in Redis before queuing, so concurrent
+        requests on any web process cannot both start a task; every attached session then
+        polls the same task and stores the shared answer as its own result.
+        
+        Returns:
+            Tuple of (task ID, whether an existing task was joined)
+        """
+        kwargs = {'stream': self.is_streaming_enabled()}
+        cv = CV.objects.filter(pk=cv_id).first()
+        if cv is None or not getattr(settings, 'ANALYSIS_COALESCE_ENABLED', True):
+            return self._get_task().delay(cv_id, question, **kwargs).id, False
+        
+        store = get_inflight_store()
+        key = self.coalesce_key(cv, question)
+        ttl = getattr(settings, 'ANALYSIS_COALESCE_TTL', 300)
+        task_id = str(uuid.uuid4())
+        if not store.add(key, task_id, ttl):
+            existing = store.get(key)
+            if existing and not self._is_failed(existing):
+                logger.info(f"Joining in-flight analysis task {existing} for CV {cv_id}")
+                return existing, True
+            # The previous task failed or the key just expired: take over the key
+            store.set(key, task_id, ttl)
+        
+        try:
+            self._get_task().apply_async(args=(cv_id, question), kwargs=kwargs, task_id=task_id)
+        except Exception:
+            store.delete(key)
+            raise
+        return task_id, False
+    
+    @staticmethod
+    def coalesce_key(cv: CV, question: str) -> str:
+        """Cache key identifying an analysis by CV content, normalized question and model."""
+        model = getattr(settings, 'OPENAI_MODEL', '')
+        return f"analysis:inflight:{cv.content_hash()}:{question_hash(question)}:{model}"
+    
+    @staticmethod
+    def _is_failed(task_id: str) -> bool:
+        try:
+            task_result = AsyncResult(task_id)
+            state = task_result.state
+            if state == 'SUCCESS':
+                return (task_result.result or {}).get('status') != 'success'
+            return state in FAILED_STATES
+        except Exception:
+            # Result backend unavailable: do not join a task we cannot check
+            return True
+    
+    def start_checklist(self, cv_id: int, questions: Sequence[str], session: Session, user=None) -> Dict[str, str]:
+        """
+        Answer a checklist of questions about a CV with one provider request.
+        
+        Questions with a stored answer newer than the CV's last edit are served from the
+        database; only the rest are sent, together, to analyze_cv_questions_task.
+        
+        Args:
+            cv_id: CV ID to analyze
+            questions: Checklist questions
+            session: Django session object
+            user: User the answers are stored for
+            
+        Returns:
+            Dict with success status, task ID (if a request was needed) and cached answer count
+        """
+        questions = list(dict.fromkeys(q.strip() for q in questions if q.strip()))
+        if not questions:
+            return {'error': 'No checklist questions configured'}
+        if (session.get('analysis_checklist') or {}).get('task_id'):
+            return {'error': 'Checklist analysis already in progress'}
+        cv = CV.objects.filter(pk=cv_id).first()
+        if cv is None:
+            return {'error': 'CV not found'}
+        
+        try:
+            cached = self._cached_answers(cv, questions)
+            for question, answer in cached.items():
+                self._store_answer(cv.pk, question, answer.analysis, answer.is_enabled, user)
+            missing = [q for q in questions if q not in cached]
+            task_id = None
+            if missing:
+                task_id = self._get_task('analyze_cv_questions_task').delay(cv_id, missing).id
+            session['analysis_checklist'] = {'cv_id': cv_id, 'questions': questions, 'task_id': task_id}
+            session.save()
+            return {'success': True, 'task_id': task_id, 'cached': len(cached)}
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def get_checklist_context(self, session: Session, user=None, cv_id: Optional[int] = None) -> Dict[str, any]:
+        """
+        Get checklist context for template rendering.
+        
+        Args:
+            session: Django session object
+            user: Current user; answers are looked up for them
+            cv_id: CV being shown; a checklist of another CV is left out
+        
+        Returns:
+            Dict with 'checklist_results' (stored answers in checklist order) and
+            'checklist_processing'
+        """
+        checklist = session.get('analysis_checklist')
+        if not checklist or (cv_id is not None and checklist.get('cv_id') != cv_id):
+            return {}
+        
+        task_id = checklist.get('task_id')
+        if task_id:
+            try:
+                task_result = AsyncResult(task_id)
+                state = task_result.state
+                if state == 'SUCCESS' and task_result.result.get('status') == 'success':
+                    result = task_result.result
+                    for question, answer in result['answers'].items():
+                        self._store_answer(result['cv_id'], question, answer, result['is_enabled'], user)
+                    checklist['task_id'] = task_id = None
+                elif state not in ('PENDING', 'STARTED', 'PROGRESS', 'RETRY'):
+                    checklist['task_id'] = task_id = None
+                session['analysis_checklist'] = checklist
+                session.save()
+            except Exception as e:
+                logger.error(f"Error checking checklist task {task_id}: {e}")
+        
+        hashes = {question_hash(q): q for q in checklist['questions']}
+        stored = {
+            record.question_hash: record
+            for record in AnalysisResult.objects.filter(
+                user=self._owner(user), cv_id=checklist['cv_id'], question_hash__in=list(hashes)
+            )
+        }
+        return {
+            'checklist_results': [stored[h] for h in hashes if h in stored],
+            'checklist_processing': bool(task_id),
+        }
+    
+    def clear_checklist(self, session: Session) -> None:
+        session.pop('analysis_checklist', None)
+        session.save()
+    
+    def checklist_questions(self) -> List[str]:
+        return list(getattr(settings, 'ANALYSIS_CHECKLIST_QUESTIONS', []))
+    
+    @staticmethod
+    def _cached_answers(cv: CV, questions: Sequence[str]) -> Dict[str, AnalysisResult]:
+        """
+        Stored answers (by any user) to these questions that are newer than the CV's last edit.
+        
+        Only real answers are shared: provider errors are stored disabled, and older rows
+        holding an error message are skipped as well.
+        """
+        from main.services import is_failed_analysis
+        
+        hashes = {question_hash(q): q for q in questions}
+        records = AnalysisResult.objects.filter(
+            cv=cv, question_hash__in=list(hashes), is_enabled=True, updated_at__gte=cv.updated_at
+        ).order_by('-updated_at')
+        cached: Dict[str, AnalysisResult] = {}
+        for record in records:
+            if not is_failed_analysis(record.analysis):
+                cached.setdefault(hashes[record.question_hash], record)
+        return cached
+    
+    def _store_answer(self, cv_id: int, question: str, analysis: str, is_enabled: bool, user=None) -> AnalysisResult:
+        from main.services import is_failed_analysis
+        
+        # An error message in place of an answer must never be served as one
+        is_enabled = is_enabled and not is_failed_analysis(analysis)
+        record, _ = AnalysisResult.objects.update_or_create(
+            user=self._owner(user),
+            cv_id=cv_id,
+            question_hash=question_hash(question),
+            defaults={'question': question, 'analysis': analysis, 'is_enabled': is_enabled},
+        )
+        return record
+    
+    def check_analysis_status(self, task_id: str, session: Session, user=None) -> Dict[str, str]:
         """
         Check analysis task status.
         
         Args:
             task_id: Celery task ID
             session: Django session object
+            user: User the completed result is stored for
             
         Returns:
             Dict with status and results
@@ -56,9 +283,9 @@ class AnalysisService(BaseService):
             
             if task_result.state == 'PENDING':
                 return {'status': 'pending', 'message': 'Analysis in progress...'}
-            elif task_result.state == 'SUCCESS':
+            elif task_result.state == 'SUCCESS' and task_result.result.get('status') == 'success':
                 result = task_result.result
-                self._store_completed_analysis(session, result)
+                self._store_completed_analysis(session, result, user)
                 return {
                     'status': 'success',
                     'analysis': result['analysis'],
@@ -82,14 +309,17 @@ class AnalysisService(BaseService):
             Dict with success status
         """
         self._clear_analysis_session(session)
+        self.clear_checklist(session)
         return {'success': True, 'message': 'Analysis state cleared'}
     
-    def get_analysis_context(self, session: Session) -> Dict[str, any]:
+    def get_analysis_context(self, session: Session, user=None, cv_id: Optional[int] = None) -> Dict[str, any]:
         """
         Get analysis context for template rendering.
         
         Args:
             session: Django session object
+            user: Current user; completed results are looked up for them
+            cv_id: CV being shown; analyses of other CVs are left out
             
         Returns:
             Dict with analysis context data
@@ -98,24 +328,25 @@ class AnalysisService(BaseService):
             'analysis_warning': '',
             'analysis_complete': None,
             'analysis_processing': False,
-            'analysis_question': ''
+            'analysis_question': '',
+            'analysis_streaming': self.is_streaming_enabled()
         }
         
         # Check for completed analysis first
-        analysis_complete = session.get('analysis_complete')
+        analysis_complete = self._load_completed_analysis(session, user, cv_id)
         if analysis_complete:
             context['analysis_complete'] = analysis_complete
         else:
             # Only check for pending tasks if no completed analysis
             analysis_task_id = session.get('analysis_task_id')
-            if analysis_task_id:
+            if analysis_task_id and (cv_id is None or session.get('analysis_cv_id') == cv_id):
                 # Only check task status if we haven't checked in the last 2 seconds
                 last_check = session.get('analysis_last_check', 0)
                 import time
                 current_time = time.time()
                 
                 if current_time - last_check > 2:  # 2 second cooldown
-                    context.update(self._handle_pending_task(analysis_task_id, session))
+                    context.update(self._handle_pending_task(analysis_task_id, session, user))
                     session['analysis_last_check'] = current_time
                 else:
                     # Use cached status
@@ -130,7 +361,11 @@ class AnalysisService(BaseService):
         
         return context
     
-    def _handle_pending_task(self, task_id: str, session: Session) -> Dict[str, any]:
+    def is_streaming_enabled(self) -> bool:
+        """Check if analysis answers are streamed to the browser as they are generated."""
+        return getattr(settings, 'ANALYSIS_STREAMING_ENABLED', True)
+    
+    def _handle_pending_task(self, task_id: str, session: Session, user=None) -> Dict[str, any]:
         """Handle pending analysis task."""
         import logging
         logger = logging.getLogger(__name__)
@@ -152,21 +387,9 @@ class AnalysisService(BaseService):
                     'analysis_question': session.get('analysis_question', '')
                 }
             
-            if state == 'SUCCESS':
-                result = task_result.result
-                analysis_data = {
-                    'question': session.get('analysis_question', ''),
-                    'analysis': result['analysis'],
-                    'is_enabled': result['is_enabled']
-                }
-                # Store the completed analysis in session
-                session['analysis_complete'] = analysis_data
-                # Clear only the processing-related session data, keep the result
-                session.pop('analysis_task_id', None)
-                session.pop('analysis_processing', None)
-                # Save the session to ensure it's persisted
-                session.save()
-                return {'analysis_complete': analysis_data}
+            if state == 'SUCCESS' and task_result.result.get('status') == 'success':
+                # Persist the result server-side; the session only keeps its id
+                return {'analysis_complete': self._store_completed_analysis(session, task_result.result, user)}
             elif state == 'PENDING':
                 return {
                     'analysis_processing': True,
@@ -188,29 +411,49 @@ class AnalysisService(BaseService):
                 'analysis_question': session.get('analysis_question', '')
             }
     
-    def _store_task_info(self, session: Session, task_id: str, question: str) -> None:
+    def _store_task_info(self, session: Session, task_id: str, question: str, cv_id: int) -> None:
         """Store task information in session."""
         session['analysis_task_id'] = task_id
+        session['analysis_cv_id'] = cv_id
         session['analysis_question'] = question
         session['analysis_processing'] = True
         session.save()
     
-    def _store_completed_analysis(self, session: Session, result: Dict) -> None:
-        """Store completed analysis results in session."""
-        session['analysis_complete'] = {
-            'question': session.get('analysis_question', ''),
-            'analysis': result['analysis'],
-            'is_enabled': result['is_enabled']
-        }
-        # Clear only the processing-related session data, keep the result
+    def _store_completed_analysis(self, session: Session, result: Dict, user=None) -> AnalysisResult:
+        """Persist completed analysis results and point the session at them."""
+        question = session.get('analysis_question') or result.get('question', '')
+        record = self._store_answer(result['cv_id'], question, result['analysis'], result['is_enabled'], user)
+        session['analysis_result_id'] = record.pk
+        # Clear only the processing-related session data, keep the result pointer
         session.pop('analysis_task_id', None)
+        session.pop('analysis_cv_id', None)
         session.pop('analysis_processing', None)
         session.save()
+        return record
+    
+    def _load_completed_analysis(self, session: Session, user=None, cv_id: Optional[int] = None) -> Optional[AnalysisResult]:
+        """Load the completed analysis the session points at, if it is about ``cv_id``."""
+        result_id = session.get('analysis_result_id')
+        if not result_id:
+            return None
+        record = AnalysisResult.objects.filter(pk=result_id, user=self._owner(user)).first()
+        if record is None:
+            session.pop('analysis_result_id', None)
+        elif cv_id is not None and record.cv_id != cv_id:
+            # Kept in the session: it shows again on its own CV's page
+            return None
+        return record
+    
+    @staticmethod
+    def _owner(user):
+        return user if user is not None and user.is_authenticated else None
     
     def _clear_analysis_session(self, session: Session) -> None:
         """Clear analysis-related session data."""
         session.pop('analysis_task_id', None)
+        session.pop('analysis_cv_id', None)
         session.pop('analysis_question', None)
         session.pop('analysis_processing', None)
-        session.pop('analysis_complete', None)
+        session.pop('analysis_result_id', None)
+        session.pop('analysis_complete', None)  # full-text result stored by older versions
         session.save()
@@ -1,7 +1,7 @@
 """
 Base service class with common functionality.
 """
-from typing import Any
+from typing import Any, Optional
 from celery import shared_task
 
 
@@ -12,13 +12,14 @@ class BaseService:
         self._task_module = None
         self._task_name = None
     
-    def _get_task(self):
-        """Get Celery task dynamically."""
-        if not self._task_module or not self._task_name:
+    def _get_task(self, task_name: Optional[str] = None):
+        """Get Celery task dynamically (the service's default task unless ``task_name`` is given)."""
+        task_name = task_name or self._task_name
+        if not self._task_module or not task_name:
             raise ValueError("Task module and name must be set")
         
-        module = __import__(self._task_module, fromlist=[self._task_name])
-        return getattr(module, self._task_name)
+        module = __import__(self._task_module, fromlist=[task_name])
+        return getattr(module, task_name)
     
     def is_enabled(self) -> bool:
         """Check if service is enabled."""
@@ -0,0 +1,106 @@
+"""
+Bulk analysis service: ask one question about many CVs.
+"""
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from main.filters.cv_filters import filter_cvs_by_query
+from main.models import BulkAnalysisItem, BulkAnalysisJob, CV
+from .base_service import BaseService
+from .stream_service import bulk_analysis_channel, get_stream_broker
+
+
+class BulkAnalysisService(BaseService):
+    """Service for creating, running and resuming bulk analysis jobs."""
+
+    def __init__(self):
+        super().__init__()
+        self._task_module = 'celery_tasks.tasks.analysis'
+        self._task_name = 'run_bulk_analysis_task'
+
+    def create_job(self, owner, question: str, query: str = '', concurrency: Optional[int] = None) -> BulkAnalysisJob:
+        """
+        Create a job with one pending item per CV matching ``query`` and queue it.
+
+        Args:
+            owner: User the job belongs to
+            question: Question asked of every CV
+            query: CV search filter (same semantics as the CV list search box)
+            concurrency: Parallel provider calls; capped by BULK_ANALYSIS_MAX_CONCURRENCY
+
+        Returns:
+            The created job
+        """
+        max_concurrency = getattr(settings, 'BULK_ANALYSIS_MAX_CONCURRENCY', 8)
+        concurrency = concurrency or getattr(settings, 'BULK_ANALYSIS_CONCURRENCY', 4)
+        concurrency = max(1, min(concurrency, max_concurrency))
+
+        with transaction.atomic():
+            job = BulkAnalysisJob.objects.create(
+                owner=owner,
+                question=question.strip(),
+                query=(query or '').strip(),
+                concurrency=concurrency,
+            )
+            cv_ids = filter_cvs_by_query(CV.objects.all(), job.query).values_list('id', flat=True)
+            BulkAnalysisItem.objects.bulk_create(
+                [BulkAnalysisItem(job=job, cv_id=cv_id) for cv_id in cv_ids.iterator()],
+                batch_size=500,
+            )
+        transaction.on_commit(lambda: self.enqueue(job))
+        return job
+
+    def enqueue(self, job: BulkAnalysisJob) -> None:
+        """Queue (or re-queue) processing of the job's unfinished items."""
+        task = self._get_task().delay(job.pk)
+        BulkAnalysisJob.objects.filter(pk=job.pk).update(task_id=task.id)
+
+    def _claim_cutoff(self):
+        return timezone.now() - timedelta(seconds=getattr(settings, 'BULK_ANALYSIS_CLAIM_TIMEOUT', 600))
+
+    def is_active(self, job: BulkAnalysisJob) -> bool:
+        """
+        True while a run is working on the job: it holds recent claims on items, or the job
+        was queued or heartbeat within BULK_ANALYSIS_CLAIM_TIMEOUT.
+        """
+        cutoff = self._claim_cutoff()
+        if job.items.filter(status=BulkAnalysisItem.STATUS_RUNNING, claimed_at__gte=cutoff).exists():
+            return True
+        return BulkAnalysisJob.objects.filter(pk=job.pk).filter(self._live_job_q(cutoff)).exists()
+
+    def _live_job_q(self, cutoff) -> Q:
+        return Q(status__in=[BulkAnalysisJob.STATUS_PENDING, BulkAnalysisJob.STATUS_RUNNING], updated_at__gte=cutoff)
+
+    def resume_job(self, job: BulkAnalysisJob) -> bool:
+        """
+        Resume a job whose run stopped before finishing (e.g. after a worker restart) or retry its failed items.
+
+        Nothing happens while a run is still active, so resuming never starts a second run next
+        to a live one. Items left running by a vanished run are claimed again once their claim
+        is older than BULK_ANALYSIS_CLAIM_TIMEOUT.
+
+        Returns:
+            True if the job was re-queued
+        """
+        if self.is_active(job):
+            return False
+        retry = job.items.filter(status__in=[BulkAnalysisItem.STATUS_FAILED, BulkAnalysisItem.STATUS_RUNNING])
+        if job.status == BulkAnalysisJob.STATUS_COMPLETED and not retry.exists():
+            return False
+        # Take the job over atomically; a concurrent resume that got here first wins
+        taken = BulkAnalysisJob.objects.filter(pk=job.pk).exclude(self._live_job_q(self._claim_cutoff())).update(
+            status=BulkAnalysisJob.STATUS_PENDING, completed_at=None, updated_at=timezone.now()
+        )
+        if not taken:
+            return False
+        # Failed and abandoned items get another attempt; completed ones are never re-run
+        retry.update(status=BulkAnalysisItem.STATUS_PENDING, error='', claimed_by='', claimed_at=None)
+        # Subscribers would otherwise replay the previous run up to its 'done' event and stop
+        get_stream_broker().reset(bulk_analysis_channel(job.pk))
+        self.enqueue(job)
+        return True
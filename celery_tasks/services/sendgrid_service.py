@@ -6,6 +6,7 @@ import os
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Attachment, FileContent, FileName, FileType, Disposition
 import base64
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,8 @@ class SendGridService:
         if not self.api_key:
             raise ValueError("SendGrid API key is required")
         
-        self.sg = SendGridAPIClient(api_key=self.api_key)
+        # SENDGRID_API_HOST points at the fake_providers server for offline load tests
+        self.sg = SendGridAPIClient(api_key=self.api_key, host=getattr(settings, 'SENDGRID_API_HOST', 'https://api.sendgrid.com'))
         self.from_email = os.getenv('SENDGRID_FROM_EMAIL', 'noreply@yourdomain.com')
         logger.info("📧 SendGrid service initialized")
 
@@ -0,0 +1,160 @@
+"""
+Stream broker for relaying incremental task output (e.g. AI analysis tokens) to web clients.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Protocol
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_EVENT = 'chunk'
+ROW_EVENT = 'row'
+DONE_EVENT = 'done'
+FAILED_EVENT = 'failed'
+TERMINAL_EVENTS = (DONE_EVENT, FAILED_EVENT)
+
+
+@dataclass
+class StreamEvent:
+    seq: int
+    event: str
+    data: str
+
+    def to_json(self) -> str:
+        return json.dumps({'seq': self.seq, 'event': self.event, 'data': self.data})
+
+    @classmethod
+    def from_json(cls, raw) -> 'StreamEvent':
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        payload = json.loads(raw)
+        return cls(seq=payload['seq'], event=payload['event'], data=payload['data'])
+
+
+class StreamBroker(Protocol):
+    def publish(self, channel: str, event: str, data: str = '') -> None: ...
+    def subscribe(self, channel: str, timeout: float) -> Iterator[StreamEvent]: ...
+    def reset(self, channel: str) -> None: ...
+
+
+class RedisStreamBroker:
+    """
+    Redis pub/sub broker.
+
+    Every event is also appended to a short-lived replay buffer, so a subscriber that
+    connects after the first tokens were published still receives the full stream.
+    """
+
+    def __init__(self, url: Optional[str] = None, ttl: Optional[int] = None) -> None:
+        import redis  # type: ignore
+
+        self.url = url or getattr(settings, 'REDIS_URL', None) or settings.CELERY_BROKER_URL
+        self.ttl = ttl or getattr(settings, 'ANALYSIS_STREAM_TTL', 600)
+        self._redis = redis.Redis.from_url(self.url)
+
+    def publish(self, channel: str, event: str, data: str = '') -> None:
+        seq = self._redis.incr(f"{channel}:seq")
+        payload = StreamEvent(seq=seq, event=event, data=data).to_json()
+        pipe = self._redis.pipeline()
+        pipe.rpush(f"{channel}:buffer", payload)
+        pipe.expire(f"{channel}:buffer", self.ttl)
+        pipe.expire(f"{channel}:seq", self.ttl)
+        pipe.publish(channel, payload)
+        pipe.execute()
+
+    def reset(self, channel: str) -> None:
+        """Drop the replay buffer, so a channel reused for a new run does not replay the old one."""
+        self._redis.delete(f"{channel}:buffer")
+
+    def subscribe(self, channel: str, timeout: float) -> Iterator[StreamEvent]:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        # Subscribe before reading the backlog so nothing published in between is lost
+        pubsub.subscribe(channel)
+        last_seq = 0
+        try:
+            for raw in self._redis.lrange(f"{channel}:buffer", 0, -1):
+                event = StreamEvent.from_json(raw)
+                last_seq = event.seq
+                yield event
+                if event.event in TERMINAL_EVENTS:
+                    return
+
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                message = pubsub.get_message(timeout=1.0)
+                if not message or message.get('type') != 'message':
+                    continue
+                event = StreamEvent.from_json(message['data'])
+                if event.seq <= last_seq:
+                    continue
+                last_seq = event.seq
+                yield event
+                if event.event in TERMINAL_EVENTS:
+                    return
+        finally:
+            pubsub.close()
+
+
+class InMemoryStreamBroker:
+    """In-process stand-in for the Redis broker, used in tests and single-process setups."""
+
+    def __init__(self) -> None:
+        self._events: Dict[str, List[StreamEvent]] = {}
+        self._condition = threading.Condition()
+
+    def publish(self, channel: str, event: str, data: str = '') -> None:
+        with self._condition:
+            events = self._events.setdefault(channel, [])
+            events.append(StreamEvent(seq=len(events) + 1, event=event, data=data))
+            self._condition.notify_all()
+
+    def subscribe(self, channel: str, timeout: float) -> Iterator[StreamEvent]:
+        deadline = time.monotonic() + timeout
+        position = 0
+        while True:
+            with self._condition:
+                events = self._events.get(channel, [])
+                while position >= len(events):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    self._condition.wait(remaining)
+                    events = self._events.get(channel, [])
+                pending = events[position:]
+                position = len(events)
+            for event in pending:
+                yield event
+                if event.event in TERMINAL_EVENTS:
+                    return
+
+    def reset(self, channel: str) -> None:
+        with self._condition:
+            self._events.pop(channel, None)
+
+    def clear(self) -> None:
+        with self._condition:
+            self._events.clear()
+
+
+_memory_broker = InMemoryStreamBroker()
+
+
+def get_stream_broker() -> StreamBroker:
+    """Return the broker configured by ``ANALYSIS_STREAM_BACKEND`` ('redis' or 'memory')."""
+    backend = getattr(settings, 'ANALYSIS_STREAM_BACKEND', 'redis')
+    if backend == 'memory':
+        return _memory_broker
+    return RedisStreamBroker()
+
+
+def analysis_channel(task_id: str) -> str:
+    return f"analysis:stream:{task_id}"
+
+
+def bulk_analysis_channel(job_id: int) -> str:
+    return f"analysis:bulk:{job_id}"
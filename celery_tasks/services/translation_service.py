@@ -1,22 +1,37 @@
 """
 Translation service for handling CV translation operations.
 """
+import logging
 from typing import Dict, Tuple, Optional
+from django.conf import settings
 from django.contrib.sessions.models import Session
+from main.common.routing import NoProviderResult, get_provider_router
 from main.enums import Language
 from .base_service import BaseService
 
+logger = logging.getLogger(__name__)
+
 
 class TranslationService(BaseService):
     """Service for handling CV translation operations."""
     
     def __init__(self):
         super().__init__()
-        self._translation_providers = {
-            'google': self._translate_with_google,
-            'microsoft': self._translate_with_microsoft,
-            'openai': self._translate_with_openai
-        }
+        self._translation_providers = {'openai': self._translate_with_openai}
+        if getattr(settings, 'TRANSLATION_PLACEHOLDER_PROVIDERS', False):
+            # Stubs answer instantly and would always win the latency ranking
+            self._translation_providers.update({
+                'google': self._translate_with_google,
+                'microsoft': self._translate_with_microsoft,
+            })
+        self.router = get_provider_router(
+            'translation',
+            list(self._translation_providers),
+            alpha=getattr(settings, 'TRANSLATION_ROUTER_ALPHA', 0.2),
+            explore_rate=getattr(settings, 'TRANSLATION_ROUTER_EXPLORE_RATE', 0.05),
+            race=getattr(settings, 'TRANSLATION_ROUTER_RACE', 1),
+        )
+        self.last_provider: Optional[str] = None
     
     def translate_cv(self, cv, target_language: str) -> Tuple[Dict[str, str], bool]:
         """
@@ -50,20 +65,22 @@ class TranslationService(BaseService):
         if not lang_enum:
             return {}, False
         
-        translations = {}
-        enabled = False
-        
-        for provider_name, translate_func in self._translation_providers.items():
-            try:
-                result = translate_func(cv, lang_enum.value)
-                if result:
-                    translations.update(result)
-                    enabled = True
-                    break
-            except Exception:
-                continue
+        return self._translate_routed(cv, lang_enum.value)
+    
+    def _translate_routed(self, cv, language: str) -> Tuple[Dict[str, str], bool]:
+        """Fastest healthy provider first; the router falls through to the others on failure."""
+        try:
+            provider_name, result = self.router.call(self._translation_providers, cv, language)
+        except NoProviderResult:
+            logger.warning(f"No translation provider could translate CV {cv.id} to {language}")
+            self.last_provider = None
+            return {}, False
         
-        return translations, enabled
+        self.last_provider = provider_name
+        logger.info(f"CV {cv.id} translated to {language} by {provider_name}")
+        translations = dict(result)
+        translations['provider'] = provider_name
+        return translations, True
     
     def get_available_languages(self) -> list:
         """Get list of available languages."""
@@ -172,6 +189,10 @@ class TranslationService(BaseService):
         return None
     
     def _translate_with_openai(self, cv, target_language: str) -> Optional[Dict[str, str]]:
-        """Translate using OpenAI (placeholder)."""
-        # Placeholder implementation
-        return None
+        """Translate using OpenAI; provider errors raise, so the router counts them as failures."""
+        from main.services import OpenAITranslationProvider, TranslationService as OpenAITranslationService
+        
+        service = OpenAITranslationService(OpenAITranslationProvider(raise_errors=True))
+        translations, enabled = service.translate_cv(cv, target_language)
+        # Without an API key the provider echoes the input; report that as no result
+        return translations if enabled else None
@@ -7,6 +7,7 @@ from .analysis import *
 from .notification import *
 from .cleanup import *
 from .statistics import *
+from .indexing import *
 
 __all__ = [
     # PDF tasks
@@ -21,6 +22,8 @@ __all__ = [
     
     # Analysis tasks
     'analyze_cv_task',
+    'analyze_cv_questions_task',
+    'run_bulk_analysis_task',
     
     # Notification tasks
     'send_notification_email',
@@ -29,10 +32,14 @@ __all__ = [
     
     # Cleanup tasks
     'cleanup_old_logs',
+    'cleanup_old_results',
     'cleanup_old_pdf_files',
     'cleanup_orphaned_files',
     
     # Statistics tasks
     'generate_daily_stats',
     'generate_weekly_report',
+    
+    # Indexing tasks
+    'index_imported_cvs_task',
 ]
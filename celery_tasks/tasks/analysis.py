@@ -1,28 +1,46 @@
 """
 CV analysis tasks.
 """
-from typing import Dict, Any
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from celery import shared_task
 from django.conf import settings
+from django.db import connection
+from django.utils import timezone
 
-from main.models import CV
-from main.services import CVAnalysisService
+from main.models import BulkAnalysisItem, BulkAnalysisJob, CV
+from main.services import ANALYSIS_FAILED_PREFIX, CVAnalysisService, is_failed_analysis
+from celery_tasks.services.stream_service import (
+    CHUNK_EVENT,
+    DONE_EVENT,
+    FAILED_EVENT,
+    ROW_EVENT,
+    analysis_channel,
+    bulk_analysis_channel,
+    get_stream_broker,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, name='celery_tasks.tasks.analysis.analyze_cv_task')
-def analyze_cv_task(self, cv_id: int, question: str) -> Dict[str, Any]:
+def analyze_cv_task(self, cv_id: int, question: str, stream: bool = False) -> Dict[str, Any]:
     """
     Analyze CV content using AI.
     
     Args:
         cv_id: CV ID to analyze
         question: Analysis question
+        stream: Publish answer chunks to the task's stream channel as they arrive
         
     Returns:
         Dict with analysis results
     """
-    import logging
-    logger = logging.getLogger(__name__)
+    broker = get_stream_broker() if stream else None
+    channel = analysis_channel(self.request.id)
     
     try:
         logger.info(f"Starting analysis for CV {cv_id} with question: {question}")
@@ -45,7 +63,10 @@ def analyze_cv_task(self, cv_id: int, question: str) -> Dict[str, Any]:
         
         # Perform analysis
         logger.info("Calling analysis service...")
-        analysis, is_enabled = analysis_service.analyze_cv(cv, question)
+        if broker:
+            analysis, is_enabled = _stream_analysis(analysis_service, cv, question, broker, channel)
+        else:
+            analysis, is_enabled = analysis_service.analyze_cv(cv, question)
         logger.info(f"Analysis completed. Enabled: {is_enabled}, Analysis length: {len(analysis) if analysis else 0}")
         
         # Update progress
@@ -73,6 +94,7 @@ def analyze_cv_task(self, cv_id: int, question: str) -> Dict[str, Any]:
     except CV.DoesNotExist:
         error_msg = f'CV with ID {cv_id} not found'
         logger.error(error_msg)
+        _publish_failure(broker, channel, error_msg)
         return {
             'status': 'error',
             'error': error_msg
@@ -80,7 +102,184 @@ def analyze_cv_task(self, cv_id: int, question: str) -> Dict[str, Any]:
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Analysis task failed: {error_msg}")
+        _publish_failure(broker, channel, error_msg)
+        return {
+            'status': 'error',
+            'error': error_msg
+        }
+
+
+def _stream_analysis(analysis_service: CVAnalysisService, cv: CV, question: str, broker, channel: str) -> Tuple[str, bool]:
+    """
+    Publish answer chunks as they arrive. A stream that breaks off mid-answer ends with
+    FAILED_EVENT and is returned as a failure, so the partial text is never kept as an answer.
+    """
+    chunks = []
+    try:
+        for chunk in analysis_service.stream_analysis(cv, question):
+            chunks.append(chunk)
+            broker.publish(channel, CHUNK_EVENT, chunk)
+    except Exception as e:
+        analysis = f"{ANALYSIS_FAILED_PREFIX} {e}"
+        logger.warning(f"Analysis stream for CV {cv.pk} broke off after {len(chunks)} chunks: {e}")
+        _publish_failure(broker, channel, analysis)
+        return analysis, False
+    analysis = ''.join(chunks)
+    is_enabled = analysis_service.provider.is_enabled() and not is_failed_analysis(analysis)
+    broker.publish(channel, DONE_EVENT)
+    return analysis, is_enabled
+
+
+def _publish_failure(broker, channel: str, error_msg: str) -> None:
+    """Tell stream subscribers the analysis ended without a result."""
+    if not broker:
+        return
+    try:
+        broker.publish(channel, FAILED_EVENT, error_msg)
+    except Exception:
+        pass
+
+
+@shared_task(bind=True, name='celery_tasks.tasks.analysis.analyze_cv_questions_task')
+def analyze_cv_questions_task(self, cv_id: int, questions: List[str]) -> Dict[str, Any]:
+    """
+    Answer several questions about a CV in a single provider call.
+    
+    Args:
+        cv_id: CV ID to analyze
+        questions: Analysis questions
+        
+    Returns:
+        Dict with one answer per question and the questions that failed
+    """
+    try:
+        logger.info(f"Starting {len(questions)}-question analysis for CV {cv_id}")
+        cv = CV.objects.get(pk=cv_id)
+        answers, is_enabled = CVAnalysisService().analyze_cv_questions(cv, questions)
+        return {
+            'status': 'success',
+            'answers': answers,
+            'is_enabled': is_enabled,
+            # Questions the provider could not answer; their text is an error message
+            'failed': [question for question, answer in answers.items() if is_failed_analysis(answer)],
+            'cv_id': cv_id
+        }
+    except CV.DoesNotExist:
+        error_msg = f'CV with ID {cv_id} not found'
+        logger.error(error_msg)
+        return {
+            'status': 'error',
+            'error': error_msg
+        }
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"Multi-question analysis task failed: {error_msg}")
         return {
             'status': 'error',
             'error': error_msg
         }
+
+
+@shared_task(bind=True, name='celery_tasks.tasks.analysis.run_bulk_analysis_task')
+def run_bulk_analysis_task(self, job_id: int) -> Dict[str, Any]:
+    """
+    Process the next batch of pending items of a bulk analysis job.
+    
+    Provider calls run concurrently, limited by the job's concurrency. Each batch is
+    claimed before it is processed, so a second run of the same job never repeats its
+    items. Each result is saved as it arrives and published to the job's stream channel.
+    While pending items remain the task re-queues itself.
+    
+    Args:
+        job_id: BulkAnalysisJob ID
+        
+    Returns:
+        Dict with batch results
+    """
+    try:
+        job = BulkAnalysisJob.objects.get(pk=job_id)
+    except BulkAnalysisJob.DoesNotExist:
+        error_msg = f'Bulk analysis job {job_id} not found'
+        logger.error(error_msg)
+        return {'status': 'error', 'error': error_msg}
+    
+    # updated_at doubles as the run's heartbeat (see BulkAnalysisService.is_active)
+    BulkAnalysisJob.objects.filter(pk=job_id).update(status=BulkAnalysisJob.STATUS_RUNNING, updated_at=timezone.now())
+    batch_size = getattr(settings, 'BULK_ANALYSIS_BATCH_SIZE', 50)
+    pending = _claim_batch(job, self.request.id or uuid.uuid4().hex, batch_size)
+    broker = get_stream_broker()
+    channel = bulk_analysis_channel(job_id)
+    analysis_service = CVAnalysisService()
+    
+    def process(item: Tuple[int, int]) -> str:
+        item_id, cv_id = item
+        name = ''
+        try:
+            cv = CV.objects.get(pk=cv_id)
+            name = f"{cv.firstname} {cv.lastname}"
+            analysis, answered = analysis_service.analyze_cv(cv, job.question)
+            if not answered:
+                # Provider errors come back as text; failed items are retried on resume
+                raise RuntimeError(analysis)
+            fields = {'status': BulkAnalysisItem.STATUS_COMPLETED, 'analysis': analysis, 'error': ''}
+        except Exception as e:
+            logger.error(f"Bulk analysis {job_id}: CV {cv_id} failed: {e}")
+            fields = {'status': BulkAnalysisItem.STATUS_FAILED, 'analysis': '', 'error': str(e)}
+        fields['completed_at'] = timezone.now()
+        try:
+            BulkAnalysisItem.objects.filter(pk=item_id).update(**fields)
+        finally:
+            # Worker threads open their own DB connections
+            connection.close()
+        _publish(broker, channel, ROW_EVENT, json.dumps({
+            'id': item_id, 'cv_id': cv_id, 'name': name,
+            'status': fields['status'], 'analysis': fields['analysis'], 'error': fields['error'],
+        }))
+        return fields['status']
+    
+    with ThreadPoolExecutor(max_workers=max(1, job.concurrency)) as pool:
+        statuses = list(pool.map(process, pending))
+    
+    remaining = job.items.filter(status=BulkAnalysisItem.STATUS_PENDING).count()
+    if remaining:
+        BulkAnalysisJob.objects.filter(pk=job_id).update(updated_at=timezone.now())
+        self.apply_async(args=(job_id,))
+    elif not job.items.filter(status=BulkAnalysisItem.STATUS_RUNNING).exists():
+        # Items still running belong to another run, which completes the job when it is done
+        BulkAnalysisJob.objects.filter(pk=job_id).update(
+            status=BulkAnalysisJob.STATUS_COMPLETED, completed_at=timezone.now()
+        )
+        _publish(broker, channel, DONE_EVENT)
+    
+    return {
+        'status': 'success',
+        'job_id': job_id,
+        'processed': len(statuses),
+        'failed': statuses.count(BulkAnalysisItem.STATUS_FAILED),
+        'remaining': remaining,
+    }
+
+
+def _claim_batch(job: BulkAnalysisJob, claim: str, batch_size: int) -> List[Tuple[int, int]]:
+    """
+    Move up to ``batch_size`` pending items to running under ``claim`` and return their
+    (id, cv_id). The UPDATE only takes rows that are still pending, so items another run
+    claimed in the meantime are left to it.
+    """
+    candidates = list(
+        job.items.filter(status=BulkAnalysisItem.STATUS_PENDING).values_list('id', flat=True)[:batch_size]
+    )
+    job.items.filter(pk__in=candidates, status=BulkAnalysisItem.STATUS_PENDING).update(
+        status=BulkAnalysisItem.STATUS_RUNNING, claimed_by=claim, claimed_at=timezone.now()
+    )
+    return list(
+        job.items.filter(status=BulkAnalysisItem.STATUS_RUNNING, claimed_by=claim).values_list('id', 'cv_id')
+    )
+
+
+def _publish(broker, channel: str, event: str, data: str = '') -> None:
+    """Publish to stream subscribers; results are already saved, so delivery is best effort."""
+    try:
+        broker.publish(channel, event, data)
+    except Exception as e:
+        logger.warning(f"Stream publish to {channel} failed: {e}")
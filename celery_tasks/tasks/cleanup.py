@@ -8,7 +8,7 @@ from celery import shared_task
 from django.conf import settings
 from django.utils import timezone
 
-from main.models import RequestLog
+from main.models import AnalysisResult, RequestLog, TranslationResult
 
 
 @shared_task(bind=True, name='celery_tasks.tasks.cleanup.cleanup_old_logs')
@@ -45,6 +45,38 @@ def cleanup_old_logs(self, days: int = 30) -> Dict[str, Any]:
         }
 
 
+@shared_task(bind=True, name='celery_tasks.tasks.cleanup.cleanup_old_results')
+def cleanup_old_results(self, days: int = 30) -> Dict[str, Any]:
+    """
+    Clean up stored analysis and translation results that have not been refreshed.
+    
+    Args:
+        days: Number of days to keep results
+        
+    Returns:
+        Dict with cleanup results
+    """
+    try:
+        cutoff_date = timezone.now() - timedelta(days=days)
+        
+        analyses, _ = AnalysisResult.objects.filter(updated_at__lt=cutoff_date).delete()
+        translations, _ = TranslationResult.objects.filter(updated_at__lt=cutoff_date).delete()
+        
+        return {
+            'status': 'success',
+            'deleted_analyses': analyses,
+            'deleted_translations': translations,
+            'cutoff_date': cutoff_date.isoformat(),
+            'message': f'Cleaned up {analyses} analyses and {translations} translations'
+        }
+        
+    except Exception as e:
+        return {
+            'status': 'error',
+            'error': str(e)
+        }
+
+
 @shared_task(bind=True, name='celery_tasks.tasks.cleanup.cleanup_old_pdf_files')
 def cleanup_old_pdf_files(self, days: int = 7) -> Dict[str, Any]:
     """
@@ -0,0 +1,40 @@
+"""
+Follow-up indexing tasks for CVs loaded in bulk.
+"""
+import logging
+from typing import Dict, Any
+from celery import shared_task
+
+from main.services import CVBulkService
+
+logger = logging.getLogger(__name__)
+
+# CVs indexed per task run; the rest is handed to a new task to stay within the time limit
+INDEX_SPAN = 20000
+
+
+@shared_task(bind=True, name='celery_tasks.tasks.indexing.index_imported_cvs_task')
+def index_imported_cvs_task(self, first_id: int, last_id: int, span: int = INDEX_SPAN) -> Dict[str, Any]:
+    """
+    Build skill links for CVs inserted by ``import_cvs``.
+    
+    Args:
+        first_id: First CV id of the imported range
+        last_id: Last CV id of the imported range
+        span: Ids covered per task run
+        
+    Returns:
+        Dict with the indexed range and count
+    """
+    end_id = min(last_id, first_id + span - 1)
+    count = CVBulkService().index_range(first_id, end_id)
+    logger.info(f"Indexed {count} imported CVs ({first_id}-{end_id})")
+    if end_id < last_id:
+        index_imported_cvs_task.delay(end_id + 1, last_id, span)
+    return {
+        'status': 'success',
+        'first_id': first_id,
+        'last_id': end_id,
+        'indexed': count,
+        'remaining': max(last_id - end_id, 0),
+    }
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CV, RequestLog
+from .models import AnalysisResult, BulkAnalysisItem, BulkAnalysisJob, CV, RequestLog, TranslationResult
 
 
 @admin.register(CV)
@@ -67,3 +67,57 @@ class RequestLogAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         return qs.select_related('user')
+
+
+@admin.register(AnalysisResult)
+class AnalysisResultAdmin(admin.ModelAdmin):
+    """Stored AI analysis results"""
+    
+    list_display = ('id', 'cv', 'user', 'question', 'is_enabled', 'updated_at')
+    list_filter = ('is_enabled', 'updated_at')
+    search_fields = ('question', 'user__username', 'cv__firstname', 'cv__lastname')
+    readonly_fields = ('id', 'question_hash', 'created_at', 'updated_at')
+    list_per_page = 50
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('cv', 'user')
+
+
+@admin.register(TranslationResult)
+class TranslationResultAdmin(admin.ModelAdmin):
+    """Stored CV translations"""
+    
+    list_display = ('id', 'cv', 'user', 'language', 'is_enabled', 'updated_at')
+    list_filter = ('language', 'is_enabled')
+    search_fields = ('user__username', 'cv__firstname', 'cv__lastname')
+    readonly_fields = ('id', 'created_at', 'updated_at')
+    list_per_page = 50
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('cv', 'user')
+
+
+class BulkAnalysisItemInline(admin.TabularInline):
+    model = BulkAnalysisItem
+    fields = ('cv', 'status', 'analysis', 'error', 'completed_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(BulkAnalysisJob)
+class BulkAnalysisJobAdmin(admin.ModelAdmin):
+    """Bulk AI analysis jobs"""
+    
+    list_display = ('id', 'owner', 'question', 'query', 'status', 'created_at', 'completed_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('question', 'query', 'owner__username')
+    readonly_fields = ('id', 'task_id', 'created_at', 'updated_at', 'completed_at')
+    inlines = (BulkAnalysisItemInline,)
+    list_per_page = 50
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('owner')
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
+from django.conf import settings
+from rest_framework import serializers
 from rest_framework.request import Request
+from rest_framework.response import Response
 
+from ..common.conditional import make_etag, not_modified, set_validators
 from ..common.time import filter_queryset_by_time
 
 
@@ -28,5 +34,68 @@ class TimeFilterMixin:
         )
 
 
+class ConditionalGetMixin:
+    """List and retrieve answer 304 Not Modified while `get_validators()` is unchanged.
+
+    `get_validators()` returns a version string and Last-Modified for the requested data,
+    from a query much cheaper than the response itself; None opts out for the request.
+    """
+
+    def get_validators(self) -> Optional[Tuple[str, Optional[datetime.datetime]]]:
+        return None
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        validators = self.get_validators() if getattr(settings, "CONDITIONAL_GET_ENABLED", True) else None
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        version, last_modified = validators
+        # JSON and the browsable API share URLs, so the chosen renderer is part of the version
+        etag = make_etag(version, request.accepted_renderer.format)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_validators(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):  # type: ignore[override]
+        return self._conditional(super().list, request, *args, **kwargs)  # type: ignore[misc]
+
+    def retrieve(self, request, *args, **kwargs):  # type: ignore[override]
+        return self._conditional(super().retrieve, request, *args, **kwargs)  # type: ignore[misc]
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+class ValuesListMixin:
+    """List action that builds rows from ``.values()`` instead of a serializer per object.
+
+    Subclasses name the columns in `list_values(queryset)` and may reshape each row in
+    `list_row()`; datetimes are formatted exactly as DRF's `DateTimeField` would. The
+    serializer still describes the response for the schema and serves every other action.
+    """
+
+    def list_values(self, queryset) -> List[str]:
+        raise NotImplementedError
+
+    def list_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        return row
+
+    def list(self, request, *args, **kwargs):  # type: ignore[override]
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        queryset = queryset.values(*self.list_values(queryset))
+        page = self.paginate_queryset(queryset)  # type: ignore[attr-defined]
+        rows = [self.list_row(plain_row(row)) for row in (page if page is not None else queryset)]
+        if page is not None:
+            return self.get_paginated_response(rows)  # type: ignore[attr-defined]
+        return Response(rows)
 
 
+def plain_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Format the datetimes of a ``.values()`` row in place, as the serializers would."""
+    for name, value in row.items():
+        if isinstance(value, datetime.datetime):
+            row[name] = _datetime_field.to_representation(value)
+    return row
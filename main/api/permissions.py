@@ -7,6 +7,11 @@ from rest_framework.permissions import BasePermission, SAFE_METHODS
 from ..models import CV
 
 
+def can_modify_cv(user, owner_id) -> bool:
+    """Per-object write access of the CV API: staff (IsAdmin) or the CV's owner (IsCVOwnerOrReadOnly)."""
+    return bool(user and user.is_authenticated and (user.is_staff or owner_id == user.id))
+
+
 class IsAdmin(BasePermission):
     def has_permission(self, request, view) -> bool:
         return bool(request.user and request.user.is_staff)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+@lru_cache(maxsize=1)
+def _get_orjson():
+    """Return the orjson module, or None when it is not installed."""
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return None
+    return orjson
+
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, several times faster than the standard library on
+    large list pages. Types orjson does not know (Decimal, lazy strings, querysets) go
+    through DRF's own encoder; without orjson, or when indentation is requested, this is
+    the plain DRF renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        orjson = _get_orjson()
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_UTC_Z)
+
+
+class ExportRenderer(BaseRenderer):
+    """
+    Negotiates an export format (``Accept`` or ``?format=``) for views that stream the
+    body themselves; only error responses are rendered here, as JSON.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False).encode("utf-8")
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
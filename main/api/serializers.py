@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from ..models import CV, RequestLog
+from ..common.search import highlight_html
 
 
 class CVSerializer(serializers.ModelSerializer):
@@ -16,6 +17,66 @@ class CVSerializer(serializers.ModelSerializer):
         ]
 
 
+def result_rank(values) -> float:
+    # Full-text relevance, or name similarity in fuzzy name mode
+    return values.get("search_rank") or values.get("name_similarity") or 0.0
+
+
+def result_highlight(values) -> str:
+    return str(highlight_html(values.get("search_snippet")))
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer that outputs only the fields named in ``context['fields']``, or
+    ``Meta.default_fields`` when the client did not ask for specific ones.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields") or getattr(self.Meta, "default_fields", None)
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class CVListSerializer(SparseFieldsetMixin, CVSerializer):
+    """Compact CV for list responses: id and name unless more fields are requested."""
+
+    class Meta(CVSerializer.Meta):
+        fields = CVSerializer.Meta.fields + ["bio_preview", "skills_preview", "created_at", "updated_at"]
+        read_only_fields = fields
+        default_fields = ["id", "firstname", "lastname"]
+
+
+class CVSearchResultSerializer(CVListSerializer):
+    rank = serializers.SerializerMethodField()
+    highlight = serializers.SerializerMethodField()
+
+    class Meta(CVListSerializer.Meta):
+        fields = CVListSerializer.Meta.fields + ["rank", "highlight"]
+        default_fields = CVListSerializer.Meta.default_fields + ["rank", "highlight"]
+
+    def get_rank(self, obj) -> float:  # type: ignore[override]
+        return result_rank(vars(obj))
+
+    def get_highlight(self, obj) -> str:  # type: ignore[override]
+        return result_highlight(vars(obj))
+
+
+class BulkItemResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField(help_text="Position of the item in the request")
+    status = serializers.IntegerField(help_text="HTTP status the item would have had as a single request")
+    id = serializers.IntegerField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class BulkResultSerializer(serializers.Serializer):
+    succeeded = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = BulkItemResultSerializer(many=True)
+
+
 class RequestLogSerializer(serializers.ModelSerializer):
     username = serializers.SerializerMethodField()
 
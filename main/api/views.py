@@ -1,27 +1,366 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
 
-from ..enums import TimePreset, TimeOrder
+from ..enums import SearchMode, TimePreset, TimeOrder
 
 from ..models import CV, RequestLog
-from .serializers import CVSerializer, RequestLogSerializer
-from .pagination import SmallResultsSetPagination
+from ..services import CV_SORT_FIELDS, CVBulkService, CVService, cv_sort_field
+from .serializers import (
+    BulkResultSerializer, CVListSerializer, CVSearchResultSerializer, CVSerializer, RequestLogSerializer,
+    result_highlight, result_rank,
+)
+from .pagination import KeysetPagination, SmallResultsSetPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from ..common.conditional import make_etag
+from ..common.export import CONTENT_TYPES, export_cvs, export_filename
+from ..common.keyset import ordering_key
 from ..filters.log_filters import filter_logs
-from .mixins import TimeFilterMixin
-from .permissions import IsAdmin, IsCVOwnerOrReadOnly, IsCVChecker
+from ..filters.cv_filters import filter_cvs_by_skills, search_cvs_by_mode
+from .mixins import ConditionalGetMixin, TimeFilterMixin, ValuesListMixin
+from .permissions import IsAdmin, IsCVOwnerOrReadOnly, IsCVChecker, can_modify_cv
 
 
-class CVViewSet(viewsets.ModelViewSet):
+def _accepts_gzip(header: str) -> bool:
+    """Whether an ``Accept-Encoding`` header allows gzip, honouring ``q=0`` and ``*`` (RFC 9110)."""
+    weights = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+# Annotations the search modes add; rank and highlight are computed from them
+SEARCH_ANNOTATIONS = ('search_rank', 'name_similarity', 'search_snippet')
+
+
+class CVViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = CV.objects.all()
     serializer_class = CVSerializer
     permission_classes = [IsAdmin | IsCVOwnerOrReadOnly | IsCVChecker]
+    pagination_class = KeysetPagination
+
+    def _search_query(self) -> str:
+        if self.action != 'list' or self.request is None:
+            return ''
+        return self.request.query_params.get('q', '').strip()
+
+    def _requested_fields(self) -> list:
+        """Fields named in ``?fields=`` for list responses, id always included; empty for the default set."""
+        if self.action != 'list' or self.request is None:
+            return []
+        raw = self.request.query_params.get('fields', '')
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        if not names:
+            return []
+        allowed = self.get_serializer_class().Meta.fields
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ValidationError({'fields': [f"Unknown field: {name}" for name in unknown]})
+        return ['id'] + [name for name in names if name != 'id']
+
+    def _output_fields(self) -> list:
+        serializer_class = self.get_serializer_class()
+        requested = self._requested_fields() or serializer_class.Meta.default_fields
+        return [name for name in serializer_class.Meta.fields if name in requested]
+
+    def _only_columns(self, qs) -> list:
+        """Model columns the list response reads: its output fields plus the cursor's sort key."""
+        concrete = {field.name for field in CV._meta.concrete_fields}
+        key, _ = ordering_key(qs)
+        return [name for name in dict.fromkeys(['id', key, *self._output_fields()]) if name in concrete]
+
+    def list_values(self, queryset) -> list:
+        self._row_fields = self._output_fields()
+        columns = self._only_columns(queryset)
+        key, _ = ordering_key(queryset)
+        if key not in columns:
+            columns.append(key)
+        if 'rank' in self._row_fields or 'highlight' in self._row_fields:
+            columns += [name for name in SEARCH_ANNOTATIONS if name in queryset.query.annotations and name not in columns]
+        return columns
+
+    def list_row(self, row: dict) -> dict:
+        out = {}
+        for name in self._row_fields:
+            if name == 'rank':
+                out[name] = result_rank(row)
+            elif name == 'highlight':
+                out[name] = result_highlight(row)
+            else:
+                out[name] = row[name]
+        return out
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action != 'list':
+            return qs
+        params = self.request.query_params
+        qs = filter_cvs_by_skills(qs, params.getlist('skill'))
+        sort_by = params.get('sort')
+        query = self._search_query()
+        # Search results rank best first unless a sort is requested explicitly
+        if sort_by or not query:
+            qs = qs.order_by(cv_sort_field(sort_by, params.get('order', TimeOrder.DESC)))
+        if query:
+            qs = search_cvs_by_mode(qs, query, params.get('mode', SearchMode.TEXT.value), order_by_rank=not sort_by)
+        # Load only the columns the response shows; the big text fields stay in the database
+        return qs.only(*self._only_columns(qs))
+
+    def get_serializer_class(self):
+        if self._search_query():
+            return CVSearchResultSerializer
+        if self.action == 'list':
+            return CVListSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self._requested_fields()
+        return context
+
+    def get_validators(self):
+        service = CVService()
+        if self.action == 'retrieve':
+            try:
+                updated = service.last_modified(int(self.kwargs[self.lookup_field]))
+            except (KeyError, ValueError):
+                return None
+            return (make_etag('cv', self.kwargs[self.lookup_field], updated), updated) if updated else None
+        params = self.request.query_params
+        count, updated = service.list_fingerprint(params.get('q', ''), params.get('mode', SearchMode.TEXT.value), params.getlist('skill'))
+        return make_etag('cv-list', count, updated), updated
 
     def perform_create(self, serializer):
         serializer.save(owner=getattr(self.request, 'user', None))
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                description='Full-text search over name, skills, bio and projects; results are ranked and include a highlighted snippet',
+                required=False,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name='mode',
+                description='text: full-text search (default); name: typo-tolerant name search ranked by similarity',
+                required=False,
+                type={'type': 'string', 'enum': [SearchMode.TEXT, SearchMode.NAME]},
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name='fields',
+                description='Comma-separated fields to return (default id, firstname, lastname, plus rank and highlight when searching)',
+                required=False,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name='skill',
+                description='Only CVs listing this skill; repeat for several (all must match)',
+                required=False,
+                type=OpenApiTypes.STR,
+                many=True,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name='sort',
+                description='Sort key (default created_at); results are paged by cursor on this key',
+                required=False,
+                type={'type': 'string', 'enum': list(CV_SORT_FIELDS)},
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name='order',
+                description='Sort direction (default desc)',
+                required=False,
+                type={'type': 'string', 'enum': [TimeOrder.ASC, TimeOrder.DESC]},
+                location=OpenApiParameter.QUERY,
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name='q', description='Full-text or name search, as for the list', required=False, type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='mode', description='Search mode, as for the list', required=False, type={'type': 'string', 'enum': [SearchMode.TEXT, SearchMode.NAME]}, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='skill', description='Selected skills; counts cover CVs having all of them', required=False, type=OpenApiTypes.STR, many=True, location=OpenApiParameter.QUERY),
+        ],
+        responses={200: {'type': 'object', 'properties': {'skills': {'type': 'array', 'items': {'type': 'object'}}}}},
+    )
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Per-skill CV counts for the current search and skill filter."""
+        params = request.query_params
+        facets = CVService().skill_facets(params.get('q', ''), params.get('mode', SearchMode.TEXT.value), params.getlist('skill'))
+        return Response({'skills': facets})
 
-class RequestLogViewSet(TimeFilterMixin, viewsets.ReadOnlyModelViewSet):
-    queryset = RequestLog.objects.all()
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='format',
+                description='ndjson (default) or csv; an Accept header of application/x-ndjson or text/csv works too',
+                required=False,
+                type={'type': 'string', 'enum': [NDJSONRenderer.format, CSVRenderer.format]},
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses={(200, NDJSONRenderer.media_type): OpenApiTypes.STR, (200, CSVRenderer.media_type): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer], pagination_class=None)
+    def export(self, request):
+        """
+        Every CV in one streamed download; gzip-compressed when the client accepts it.
+
+        The response holds a worker thread until the client has read it all, so serve it
+        with threaded workers; very large exports belong to the ``export_cvs`` command.
+        """
+        fmt = request.accepted_renderer.format
+        compress = _accepts_gzip(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        chunks = export_cvs(fmt, chunk_size=settings.CV_EXPORT_CHUNK_SIZE, compress=compress)
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(fmt)}"'
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    @extend_schema(
+        methods=['POST'],
+        request=CVSerializer(many=True),
+        responses={200: BulkResultSerializer},
+        description='Create many CVs owned by the caller. Valid items are saved even if others fail; each result carries its own status.',
+    )
+    @extend_schema(
+        methods=['PATCH'],
+        request=CVSerializer(many=True),
+        responses={200: BulkResultSerializer},
+        description='Partially update many CVs; every item needs an id. Only the owner (or staff) may change a CV.',
+    )
+    @extend_schema(
+        methods=['DELETE'],
+        request={'type': 'array', 'items': {'type': 'integer'}},
+        responses={200: BulkResultSerializer},
+        description='Delete many CVs by id. Only the owner (or staff) may delete a CV.',
+    )
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """Many writes in one request: validated in one pass, written in batched transactions."""
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'items': ['Expected a list of items.']})
+        if len(items) > settings.CV_BULK_MAX_ITEMS:
+            raise ValidationError({'items': [f"At most {settings.CV_BULK_MAX_ITEMS} items per request."]})
+        if request.method == 'POST':
+            results = self._bulk_create(items)
+        elif request.method == 'PATCH':
+            results = self._bulk_update(items)
+        else:
+            results = self._bulk_delete(items)
+        results.sort(key=lambda result: result['index'])
+        succeeded = sum(1 for result in results if result['status'] < 400)
+        return Response({'succeeded': succeeded, 'failed': len(results) - succeeded, 'results': results})
+
+    def _bulk_create(self, items: list) -> list:
+        validator = CVSerializer()
+        results, rows, indexes = [], [], []
+        for index, item in enumerate(items):
+            try:
+                rows.append(validator.run_validation(item))
+                indexes.append(index)
+            except ValidationError as e:
+                results.append(_item_error(index, status.HTTP_400_BAD_REQUEST, e.detail))
+        cvs = CVBulkService().create(rows, owner=self.request.user)
+        results += [{'index': index, 'status': status.HTTP_201_CREATED, 'id': cv.pk} for index, cv in zip(indexes, cvs)]
+        return results
+
+    def _bulk_update(self, items: list) -> list:
+        results = []
+        ids = _bulk_ids([item.get('id') if isinstance(item, dict) else None for item in items], results)
+        # One query loads every target CV and its owner for the permission check
+        cvs = CV.objects.in_bulk([pk for pk in ids.values()])
+        validator = CVSerializer(partial=True)
+        changes, indexes = [], []
+        for index, pk in ids.items():
+            cv = cvs.get(pk)
+            if cv is None:
+                results.append(_item_error(index, status.HTTP_404_NOT_FOUND, 'Not found.', pk))
+            elif not can_modify_cv(self.request.user, cv.owner_id):
+                results.append(_item_error(index, status.HTTP_403_FORBIDDEN, 'You do not have permission to perform this action.', pk))
+            else:
+                try:
+                    changes.append((cv, validator.run_validation(items[index])))
+                    indexes.append(index)
+                except ValidationError as e:
+                    results.append(_item_error(index, status.HTTP_400_BAD_REQUEST, e.detail, pk))
+        CVBulkService().update(changes)
+        results += [{'index': index, 'status': status.HTTP_200_OK, 'id': cv.pk} for index, (cv, _) in zip(indexes, changes)]
+        return results
+
+    def _bulk_delete(self, items: list) -> list:
+        results = []
+        ids = _bulk_ids(items, results)
+        owners = dict(CV.objects.filter(id__in=list(ids.values())).values_list('id', 'owner_id'))
+        allowed = []
+        for index, pk in ids.items():
+            if pk not in owners:
+                results.append(_item_error(index, status.HTTP_404_NOT_FOUND, 'Not found.', pk))
+            elif not can_modify_cv(self.request.user, owners[pk]):
+                results.append(_item_error(index, status.HTTP_403_FORBIDDEN, 'You do not have permission to perform this action.', pk))
+            else:
+                allowed.append(index)
+        CVBulkService().delete([ids[index] for index in allowed])
+        results += [{'index': index, 'status': status.HTTP_204_NO_CONTENT, 'id': ids[index]} for index in allowed]
+        return results
+
+
+def _item_error(index: int, code: int, detail, pk=None) -> dict:
+    errors = detail if isinstance(detail, dict) else {'detail': detail}
+    result = {'index': index, 'status': code, 'errors': errors}
+    if pk is not None:
+        result['id'] = pk
+    return result
+
+
+def _bulk_ids(values: list, results: list) -> dict:
+    """Item index to CV id for well-formed, unique ids; the others are reported in ``results``."""
+    ids, seen = {}, set()
+    for index, value in enumerate(values):
+        if isinstance(value, bool) or not isinstance(value, int):
+            results.append(_item_error(index, status.HTTP_400_BAD_REQUEST, {'id': ['A valid integer id is required.']}))
+        elif value in seen:
+            results.append(_item_error(index, status.HTTP_400_BAD_REQUEST, {'id': ['Duplicate id in request.']}, value))
+        else:
+            seen.add(value)
+            ids[index] = value
+    return ids
+
+
+class RequestLogViewSet(ValuesListMixin, TimeFilterMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = RequestLog.objects.select_related('user')
     serializer_class = RequestLogSerializer
     pagination_class = SmallResultsSetPagination
     time_filter_field = "timestamp"
@@ -34,6 +373,14 @@ class RequestLogViewSet(TimeFilterMixin, viewsets.ReadOnlyModelViewSet):
         order = self.request.query_params.get('order')
         return filter_logs(qs, since, until, preset, order)
 
+    def list_values(self, queryset) -> list:
+        # The username comes from the same query as a join, not one lookup per row
+        return ['id', 'timestamp', 'method', 'path', 'query_string', 'remote_ip', 'user__username']
+
+    def list_row(self, row: dict) -> dict:
+        row['username'] = row.pop('user__username')
+        return row
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -1,6 +1,39 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def _repair_search_index(sender, using, **kwargs):
+    from django.db import connections
+
+    from .common.search import ensure_search_triggers
+
+    ensure_search_triggers(connections[using])
+
+
+def _invalidate_cv_queries(sender, **kwargs):
+    from .common.query_cache import bump_generation
+    from .services import CV_CACHE_NAMESPACE
+
+    bump_generation(CV_CACHE_NAMESPACE)
+
+
+def _sync_cv_skills(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and 'skills' not in update_fields):
+        return
+    from .common.skills import sync_cv_skills
+
+    sync_cv_skills(instance)
 
 
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        # SQLite table rebuilds during later migrations drop the full-text sync triggers
+        post_migrate.connect(_repair_search_index, sender=self)
+        post_save.connect(_sync_cv_skills, sender='main.CV', dispatch_uid='cv_skill_index')
+        # Any CV write makes every cached CV list page stale; connected after the skill
+        # sync so nothing can be cached under the new generation before links are updated
+        post_save.connect(_invalidate_cv_queries, sender='main.CV', dispatch_uid='cv_query_cache_save')
+        post_delete.connect(_invalidate_cv_queries, sender='main.CV', dispatch_uid='cv_query_cache_delete')
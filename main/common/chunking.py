@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .tokens import count_tokens, truncate_to_tokens
+
+_PARAGRAPH_RE = re.compile(r"(\n\s*\n)")
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])(\s+)|(\n)")
+# Tokens that should read the same in every chunk: product names, acronyms, versions
+_TECH_TERM_RE = re.compile(r"\b(?:[A-Z][a-z]+(?:[A-Z][a-z0-9]*)+|[A-Z]{2,}[a-z]?|[A-Za-z]+[0-9+#]+[A-Za-z0-9+#]*)(?![\w])")
+_NAME_RE = re.compile(r"\b[A-Z][a-z]{2,}\b")
+_SENTENCE_START_RE = re.compile(r"(?:^|[.!?:]\s+|\n\s*|[-*•]\s+)$")
+
+
+@dataclass
+class Chunk:
+    text: str
+    separator: str = ""  # whitespace that followed the chunk in the source
+
+
+def split_into_chunks(text: str, max_tokens: int, model: Optional[str] = None) -> List[Chunk]:
+    """
+    Split text into chunks of at most ``max_tokens``, on paragraph and then sentence boundaries.
+
+    Joining ``chunk.text + chunk.separator`` over the result reproduces the original text,
+    except for over-long single sentences, which are cut on word boundaries.
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return [Chunk(text)]
+
+    # Paragraphs first, then sentences within paragraphs that are still too long
+    pieces: List[Chunk] = []
+    parts = _PARAGRAPH_RE.split(text)
+    for index in range(0, len(parts), 2):
+        paragraph, separator = parts[index], parts[index + 1] if index + 1 < len(parts) else ""
+        if count_tokens(paragraph, model) <= max_tokens:
+            pieces.append(Chunk(paragraph, separator))
+            continue
+        sentences = _split_sentences(paragraph)
+        sentences[-1].separator += separator
+        for sentence in sentences:
+            pieces.extend(_split_words(sentence, max_tokens, model))
+
+    # Pack neighbouring pieces back together up to the budget
+    chunks: List[Chunk] = []
+    for piece in pieces:
+        if chunks and count_tokens(chunks[-1].text + chunks[-1].separator + piece.text, model) <= max_tokens:
+            last = chunks[-1]
+            last.text = last.text + last.separator + piece.text
+            last.separator = piece.separator
+        else:
+            chunks.append(Chunk(piece.text, piece.separator))
+    return chunks
+
+
+def join_chunks(texts: List[str], chunks: List[Chunk]) -> str:
+    """Reassemble translated chunk texts with the source separators, in order."""
+    return "".join(text + chunk.separator for text, chunk in zip(texts, chunks))
+
+
+def extract_glossary(text: str, limit: int = 30) -> List[str]:
+    """
+    Terms to keep consistent across separately translated chunks.
+
+    Picks acronyms, CamelCase and versioned technology names, plus capitalised words seen
+    mid-sentence (likely names), most frequent first.
+    """
+    counts = Counter(_TECH_TERM_RE.findall(text))
+    for match in _NAME_RE.finditer(text):
+        # A capital at the start of a sentence says nothing about the word
+        if not _SENTENCE_START_RE.search(text[max(0, match.start() - 3):match.start()]):
+            counts[match.group(0)] += 1
+    return [term for term, _ in counts.most_common(limit)]
+
+
+def _split_sentences(paragraph: str) -> List[Chunk]:
+    sentences: List[Chunk] = []
+    position = 0
+    for match in _SENTENCE_RE.finditer(paragraph):
+        sentences.append(Chunk(paragraph[position:match.start()], match.group(0)))
+        position = match.end()
+    sentences.append(Chunk(paragraph[position:]))
+    return [s for s in sentences if s.text] or [Chunk(paragraph)]
+
+
+def _split_words(sentence: Chunk, max_tokens: int, model: Optional[str]) -> List[Chunk]:
+    if count_tokens(sentence.text, model) <= max_tokens:
+        return [sentence]
+    parts: List[Chunk] = []
+    rest = sentence.text
+    while rest and count_tokens(rest, model) > max_tokens:
+        head = truncate_to_tokens(rest, max_tokens, model, marker="")
+        if not head.strip():
+            break
+        parts.append(Chunk(head, " "))
+        rest = rest[len(head):].lstrip()
+    if rest:
+        parts.append(Chunk(rest))
+    parts[-1].separator = sentence.separator
+    return parts
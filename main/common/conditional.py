@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(*parts: object) -> str:
+    """Weak ETag over the values a response is derived from."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def set_validators(response: HttpResponse, etag: str, last_modified: Optional[datetime]) -> HttpResponse:
+    """
+    Attach ETag/Last-Modified and make clients revalidate before reusing the response.
+
+    ``no-cache`` still lets browsers keep a copy, but they must ask first; without it the
+    Last-Modified header alone would let them reuse stale pages heuristically.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(request, etag: str, last_modified: Optional[datetime]) -> Optional[HttpResponse]:
+    """
+    304 (or 412) response when the request's preconditions say the client copy is current.
+
+    Only GET and HEAD are answered; None means the full response must be built.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    validators = set_validators(HttpResponse(), etag, last_modified)
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+        response=validators,
+    )
+    return None if response is validators else response
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import csv
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (NDJSON, CSV)
+
+EXPORT_FIELDS = (
+    "id", "firstname", "lastname", "skills", "projects", "bio", "contacts", "owner_id", "created_at", "updated_at",
+)
+CONTENT_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv; charset=utf-8"}
+
+# Rows are written out in pieces of about this size rather than one tiny write per row
+FLUSH_BYTES = 64 * 1024
+
+
+class _Line:
+    """File-like target for csv.writer that hands back each formatted line."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def csv_lines(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[str]:
+    writer = csv.writer(_Line())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_value(row[name]) for name in fields])
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress a byte stream on the fly, holding only the compressor's window in memory."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_cvs(fmt: str = NDJSON, queryset=None, chunk_size: int = 2000, compress: bool = False) -> Iterator[bytes]:
+    """
+    Every CV as NDJSON or CSV bytes, optionally gzip-compressed, produced lazily.
+
+    Rows are read with ``iterator(chunk_size)`` (a server-side cursor on Postgres) as
+    plain dicts, so memory use does not grow with the number of CVs.
+
+    Args:
+        fmt: ``ndjson`` or ``csv``
+        queryset: CVs to export (default: all, by id)
+        chunk_size: Rows fetched from the database per round trip
+        compress: Gzip the output
+    """
+    from ..models import CV
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    queryset = CV.objects.order_by("id") if queryset is None else queryset
+    rows = queryset.values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    lines = ndjson_lines(rows) if fmt == NDJSON else csv_lines(rows, EXPORT_FIELDS)
+    chunks = _chunked(lines)
+    return gzip_stream(chunks) if compress else chunks
+
+
+def export_filename(fmt: str, compress: bool = False) -> str:
+    return f"cvs.{fmt}" + (".gz" if compress else "")
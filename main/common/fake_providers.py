@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_WORDS = (
+    "experience impact clear skills metrics project delivery team ownership results role "
+    "quantify highlight concise structure leadership growth tooling architecture quality"
+).split()
+_NUMBERED_RE = re.compile(r"^(\d+)\. ", re.MULTILINE)
+_Z99 = 2.326  # standard normal quantile of the 99th percentile
+
+
+class FakeProviderError(Exception):
+    """Injected provider failure."""
+
+
+@dataclass
+class LatencyModel:
+    """
+    Seeded latency and error injection for fake providers.
+
+    Latencies are log-normal, fitted to the given median and 99th percentile, which
+    matches the long right tail of real LLM APIs. The same seed gives the same sequence.
+    """
+
+    p50: float = 0.0
+    p99: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "LatencyModel":
+        from django.conf import settings
+
+        return cls(
+            p50=getattr(settings, 'FAKE_PROVIDER_LATENCY_P50', 0.0),
+            p99=getattr(settings, 'FAKE_PROVIDER_LATENCY_P99', 0.0),
+            error_rate=getattr(settings, 'FAKE_PROVIDER_ERROR_RATE', 0.0),
+            seed=getattr(settings, 'FAKE_PROVIDER_SEED', 0),
+        )
+
+    def sample(self) -> float:
+        if self.p50 <= 0:
+            return 0.0
+        sigma = max(math.log(max(self.p99, self.p50)) - math.log(self.p50), 0.0) / _Z99
+        with self._lock:
+            return self._random.lognormvariate(math.log(self.p50), sigma)
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+def fake_answer(prompt: str, length: int = 60) -> str:
+    """Deterministic filler text: the same prompt always produces the same answer."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    words = [_WORDS[digest[i % len(digest)] % len(_WORDS)] for i in range(length)]
+    return "Fake analysis: " + " ".join(words) + "."
+
+
+def fake_output_text(request: Dict[str, Any]) -> str:
+    """Answer text for a Responses API request body, honouring JSON-schema output."""
+    prompt = _prompt_text(request.get("input"))
+    text_format = ((request.get("text") or {}).get("format") or {})
+    if text_format.get("type") == "json_schema":
+        # Multi-question analysis: one answer per numbered question in the prompt
+        indexes = [int(i) for i in _NUMBERED_RE.findall(prompt)] or [0]
+        return json.dumps({"answers": [{"index": i, "answer": fake_answer(f"{i}:{prompt}")} for i in indexes]})
+    if prompt.lstrip().startswith("Translate into"):
+        # Translation: echo the source text so callers see well-formed output
+        return prompt.split("\n\n", 1)[-1]
+    return fake_answer(prompt)
+
+
+def _prompt_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        messages = [m for m in value if isinstance(m, dict)]
+        user = [m.get("content", "") for m in messages if m.get("role") == "user"]
+        return "\n".join(c if isinstance(c, str) else json.dumps(c) for c in user)
+    return ""
+
+
+def _usage(request: Dict[str, Any], output: str) -> Dict[str, int]:
+    input_tokens = len(json.dumps(request.get("input", ""))) // 4
+    output_tokens = len(output) // 4
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+def response_body(request: Dict[str, Any], output: str) -> Dict[str, Any]:
+    """Responses API response object carrying ``output`` as its only message."""
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": request.get("model", "fake-model"),
+        "output": [{
+            "type": "message",
+            "id": f"msg_{uuid.uuid4().hex}",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": output, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": _usage(request, output),
+    }
+
+
+def stream_events(request: Dict[str, Any], output: str, latency: float) -> Iterator[Dict[str, Any]]:
+    """
+    Responses API stream events for ``output``, paced over ``latency`` seconds.
+
+    A third of the latency passes before the first token, the rest is spread over deltas.
+    """
+    pieces = re.findall(r"\S+\s*", output) or [output]
+    time.sleep(latency / 3)
+    item_id = f"msg_{uuid.uuid4().hex}"
+    for seq, piece in enumerate(pieces):
+        yield {
+            "type": "response.output_text.delta", "item_id": item_id, "output_index": 0,
+            "content_index": 0, "delta": piece, "logprobs": [], "sequence_number": seq,
+        }
+        time.sleep(latency * 2 / 3 / len(pieces))
+    yield {"type": "response.completed", "response": response_body(request, output), "sequence_number": len(pieces)}
+
+
+class FakeResponses:
+    """In-process stand-in for ``client.responses``."""
+
+    def __init__(self, latency: LatencyModel) -> None:
+        self.latency = latency
+
+    def create(self, timeout: Optional[float] = None, **kwargs: Any):
+        delay = self.latency.sample()
+        if self.latency.should_fail():
+            time.sleep(delay)
+            raise FakeProviderError("Injected fake provider failure")
+        output = fake_output_text(kwargs)
+        if kwargs.get("stream"):
+            return (_as_namespace(event) for event in stream_events(kwargs, output, delay))
+        time.sleep(delay)
+        return SimpleNamespace(output_text=output, usage=SimpleNamespace(**_usage(kwargs, output)))
+
+
+class FakeOpenAIClient:
+    """Replaces the OpenAI SDK client when OPENAI_FAKE is set; no network access."""
+
+    def __init__(self, latency: Optional[LatencyModel] = None) -> None:
+        self.responses = FakeResponses(latency or LatencyModel.from_settings())
+
+
+def _as_namespace(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _as_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_as_namespace(v) for v in value]
+    return value
+
+
+class _FakeProviderHandler(BaseHTTPRequestHandler):
+    server: "FakeProviderServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+
+        latency = self.server.latency
+        delay = latency.sample()
+        with self.server.stats_lock:
+            self.server.requests[self.path] = self.server.requests.get(self.path, 0) + 1
+        if latency.should_fail():
+            time.sleep(delay)
+            return self._send_json(500, {"error": {"message": "Injected fake provider failure", "type": "server_error"}})
+
+        if self.path.rstrip("/").endswith("/responses"):
+            output = fake_output_text(body)
+            if body.get("stream"):
+                return self._send_stream(body, output, delay)
+            time.sleep(delay)
+            return self._send_json(200, response_body(body, output))
+        if self.path.rstrip("/").endswith("/mail/send"):
+            time.sleep(delay)
+            self.send_response(202)
+            self.send_header("Content-Length", "0")
+            self.send_header("X-Message-Id", uuid.uuid4().hex)
+            self.end_headers()
+            return
+        self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, body: Dict[str, Any], output: str, delay: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for event in stream_events(body, output, delay):
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("fake provider: " + format, *args)
+
+
+class FakeProviderServer(ThreadingHTTPServer):
+    """
+    Local HTTP server mimicking the OpenAI Responses and SendGrid Mail Send endpoints.
+
+    Point OPENAI_BASE_URL at ``<url>/v1`` and SENDGRID_API_HOST at ``<url>`` to run the
+    real SDK code paths against it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: Optional[LatencyModel] = None) -> None:
+        super().__init__((host, port), _FakeProviderHandler)
+        self.latency = latency or LatencyModel()
+        self.requests: Dict[str, int] = {}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve from a daemon thread (for tests and benchmarks)."""
+        thread = threading.Thread(target=self.serve_forever, name="fake-providers", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or was issued for a different ordering."""
+
+
+@dataclass
+class KeysetPage:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    key: str = "id"
+    descending: bool = False
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def ordering_key(queryset: QuerySet) -> Tuple[str, bool]:
+    """
+    Sort key and direction of a queryset: its first ordering term, else the primary key.
+
+    The key may be a model field or an annotation (e.g. a search rank).
+    """
+    ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    term = next((t for t in ordering if isinstance(t, str)), "id")
+    descending = term.startswith("-")
+    key = term.lstrip("-")
+    return ("id" if key == "pk" else key), descending
+
+
+def encode_cursor(key: str, value: Any, pk: Any, direction: str) -> str:
+    if isinstance(value, datetime.datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"k": key, "v": value, "id": pk, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> Tuple[Any, Any, str]:
+    """
+    Position (key value, id, direction) stored in ``cursor``.
+
+    Raises:
+        InvalidCursor: Malformed cursor, or one issued for a different sort key
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_key, value, pk, direction = data["k"], data["v"], data["id"], data["d"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if cursor_key != key or direction not in (NEXT, PREVIOUS):
+        raise InvalidCursor("Cursor does not match the current ordering")
+    if isinstance(value, dict):
+        value = parse_datetime(value.get("dt") or "")
+        if value is None:
+            raise InvalidCursor("Invalid cursor")
+    return value, pk, direction
+
+
+def _after(key: str, value: Any, pk: Any, descending: bool) -> Q:
+    # Written as "key <= v AND (key < v OR id < pk)" rather than a bare OR, so the
+    # first condition bounds an index range scan on (key, id)
+    op, op_eq = ("lt", "lte") if descending else ("gt", "gte")
+    return Q(**{f"{key}__{op_eq}": value}) & (Q(**{f"{key}__{op}": value}) | Q(**{key: value, f"id__{op}": pk}))
+
+
+def _position(item: Any, key: str) -> Tuple[Any, Any]:
+    # Pages may hold model instances or ``.values()`` dicts
+    if isinstance(item, dict):
+        return item[key], item["id"]
+    return getattr(item, key), item.pk
+
+
+def paginate_keyset(queryset: QuerySet, page_size: int, cursor: Optional[str] = None) -> KeysetPage:
+    """
+    One page of ``queryset`` after (or before) ``cursor``, ordered by its sort key then id.
+
+    Unlike OFFSET pagination, every page costs the same: the database seeks straight to
+    the cursor position instead of counting and skipping the rows before it.
+
+    Raises:
+        InvalidCursor: See ``decode_cursor``
+    """
+    key, descending = ordering_key(queryset)
+    sign = "-" if descending else ""
+    direction = NEXT
+    if cursor:
+        value, pk, direction = decode_cursor(cursor, key)
+        # Walking backwards means reading the reversed order and flipping the page
+        forward = direction == NEXT
+        queryset = queryset.filter(_after(key, value, pk, descending if forward else not descending))
+    if direction == PREVIOUS:
+        rsign = "" if descending else "-"
+        rows = list(queryset.order_by(f"{rsign}{key}", f"{rsign}id")[:page_size + 1])
+        more = len(rows) > page_size
+        items = list(reversed(rows[:page_size]))
+    else:
+        rows = list(queryset.order_by(f"{sign}{key}", f"{sign}id")[:page_size + 1])
+        more = len(rows) > page_size
+        items = rows[:page_size]
+
+    page = KeysetPage(items=items, key=key, descending=descending)
+    if not items:
+        return page
+    first, last = items[0], items[-1]
+    has_next = more if direction == NEXT else True
+    has_previous = bool(cursor) if direction == NEXT else more
+    if has_next:
+        page.next_cursor = encode_cursor(key, *_position(last, key), NEXT)
+    if has_previous:
+        page.previous_cursor = encode_cursor(key, *_position(first, key), PREVIOUS)
+    return page
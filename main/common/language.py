@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Placeholders survive translation untouched; models copy bracketed numbers reliably
+PLACEHOLDER = "⟦{}⟧"
+PLACEHOLDER_RE = re.compile(r"⟦(\d+)⟧")
+
+# Order matters: URLs before emails (mailto:), emails before identifiers (dots)
+_UNTRANSLATABLE_PATTERNS = (
+    re.compile(r"\b(?:https?://|www\.)[^\s<>()]+[^\s<>().,;:!?]"),
+    re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b"),
+    # Phones: international (+), area code in parentheses, or 9+ digits; unlike year ranges
+    # ("2019 - 2023"), a bare number never has spaces around its dashes
+    re.compile(r"(?<![\w+])(?:\+\d[\d\s().-]{6,}\d|\(\d{1,4}\)[\d\s.-]{5,}\d|\d(?:[ .]?\d|-\d){8,})\b"),
+    re.compile(r"@[A-Za-z0-9_]{2,}\b"),
+)
+# Code identifiers in skills: snake_case, dotted.names, CamelCase, C++/C#/.NET, names with digits
+_IDENTIFIER_RE = re.compile(
+    r"(?<![\w.])(?:"
+    r"[A-Za-z_][A-Za-z0-9]*_[A-Za-z0-9_]+"
+    r"|[A-Za-z][A-Za-z0-9]*(?:\.[A-Za-z][A-Za-z0-9]*)+"
+    r"|[a-z]+[A-Z][A-Za-z0-9]*"
+    r"|[A-Z][a-z0-9]+[A-Z][A-Za-z0-9]*"
+    r"|\.?[A-Za-z]+(?:\+\+|#)"
+    r"|[A-Za-z]+[0-9]+[A-Za-z0-9]*"
+    r")(?![\w])"
+)
+_WORD_RE = re.compile(r"[^\W\d_]{2,}")
+
+LANGUAGE_CODES: Dict[str, str] = {
+    "English": "en", "Spanish": "es", "French": "fr", "German": "de", "Italian": "it",
+    "Portuguese": "pt", "Dutch": "nl", "Polish": "pl", "Swedish": "sv", "Turkish": "tr",
+    "Russian": "ru", "Ukrainian": "uk", "Bulgarian": "bg", "Greek": "el", "Hebrew": "he",
+    "Arabic": "ar", "Persian": "fa", "Hindi": "hi", "Thai": "th", "Chinese": "zh",
+    "Japanese": "ja", "Korean": "ko",
+}
+
+# Frequent function words; enough of them in a segment identifies a Latin-script language
+_STOPWORDS: Dict[str, frozenset] = {
+    code: frozenset(words.split())
+    for code, words in {
+        "en": "the and of to in is for with on as by at an be this that are was from or have has it we our",
+        "es": "el la los las de del y en que por con para una un es se su al lo como más sus fue",
+        "fr": "le la les de des du et en un une est que pour dans sur avec par au aux pas sont ce qui",
+        "de": "der die das und ist nicht mit von den dem des ein eine zu im auf für sich auch als bei",
+        "it": "il lo la gli le di del della e che per con un una è sono nel alla dei non come anche",
+        "pt": "o a os as de do da dos das e em que para com um uma é não no na por mais se",
+        "nl": "de het een en van in is dat op te met voor zijn niet aan er ook als bij door",
+        "pl": "i w na z do że się nie jest to od po jak o dla przez oraz ale są",
+        "sv": "och i att det som på är för med en av till den har inte om ett de",
+        "tr": "ve bir bu da de için ile olarak çok daha gibi ama olan en ne",
+    }.items()
+}
+
+_SCRIPTS = (
+    ("ja", re.compile(r"[぀-ヿ]")),
+    ("ko", re.compile(r"[가-힯]")),
+    ("zh", re.compile(r"[一-鿿]")),
+    ("el", re.compile(r"[Ͱ-Ͽ]")),
+    ("he", re.compile(r"[֐-׿]")),
+    ("hi", re.compile(r"[ऀ-ॿ]")),
+    ("th", re.compile(r"[฀-๿]")),
+)
+_CYRILLIC_RE = re.compile(r"[Ѐ-ӿ]")
+_ARABIC_RE = re.compile(r"[؀-ۿ]")
+
+
+@dataclass
+class MaskedText:
+    text: str
+    values: List[str] = field(default_factory=list)
+
+    def unmask(self, translated: str) -> Optional[str]:
+        """Put the original tokens back; None if the translation lost a placeholder."""
+        if set(PLACEHOLDER_RE.findall(translated)) != {str(i) for i in range(len(self.values))}:
+            return None
+        return PLACEHOLDER_RE.sub(lambda m: self.values[int(m.group(1))], translated)
+
+
+def language_code(name: str) -> Optional[str]:
+    """ISO 639-1 code for a language name from ``main.enums.Language``, if detection supports it."""
+    return LANGUAGE_CODES.get(name)
+
+
+def mask_untranslatable(text: str, identifiers: bool = False) -> MaskedText:
+    """
+    Replace emails, URLs, phone numbers and handles with placeholders.
+
+    Args:
+        text: Source text
+        identifiers: Also mask code identifiers (for technical fields such as skills)
+    """
+    values: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        values.append(match.group(0))
+        return PLACEHOLDER.format(len(values) - 1)
+
+    patterns = _UNTRANSLATABLE_PATTERNS + ((_IDENTIFIER_RE,) if identifiers else ())
+    for pattern in patterns:
+        text = pattern.sub(replace, text)
+    return MaskedText(text, values)
+
+
+def has_translatable_words(masked: str) -> bool:
+    return bool(_WORD_RE.search(PLACEHOLDER_RE.sub(" ", masked)))
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Best-effort offline language guess for a short segment.
+
+    Non-Latin scripts are recognised by their Unicode ranges, Latin-script languages by
+    stopword overlap. Returns None when the text is too short or ambiguous to tell.
+    """
+    letters = [c for c in text if c.isalpha()]
+    if not letters:
+        return None
+    for code, pattern in _SCRIPTS:
+        if len(pattern.findall(text)) * 3 >= len(letters):
+            return code
+    if len(_CYRILLIC_RE.findall(text)) * 2 >= len(letters):
+        if re.search(r"[іїєґ]", text, re.IGNORECASE):
+            return "uk"
+        return "bg" if re.search(r"\b(?:на|за|е|са|със)\b", text) and not re.search(r"[ыэё]", text) else "ru"
+    if len(_ARABIC_RE.findall(text)) * 2 >= len(letters):
+        return "fa" if re.search(r"[پچژگ]", text) else "ar"
+
+    words = [w.lower() for w in _WORD_RE.findall(text)]
+    words += [w.lower() for w in re.findall(r"\b\w\b", text) if w.isalpha()]
+    scores = {code: sum(1 for w in words if w in stopwords) for code, stopwords in _STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    ranked = sorted(scores.values(), reverse=True)
+    # Require a few hits and a clear margin; short skill lists have no function words at all
+    if ranked[0] >= 2 and ranked[0] >= ranked[1] * 1.5:
+        return best
+    return None
+
+
+@dataclass
+class TranslationPlan:
+    """A field masked once, split into lines, with the lines that need translating marked."""
+
+    masked: MaskedText
+    lines: List[str]
+    needed: List[bool]
+
+    def pending(self) -> List[int]:
+        return [index for index, needed in enumerate(self.needed) if needed]
+
+    def assemble(self, translated: Dict[int, str]) -> Optional[str]:
+        """Merge translated lines back and restore masked tokens; None if placeholders were lost."""
+        lines = [translated.get(index, line) for index, line in enumerate(self.lines)]
+        return self.masked.unmask("\n".join(lines))
+
+
+def plan_translation(text: str, target_code: Optional[str], identifiers: bool = False) -> TranslationPlan:
+    """
+    Mask untranslatable tokens and decide per line whether it needs translating.
+
+    A line is kept as-is when nothing translatable remains after masking, or when it is
+    already detected to be in the target language.
+    """
+    masked = mask_untranslatable(text, identifiers)
+    lines = masked.text.split("\n")
+    needed = []
+    for line in lines:
+        translate = has_translatable_words(line)
+        if translate and target_code and detect_language(line) == target_code:
+            translate = False
+        needed.append(translate)
+    return TranslationPlan(masked, lines, needed)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import re
+from typing import List
+
+BIO_PREVIEW_WORDS = 20
+SKILLS_PREVIEW_COUNT = 8
+# Column widths; previews are cut to fit so saving can never fail on length
+BIO_PREVIEW_LENGTH = 300
+SKILLS_PREVIEW_LENGTH = 200
+
+ELLIPSIS = "…"
+_SKILL_SPLIT_RE = re.compile(r"[,;\n•|]+")
+
+
+def bio_preview(text: str, words: int = BIO_PREVIEW_WORDS, max_length: int = BIO_PREVIEW_LENGTH) -> str:
+    """First ``words`` words of the bio on one line, with an ellipsis if anything was cut."""
+    tokens = (text or "").split()
+    preview = " ".join(tokens[:words])
+    truncated = len(tokens) > words
+    if len(preview) > max_length - 1:
+        preview, truncated = preview[:max_length - 1].rstrip(), True
+    return preview + ELLIPSIS if truncated else preview
+
+
+def split_skills(text: str) -> List[str]:
+    """Skills as listed: separated by commas, semicolons, bullets or line breaks, duplicates dropped."""
+    seen, skills = set(), []
+    for part in _SKILL_SPLIT_RE.split(text or ""):
+        skill = " ".join(part.strip(" \t-*").split())
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills
+
+
+def skills_preview(text: str, count: int = SKILLS_PREVIEW_COUNT, max_length: int = SKILLS_PREVIEW_LENGTH) -> str:
+    """The first ``count`` skills, comma-separated, with an ellipsis if more were listed."""
+    skills = split_skills(text)
+    shown: List[str] = []
+    for skill in skills[:count]:
+        if len(", ".join(shown + [skill])) > max_length - 2:
+            break
+        shown.append(skill)
+    preview = ", ".join(shown)
+    return f"{preview}, {ELLIPSIS}" if shown and len(shown) < len(skills) else preview
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from .tokens import count_tokens, truncate_to_tokens
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"[a-z0-9+#]{3,}")
+_STOPWORDS = frozenset(
+    "the and for with that this from what how are was were has have can should would "
+    "could about into your their does did not any all more most".split()
+)
+
+
+@dataclass(frozen=True)
+class FieldBudget:
+    name: str
+    label: str
+    max_tokens: int
+    priority: int  # lower value = trimmed last
+
+
+# Name and contacts are short and kept intact; projects is usually the long tail
+DEFAULT_FIELD_BUDGETS: Sequence[FieldBudget] = (
+    FieldBudget("name", "Name", 30, 0),
+    FieldBudget("skills", "Skills", 300, 2),
+    FieldBudget("bio", "Bio", 350, 3),
+    FieldBudget("projects", "Projects", 600, 4),
+    FieldBudget("contacts", "Contacts", 80, 1),
+)
+
+
+@dataclass
+class BuiltPrompt:
+    content: str
+    tokens: int
+    truncated_fields: List[str] = field(default_factory=list)
+
+
+def compact_whitespace(text: str) -> str:
+    """Strip indentation and trailing spaces, collapse runs of blanks and empty lines."""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in (text or "").splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _keywords(text: str) -> set:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def summarize_to_budget(text: str, max_tokens: int, question: str = "", model: Optional[str] = None) -> str:
+    """
+    Extractive summary: keep the sentences most relevant to the question that fit the budget.
+
+    Sentences are scored by keyword overlap with the question, with a small bonus for
+    appearing early, and emitted in their original order.
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        return truncate_to_tokens(text, max_tokens, model)
+
+    question_words = _keywords(question)
+    scored = []
+    for index, sentence in enumerate(sentences):
+        overlap = len(question_words & _keywords(sentence))
+        scored.append((overlap * 2 + 1.0 / (index + 1), index, sentence))
+
+    chosen = []
+    used = 0
+    for _, index, sentence in sorted(scored, key=lambda item: item[0], reverse=True):
+        cost = count_tokens(sentence, model) + 1
+        if used + cost > max_tokens:
+            continue
+        chosen.append((index, sentence))
+        used += cost
+    if not chosen:
+        return truncate_to_tokens(sentences[0], max_tokens, model)
+    return " … ".join(sentence for _, sentence in sorted(chosen))
+
+
+class CVPromptBuilder:
+    """Builds a compact, token-budgeted text rendering of a CV for LLM prompts."""
+
+    def __init__(
+        self,
+        total_budget: int = 1500,
+        field_budgets: Sequence[FieldBudget] = DEFAULT_FIELD_BUDGETS,
+        model: Optional[str] = None,
+    ) -> None:
+        self.total_budget = total_budget
+        self.field_budgets = field_budgets
+        self.model = model
+
+    def build(self, fields: Dict[str, str], question: str = "") -> BuiltPrompt:
+        """
+        Render CV fields as ``Label: value`` lines within the configured budgets.
+
+        Args:
+            fields: Mapping of field name to raw text (see DEFAULT_FIELD_BUDGETS for names)
+            question: Question the prompt will be used for; guides extractive summarization
+
+        Returns:
+            BuiltPrompt with the rendered content, its token count and the fields that were cut
+        """
+        values: Dict[str, str] = {}
+        truncated: List[str] = []
+        for budget in self.field_budgets:
+            text = compact_whitespace(fields.get(budget.name, ""))
+            shortened = summarize_to_budget(text, budget.max_tokens, question, self.model)
+            if shortened != text:
+                truncated.append(budget.name)
+            values[budget.name] = shortened
+
+        content = self._render(values)
+        tokens = count_tokens(content, self.model)
+        # Over the overall budget: shrink the lowest-priority fields first
+        for budget in sorted(self.field_budgets, key=lambda b: b.priority, reverse=True):
+            if tokens <= self.total_budget:
+                break
+            excess = tokens - self.total_budget
+            current = count_tokens(values[budget.name], self.model)
+            if not current:
+                continue
+            values[budget.name] = summarize_to_budget(
+                values[budget.name], max(current - excess, 0), question, self.model
+            )
+            if budget.name not in truncated:
+                truncated.append(budget.name)
+            content = self._render(values)
+            tokens = count_tokens(content, self.model)
+
+        return BuiltPrompt(content=content, tokens=tokens, truncated_fields=truncated)
+
+    def _render(self, values: Dict[str, str]) -> str:
+        return "\n".join(
+            f"{budget.label}: {values.get(budget.name) or 'Not provided'}" for budget in self.field_budgets
+        )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# How long one miss may hold the recompute lock, and how long others wait on it
+LOCK_SECONDS = 10.0
+WAIT_SECONDS = 2.0
+_POLL_SECONDS = 0.05
+_MISSING = object()
+# Namespaces whose bumps are being collected by ``deferred_bumps``, mapped to whether one was asked for
+_deferred: ContextVar[Optional[Dict[str, bool]]] = ContextVar("qcache_deferred", default=None)
+
+
+def _generation_key(namespace: str) -> str:
+    return f"qcache:{namespace}:generation"
+
+
+def get_generation(namespace: str) -> int:
+    """Current generation of ``namespace``; entries of older generations are never read again."""
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the clock so a flushed cache cannot resurrect entries of an earlier run
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        generation = cache.get(key)
+    return int(generation)
+
+
+def bump_generation(namespace: str) -> None:
+    """Invalidate every cached entry of ``namespace`` at once."""
+    deferred = _deferred.get()
+    if deferred is not None and namespace in deferred:
+        deferred[namespace] = True
+        return
+    key = _generation_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_generation(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            logger.warning(f"Query cache {namespace}: could not bump generation")
+
+
+@contextmanager
+def deferred_bumps(*namespaces: str) -> Iterator[None]:
+    """
+    Collapse the bumps of ``namespaces`` made inside the block (e.g. by per-row delete
+    signals) into a single one on exit. Only the current thread or task is affected.
+    """
+    deferred = _deferred.get()
+    token = None
+    if deferred is None:
+        deferred = {}
+        token = _deferred.set(deferred)
+    # Namespaces already deferred by an enclosing block are bumped when that block exits
+    own = [namespace for namespace in namespaces if namespace not in deferred]
+    deferred.update(dict.fromkeys(own, False))
+    try:
+        yield
+    finally:
+        bumped = [namespace for namespace in own if deferred.pop(namespace)]
+        if token is not None:
+            _deferred.reset(token)
+        for namespace in bumped:
+            bump_generation(namespace)
+
+
+class VersionedQueryCache:
+    """
+    Read-through cache for query results that are invalidated as a group.
+
+    Keys embed the namespace's generation counter; bumping it on any write makes every
+    older entry unreachable, and the cache expires them on its own. On a miss only one
+    caller recomputes; concurrent callers wait briefly for its result instead of stampeding
+    the database, and compute themselves only if it does not arrive in time.
+    """
+
+    def __init__(self, namespace: str, ttl: int = 300) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._lock = threading.Lock()
+
+    def key(self, parts: Sequence[Any], generation: Optional[int] = None) -> str:
+        generation = get_generation(self.namespace) if generation is None else generation
+        digest = hashlib.sha1(json.dumps(list(parts), default=str).encode("utf-8")).hexdigest()
+        return f"qcache:{self.namespace}:{generation}:{digest}"
+
+    def get_or_compute(self, parts: Sequence[Any], compute: Callable[[], Any]) -> Any:
+        key = self.key(parts)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count("hits")
+            return value
+        self._count("misses")
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, timeout=LOCK_SECONDS):
+            try:
+                value = compute()
+                cache.set(key, value, timeout=self.ttl)
+                return value
+            finally:
+                cache.delete(lock_key)
+
+        # Someone else is computing this entry; wait for it rather than repeating the query
+        self._count("waits")
+        deadline = time.monotonic() + WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_SECONDS)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        logger.info(f"Query cache {self.namespace}: gave up waiting after {WAIT_SECONDS:.1f}s, computing")
+        return compute()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, f"_{name}", getattr(self, f"_{name}") + 1)
+
+    def stats(self) -> Dict[str, object]:
+        """Hit ratio for this process; waits are misses that reused another caller's result."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'namespace': self.namespace,
+                'hits': self._hits,
+                'misses': self._misses,
+                'waits': self._waits,
+                'hit_ratio': self._hits / lookups if lookups else None,
+            }
+
+
+_caches: Dict[str, VersionedQueryCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_query_cache(namespace: str, ttl: int = 300) -> VersionedQueryCache:
+    """Process-wide cache per namespace, so hit ratio is counted across requests."""
+    with _registry_lock:
+        query_cache = _caches.get(namespace)
+        if query_cache is None or query_cache.ttl != ttl:
+            query_cache = _caches[namespace] = VersionedQueryCache(namespace, ttl)
+        return query_cache
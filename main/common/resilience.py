@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Shared pool for deadline-bound and hedged provider calls
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="provider-call")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls pass. After ``failure_threshold`` consecutive failures (errors or
+    timeouts) it opens and rejects calls for ``reset_timeout`` seconds, then lets a
+    single trial call through (half-open) to decide whether to close again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit %s closed", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit %s opened after %s consecutive failures", self.name, self._failures)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Sliding window of successful call durations, used to derive the hedging delay."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_trackers: Dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Process-wide breaker per upstream, so every provider instance shares its health."""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout)
+        return _breakers[name]
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    with _registry_lock:
+        return _trackers.setdefault(name, LatencyTracker())
+
+
+def call_with_resilience(
+    func: Callable[[], T],
+    breaker: CircuitBreaker,
+    latency: LatencyTracker,
+    deadline: float,
+    hedge: bool = False,
+    hedge_min_samples: int = 20,
+    defer_success: bool = False,
+) -> T:
+    """
+    Run ``func`` under a deadline and circuit breaker, optionally hedging it.
+
+    With ``hedge`` set and enough latency history, a second identical attempt is started
+    if the first has not finished after the observed p95; whichever finishes first wins.
+    With ``defer_success`` set, a successful call is not yet counted as such; the caller
+    records the outcome later (see ``track_stream``).
+
+    Raises:
+        CircuitOpenError: The breaker is open; the provider was not called
+        TimeoutError: No attempt finished within ``deadline`` seconds
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit {breaker.name} is open")
+
+    started = time.monotonic()
+    expires = started + deadline
+    pending = {_executor.submit(func)}
+    last_error: Optional[BaseException] = None
+
+    hedge_delay = latency.percentile(95) if hedge and len(latency) >= hedge_min_samples else None
+    if hedge_delay is not None and hedge_delay < deadline:
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done:
+            logger.info("Hedging %s call after %.2fs", breaker.name, hedge_delay)
+            pending.add(_executor.submit(func))
+
+    while pending:
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                latency.record(time.monotonic() - started)
+                if not defer_success:
+                    breaker.record_success()
+                _cancel(pending)
+                return future.result()
+            last_error = error
+
+    _cancel(pending)
+    breaker.record_failure()
+    if pending or last_error is None:
+        raise TimeoutError(f"{breaker.name} call exceeded {deadline:.1f}s deadline")
+    raise last_error
+
+
+class TrackedStream(Iterator[T]):
+    """
+    Provider stream that records the breaker outcome once reading ends.
+
+    Opening a stream proves little: errors while reading it count as failures. A reader
+    that stops early has seen nothing wrong, so that counts as a success. The outcome is
+    recorded and the underlying stream closed exactly once, by whichever comes first: the
+    end of the stream, ``close()`` (or leaving a ``with`` block) or garbage collection. A
+    stream dropped before it was read therefore still resolves a half-open trial and
+    frees whatever the stream holds.
+    """
+
+    def __init__(self, stream: Iterable[T], breaker: CircuitBreaker) -> None:
+        self._stream = stream
+        self._iterator: Optional[Iterator[T]] = None
+        self._breaker = breaker
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> "TrackedStream[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._iterator is None:
+            self._iterator = iter(self._stream)
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._finish(failed=False)
+            raise
+        except Exception:
+            self._finish(failed=True)
+            raise
+
+    def close(self) -> None:
+        self._finish(failed=False)
+
+    def __enter__(self) -> "TrackedStream[T]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if hasattr(self, "_lock"):
+            self.close()
+
+    def _finish(self, failed: bool) -> None:
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        if failed:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        for closable in (self._iterator, self._stream):
+            close = getattr(closable, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as err:
+                    logger.warning("Closing %s stream failed: %s", self._breaker.name, err)
+
+
+def track_stream(stream: Iterable[T], breaker: CircuitBreaker) -> TrackedStream[T]:
+    """Wrap a provider stream so its breaker outcome is recorded however reading ends."""
+    return TrackedStream(stream, breaker)
+
+
+def _cancel(futures) -> None:
+    # Running attempts cannot be interrupted; they end at the SDK request timeout
+    for future in futures:
+        future.cancel()
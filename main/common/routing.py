@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Raced attempts run here so a slow provider never blocks the caller's thread
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider-race")
+
+
+class NoProviderResult(Exception):
+    """Raised when every provider failed or returned nothing."""
+
+
+@dataclass
+class ProviderStats:
+    """Exponentially weighted latency and error rate of one provider."""
+
+    latency: float = 0.0
+    error_rate: float = 0.0
+    samples: int = 0
+
+    def update(self, seconds: float, ok: bool, alpha: float) -> None:
+        if self.samples == 0:
+            self.latency = seconds
+            self.error_rate = 0.0 if ok else 1.0
+        else:
+            self.latency = alpha * seconds + (1 - alpha) * self.latency
+            self.error_rate = alpha * (0.0 if ok else 1.0) + (1 - alpha) * self.error_rate
+        self.samples += 1
+
+
+class ProviderRouter:
+    """
+    Orders interchangeable providers by observed speed and health.
+
+    Each provider is scored by its EWMA latency plus ``error_penalty`` seconds scaled by
+    its EWMA error rate (a failure costs a fallback call); the best score is tried first.
+    Providers without samples are tried before measured ones, and a small share of calls
+    start with a random provider so a recovered backend is noticed.
+    Setting ``race`` above 1 starts that many providers at once and keeps the first result.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        providers: Sequence[str],
+        alpha: float = 0.2,
+        error_penalty: float = 2.0,
+        explore_rate: float = 0.05,
+        race: int = 1,
+    ) -> None:
+        self.name = name
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.explore_rate = explore_rate
+        self.race = max(1, race)
+        self._stats: Dict[str, ProviderStats] = {p: ProviderStats() for p in providers}
+        self._lock = threading.Lock()
+
+    def score(self, provider: str) -> float:
+        stats = self._stats[provider]
+        if stats.samples == 0:
+            return 0.0
+        return stats.latency + self.error_penalty * stats.error_rate
+
+    def order(self) -> List[str]:
+        with self._lock:
+            ranked = sorted(self._stats, key=self.score)
+        if len(ranked) > 1 and random.random() < self.explore_rate:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        return ranked
+
+    def record(self, provider: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._stats[provider].update(seconds, ok, self.alpha)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {'latency': s.latency, 'error_rate': s.error_rate, 'samples': s.samples}
+                for name, s in self._stats.items()
+            }
+
+    def call(self, providers: Dict[str, Callable[..., Any]], *args: Any) -> Tuple[str, Any]:
+        """
+        Call providers in routing order until one returns a result (not None).
+
+        Args:
+            providers: Provider name to callable; names must be known to the router
+            *args: Arguments passed to every provider
+
+        Returns:
+            Tuple of (name of the provider that served the call, its result)
+
+        Raises:
+            NoProviderResult: Every provider raised or returned None
+        """
+        ranked = [name for name in self.order() if name in providers]
+        while ranked:
+            batch, ranked = ranked[:self.race], ranked[self.race:]
+            if len(batch) == 1:
+                outcome = self._timed(batch[0], providers[batch[0]], args)
+            else:
+                outcome = self._race(batch, providers, args)
+            if outcome is not None:
+                return outcome
+        raise NoProviderResult(f"No {self.name} provider returned a result")
+
+    def _timed(self, name: str, func: Callable[..., Any], args: tuple) -> Optional[Tuple[str, Any]]:
+        started = time.monotonic()
+        try:
+            result = func(*args)
+        except Exception as e:
+            logger.warning(f"{self.name} provider {name} failed: {e}")
+            result = None
+        self.record(name, time.monotonic() - started, result is not None)
+        return (name, result) if result is not None else None
+
+    def _race(self, batch: List[str], providers: Dict[str, Callable[..., Any]], args: tuple) -> Optional[Tuple[str, Any]]:
+        # Losers keep running in the pool and still report their latency
+        pending = {_executor.submit(self._timed, name, providers[name], args) for name in batch}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                outcome = future.result()
+                if outcome is not None:
+                    return outcome
+        return None
+
+
+_routers: Dict[str, ProviderRouter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_provider_router(name: str, providers: Sequence[str], **options: Any) -> ProviderRouter:
+    """Process-wide router per provider family, so every service instance shares what it learned."""
+    with _registry_lock:
+        router = _routers.get(name)
+        if router is None or set(router.snapshot()) != set(providers):
+            router = _routers[name] = ProviderRouter(name, providers, **options)
+        return router
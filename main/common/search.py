@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import List, Optional
+
+from django.db import connection as default_connection
+from django.db.models import BooleanField, FloatField, Q, TextField
+from django.db.models.expressions import Expression
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+logger = logging.getLogger(__name__)
+
+CV_TABLE = "main_cv"
+FTS_TABLE = "main_cv_fts"
+FTS_COLUMNS = ("firstname", "lastname", "skills", "bio", "projects")
+# Relative importance of each column: names and skills outrank bio, bio outranks projects
+FTS_WEIGHTS = {"firstname": 10.0, "lastname": 10.0, "skills": 5.0, "bio": 2.0, "projects": 1.0}
+
+# Highlight markers that cannot occur in CV text; swapped for <mark> after HTML-escaping
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+SNIPPET_WORDS = 16
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_MAX_TERMS = 8
+
+# Postgres: a generated tsvector column keeps the search document in step with every write,
+# including bulk updates that bypass model save(); weights map to ts_rank's A-D classes.
+POSTGRES_INDEX_SQL = [
+    f"""
+    ALTER TABLE {CV_TABLE} ADD COLUMN IF NOT EXISTS search_document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(firstname, '') || ' ' || coalesce(lastname, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(skills, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(bio, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(projects, '')), 'D')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS main_cv_search_document_gin ON {CV_TABLE} USING GIN (search_document)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS main_cv_search_document_gin",
+    f"ALTER TABLE {CV_TABLE} DROP COLUMN IF EXISTS search_document",
+]
+
+# SQLite: an external-content FTS5 table stores only the index; triggers keep it in sync.
+_FTS_COLS = ", ".join(FTS_COLUMNS)
+_NEW_COLS = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_OLD_COLS = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+SQLITE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_FTS_COLS}, content='{CV_TABLE}', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')"
+)
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {CV_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLS}) VALUES (new.id, {_NEW_COLS}); END"
+    ),
+    f"{FTS_TABLE}_ad": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {CV_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_OLD_COLS}); END"
+    ),
+    f"{FTS_TABLE}_au": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {CV_TABLE} BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLS}) VALUES ('delete', old.id, {_OLD_COLS}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLS}) VALUES (new.id, {_NEW_COLS}); END"
+    ),
+}
+SQLITE_REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+
+def search_terms(query: str) -> List[str]:
+    """Word tokens of a user query; punctuation and operators are dropped so input is never parsed as syntax."""
+    return _TERM_RE.findall((query or "").lower())[:_MAX_TERMS]
+
+
+def install_search_index(connection=default_connection) -> None:
+    """Create the vendor's full-text index for CVs; no-op on backends without one."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for statement in POSTGRES_INDEX_SQL:
+                cursor.execute(statement)
+        elif connection.vendor == "sqlite":
+            cursor.execute(SQLITE_TABLE_SQL)
+            for statement in SQLITE_TRIGGERS.values():
+                cursor.execute(statement)
+            cursor.execute(SQLITE_REBUILD_SQL)
+
+
+def uninstall_search_index(connection=default_connection) -> None:
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for statement in POSTGRES_DROP_SQL:
+                cursor.execute(statement)
+        elif connection.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def ensure_search_triggers(connection=default_connection) -> bool:
+    """
+    Recreate missing SQLite sync triggers and rebuild the index.
+
+    SQLite migrations that alter ``main_cv`` copy it into a new table, which drops its
+    triggers; this runs after every migrate to put them back. Returns True if it repaired anything.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        if cursor.fetchone() is None:
+            return False
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [CV_TABLE])
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        if not missing:
+            return False
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        cursor.execute(SQLITE_REBUILD_SQL)
+    logger.info(f"Recreated full-text search triggers: {', '.join(missing)}")
+    return True
+
+
+class TableSQL(Expression):
+    """
+    Raw SQL fragment on the CV table whose ``{table}`` placeholder is filled with the
+    query's own alias for it, so the fragment stays valid inside subqueries.
+    """
+
+    def __init__(self, sql: str, params=(), output_field=None) -> None:
+        super().__init__(output_field=output_field)
+        self.sql = sql
+        self.params = list(params)
+
+    def as_sql(self, compiler, connection):
+        table = compiler.quote_name_unless_alias(compiler.query.get_initial_alias())
+        return self.sql.format(table=table), self.params
+
+    def get_group_by_cols(self):
+        return [self]
+
+
+def _vendor() -> str:
+    return default_connection.vendor
+
+
+def _postgres_query(terms: List[str]) -> str:
+    # Prefix matching so "pyth" finds Python while the user is still typing
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _sqlite_query(terms: List[str]) -> str:
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_filter(query: str):
+    """
+    Filter expression matching CVs that contain every term of ``query``.
+
+    Returns None for an empty query. Uses the GIN index on Postgres and FTS5 on SQLite,
+    and falls back to ``icontains`` on other backends.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    vendor = _vendor()
+    if vendor == "postgresql":
+        return TableSQL(
+            "{table}.search_document @@ to_tsquery('english', %s)",
+            (_postgres_query(terms),), output_field=BooleanField(),
+        )
+    if vendor == "sqlite":
+        return TableSQL(
+            f"{{table}}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+            (_sqlite_query(terms),), output_field=BooleanField(),
+        )
+    condition = Q()
+    for term in terms:
+        condition &= Q(*[Q(**{f"{column}__icontains": term}) for column in FTS_COLUMNS], _connector=Q.OR)
+    return condition
+
+
+def search_rank(query: str) -> Optional[TableSQL]:
+    """Relevance of a matching CV, higher is better; None where the backend cannot rank."""
+    terms = search_terms(query)
+    if not terms:
+        return None
+    vendor = _vendor()
+    if vendor == "postgresql":
+        return TableSQL(
+            "ts_rank_cd({table}.search_document, to_tsquery('english', %s), 32)",
+            (_postgres_query(terms),), output_field=FloatField(),
+        )
+    if vendor == "sqlite":
+        weights = ", ".join(str(FTS_WEIGHTS[column]) for column in FTS_COLUMNS)
+        # bm25() is lower-is-better, so negate it
+        return TableSQL(
+            f"(SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {{table}}.id)",
+            (_sqlite_query(terms),), output_field=FloatField(),
+        )
+    return None
+
+
+def search_snippet(query: str) -> Optional[TableSQL]:
+    """
+    Short excerpt around the matched terms, with matches wrapped in highlight markers.
+
+    Only evaluated for the rows actually returned, so it is cheap on a paginated page.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    vendor = _vendor()
+    if vendor == "postgresql":
+        options = (
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+            f"MaxWords={SNIPPET_WORDS}, MinWords=5, MaxFragments=2, FragmentDelimiter=\" … \""
+        )
+        return TableSQL(
+            "ts_headline('english', concat_ws(' ', {table}.skills, {table}.bio, {table}.projects), "
+            "to_tsquery('english', %s), %s)",
+            (_postgres_query(terms), options), output_field=TextField(),
+        )
+    if vendor == "sqlite":
+        return TableSQL(
+            f"(SELECT snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_WORDS}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {{table}}.id)",
+            (HIGHLIGHT_START, HIGHLIGHT_STOP, _sqlite_query(terms)), output_field=TextField(),
+        )
+    return None
+
+
+def highlight_html(snippet: Optional[str]) -> SafeString:
+    """HTML-escape a snippet and turn its highlight markers into ``<mark>`` tags."""
+    if not snippet:
+        return mark_safe("")
+    html = escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+    return mark_safe(html)
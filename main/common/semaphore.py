@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from .resilience import get_latency_tracker
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged, so saturation shows up before it becomes an outage
+SLOW_WAIT_SECONDS = 1.0
+
+# Drop expired leases, then take a slot if one is free. Uses the Redis clock so that
+# workers with skewed clocks agree on which leases have expired.
+_ACQUIRE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+    redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])) + 60)
+    return 1
+end
+return 0
+"""
+
+# Push a held lease's expiry forward; 0 means it already lapsed and was dropped
+_RENEW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', now + tonumber(ARGV[1]), ARGV[2])
+"""
+
+
+class SemaphoreTimeout(Exception):
+    """Raised when no slot became free within the wait timeout."""
+
+
+class LocalSemaphore:
+    """In-process counting semaphore; limits parallelism within one worker process only."""
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> Optional[str]:
+        if not self._semaphore.acquire(timeout=timeout):
+            return None
+        with self._lock:
+            self._in_use += 1
+        return uuid.uuid4().hex
+
+    def release(self, token: str) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._semaphore.release()
+
+    def renew(self, token: str) -> bool:
+        return True
+
+    def in_use(self) -> int:
+        return self._in_use
+
+
+class RedisSemaphore:
+    """
+    Semaphore shared by every process using the same Redis.
+
+    Each holder owns a member of a sorted set scored by its lease expiry. A worker that
+    dies while holding a slot cannot leak it: the lease lapses after ``lease_seconds``.
+    """
+
+    def __init__(self, name: str, limit: int, lease_seconds: float = 120.0, url: Optional[str] = None) -> None:
+        import redis  # type: ignore
+        from django.conf import settings
+
+        self.name = name
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.key = f"semaphore:{name}"
+        self._redis = redis.Redis.from_url(
+            url or getattr(settings, 'REDIS_URL', None) or settings.CELERY_BROKER_URL,
+            socket_connect_timeout=2,
+        )
+        self._acquire_script = self._redis.register_script(_ACQUIRE_SCRIPT)
+        self._renew_script = self._redis.register_script(_RENEW_SCRIPT)
+
+    def acquire(self, timeout: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        expires = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            if self._acquire_script(keys=[self.key], args=[self.limit, self.lease_seconds, token]):
+                return token
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Jittered backoff keeps waiting workers from polling in lockstep
+            time.sleep(min(remaining, delay * random.uniform(0.5, 1.5)))
+            delay = min(delay * 2, 0.5)
+
+    def release(self, token: str) -> None:
+        self._redis.zrem(self.key, token)
+
+    def renew(self, token: str) -> bool:
+        return bool(self._renew_script(keys=[self.key], args=[self.lease_seconds, token]))
+
+    def in_use(self) -> int:
+        # Lease scores are Redis TIME values; compare against the same clock
+        seconds, microseconds = self._redis.time()
+        return self._redis.zcount(self.key, seconds + microseconds / 1_000_000, '+inf')
+
+
+class SlotLease:
+    """
+    One held slot. ``release`` is idempotent; ``keep_alive`` renews the lease when a third
+    of it has passed, so a long holder (e.g. a stream being read) can call it freely.
+    """
+
+    def __init__(self, name: str, backend, token: str, lease_seconds: float) -> None:
+        self.name = name
+        self._backend = backend
+        self._token = token
+        self._renew_every = lease_seconds / 3
+        self._renewed_at = time.monotonic()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def keep_alive(self) -> None:
+        if self._released or time.monotonic() - self._renewed_at < self._renew_every:
+            return
+        self._renewed_at = time.monotonic()
+        try:
+            if not self._backend.renew(self._token):
+                logger.warning(f"Semaphore {self.name}: lease lapsed before it was renewed")
+        except Exception as e:
+            logger.warning(f"Semaphore {self.name}: lease renewal failed ({e})")
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            self._backend.release(self._token)
+        except Exception as e:
+            # The lease expires on its own
+            logger.warning(f"Semaphore {self.name}: release failed ({e})")
+
+
+class ProviderSemaphore:
+    """
+    Caps concurrent calls to an upstream provider and records how long callers queue.
+
+    Uses Redis when configured and falls back to an in-process semaphore if Redis is
+    unreachable, so an outage of the coordinator degrades limits instead of blocking calls.
+    """
+
+    def __init__(self, name: str, limit: int, backend: str = 'redis', lease_seconds: float = 120.0) -> None:
+        self.name = name
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.local = LocalSemaphore(name, limit)
+        self.shared = None
+        if backend == 'redis':
+            try:
+                self.shared = RedisSemaphore(name, limit, lease_seconds)
+            except Exception as e:
+                logger.warning(f"Semaphore {name}: Redis unavailable, limiting per process ({e})")
+        self.wait_times = get_latency_tracker(f"semaphore:{name}:wait")
+        self._acquired = 0
+        self._timeouts = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, timeout: float) -> Iterator[SlotLease]:
+        """
+        Hold one slot for the duration of the block.
+
+        Raises:
+            SemaphoreTimeout: No slot became free within ``timeout`` seconds
+        """
+        lease = self.acquire(timeout)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def acquire(self, timeout: float) -> SlotLease:
+        """
+        Take a slot that the caller must ``release`` (possibly from another thread).
+
+        Raises:
+            SemaphoreTimeout: No slot became free within ``timeout`` seconds
+        """
+        started = time.monotonic()
+        backend, token = self._acquire(timeout)
+        waited = time.monotonic() - started
+        with self._lock:
+            if token is None:
+                self._timeouts += 1
+            else:
+                self._acquired += 1
+        if token is None:
+            logger.warning(f"Semaphore {self.name}: no slot free after {waited:.2f}s (limit {self.limit})")
+            raise SemaphoreTimeout(f"No {self.name} slot free within {timeout:.1f}s")
+        self.wait_times.record(waited)
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.info(f"Semaphore {self.name}: waited {waited:.2f}s for a slot")
+        return SlotLease(self.name, backend, token, self.lease_seconds)
+
+    def _acquire(self, timeout: float):
+        if self.shared is not None:
+            try:
+                return self.shared, self.shared.acquire(timeout)
+            except Exception as e:
+                logger.warning(f"Semaphore {self.name}: Redis acquire failed, using local limit ({e})")
+        return self.local, self.local.acquire(timeout)
+
+    def stats(self) -> Dict[str, object]:
+        """Queue-wait metrics for this process, plus slots currently held across all processes."""
+        try:
+            in_use = (self.shared or self.local).in_use()
+        except Exception:
+            in_use = None
+        return {
+            'name': self.name,
+            'limit': self.limit,
+            'in_use': in_use,
+            'acquired': self._acquired,
+            'timeouts': self._timeouts,
+            'wait_p50': self.wait_times.percentile(50),
+            'wait_p95': self.wait_times.percentile(95),
+        }
+
+
+_semaphores: Dict[str, ProviderSemaphore] = {}
+_registry_lock = threading.Lock()
+
+
+def get_provider_semaphore(name: str, limit: int, backend: str = 'redis', lease_seconds: float = 120.0) -> ProviderSemaphore:
+    """Process-wide semaphore per upstream."""
+    with _registry_lock:
+        semaphore = _semaphores.get(name)
+        if semaphore is None or semaphore.limit != limit:
+            semaphore = _semaphores[name] = ProviderSemaphore(name, limit, backend, lease_seconds)
+        return semaphore
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .previews import split_skills
+
+SKILL_NAME_LENGTH = 60
+# Longer entries are sentences ("5 years leading a team of ..."), not skills
+MAX_SKILL_WORDS = 4
+
+# Spellings that mean the same skill, mapped to one canonical key
+ALIASES: Dict[str, str] = {
+    "js": "javascript", "ecmascript": "javascript", "es6": "javascript",
+    "ts": "typescript",
+    "py": "python", "python3": "python", "python 3": "python",
+    "golang": "go",
+    "postgres": "postgresql", "psql": "postgresql", "postgre sql": "postgresql",
+    "k8s": "kubernetes",
+    "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue",
+    "nodejs": "node.js", "node": "node.js",
+    "cpp": "c++", "c sharp": "c#", "csharp": "c#",
+    "amazon web services": "aws",
+    "gcp": "google cloud", "google cloud platform": "google cloud",
+    "ml": "machine learning",
+    "drf": "django rest framework",
+}
+
+_PARENTHETICAL_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_SUBSPLIT_RE = re.compile(r"\s+/\s+|\s+&\s+")
+_EDGE_PUNCT_RE = re.compile(r"^[^\w.#+]+|[^\w#+]+$")
+
+
+def normalize_skill(raw: str) -> Optional[Tuple[str, str]]:
+    """
+    Canonical key and display label for one skill entry, or None if it is not a skill.
+
+    Keys are lowercase with single spaces, without notes in brackets and with common
+    aliases folded together ("JS", "ReactJS" and "k8s" become "javascript", "react",
+    "kubernetes"). Symbols that distinguish skills (C++, C#, .NET) are kept.
+    """
+    label = " ".join(_PARENTHETICAL_RE.sub(" ", raw or "").split())
+    label = _EDGE_PUNCT_RE.sub("", label)
+    if not label or len(label.split()) > MAX_SKILL_WORDS or len(label) > SKILL_NAME_LENGTH:
+        return None
+    if not re.search(r"[^\W\d_]", label):
+        return None
+    key = label.lower()
+    key = ALIASES.get(key, key)
+    return key, label
+
+
+def extract_skills(text: str) -> Dict[str, str]:
+    """Canonical key to label for every skill listed in a CV's skills text, first spelling wins."""
+    skills: Dict[str, str] = {}
+    for entry in split_skills(text):
+        for part in _SUBSPLIT_RE.split(entry):
+            normalized = normalize_skill(part)
+            if normalized and normalized[0] not in skills:
+                skills[normalized[0]] = normalized[1]
+    return skills
+
+
+def normalize_skill_filter(values: Iterable[str]) -> List[str]:
+    """Canonical keys for skill filter values from a request, unknown spellings kept as-is."""
+    keys: List[str] = []
+    for value in values:
+        normalized = normalize_skill(value)
+        if normalized and normalized[0] not in keys:
+            keys.append(normalized[0])
+    return keys
+
+
+def sync_cv_skills(cv) -> None:
+    """Bring a CV's skill links in line with its skills text."""
+    sync_skills([cv])
+
+
+def sync_skills(cvs: Sequence) -> None:
+    """
+    Bring the skill links of saved CVs in line with their skills text.
+
+    Costs the same few indexed queries for one CV or a whole batch: read current links,
+    insert missing skills and links, delete links that no longer apply.
+    """
+    from ..models import CVSkill, Skill
+
+    wanted = {cv.pk: extract_skills(cv.skills) for cv in cvs}
+    if not wanted:
+        return
+    current: Dict[int, Dict[str, int]] = {pk: {} for pk in wanted}
+    links = CVSkill.objects.filter(cv_id__in=list(wanted)).values_list("cv_id", "skill__name", "id")
+    for cv_id, name, link_id in links:
+        current[cv_id][name] = link_id
+    missing = [(pk, key) for pk, skills in wanted.items() for key in skills if key not in current[pk]]
+    if missing:
+        labels: Dict[str, str] = {}
+        for pk, key in missing:
+            labels.setdefault(key, wanted[pk][key])
+        Skill.objects.bulk_create([Skill(name=key, label=label) for key, label in labels.items()], ignore_conflicts=True)
+        ids = dict(Skill.objects.filter(name__in=list(labels)).values_list("name", "id"))
+        CVSkill.objects.bulk_create(
+            [CVSkill(cv_id=pk, skill_id=ids[key]) for pk, key in missing if key in ids], ignore_conflicts=True
+        )
+    stale = [link_id for pk, names in current.items() for key, link_id in names.items() if key not in wanted[pk]]
+    if stale:
+        CVSkill.objects.filter(id__in=stale).delete()
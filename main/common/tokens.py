@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough shape of BPE tokens: words, numbers and single punctuation marks
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: Optional[str]):
+    """
+    Return a tiktoken encoding for the model, or None when tiktoken is unusable. Encodings
+    download their BPE file on first use, so a worker without network access falls back
+    to the estimate instead of failing the caller.
+    """
+    try:
+        import tiktoken  # type: ignore
+    except ImportError:
+        return None
+    if model:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            pass  # Model unknown to this tiktoken release
+        except Exception as err:
+            logger.warning(f"tiktoken encoding for {model} unavailable, estimating token counts: {err}")
+            return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as err:
+        logger.warning(f"tiktoken encoding o200k_base unavailable, estimating token counts: {err}")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens locally; exact with tiktoken, otherwise a conservative estimate."""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(len(_PIECE_RE.findall(text)), math.ceil(len(text) / _CHARS_PER_TOKEN))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None, marker: str = " …") -> str:
+    """Cut text down to at most ``max_tokens`` tokens, appending ``marker`` when shortened."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens]).rstrip() + marker
+    # Without a tokenizer, shrink proportionally and re-check
+    cut = text
+    while cut and count_tokens(cut, model) > max_tokens:
+        cut = cut[: int(len(cut) * max_tokens / count_tokens(cut, model) * 0.95)]
+    return cut.rsplit(" ", 1)[0].rstrip() + marker if " " in cut else cut + marker
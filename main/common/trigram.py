@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.db import connection as default_connection
+from django.db.models import BooleanField, FloatField
+
+from .search import TableSQL
+
+logger = logging.getLogger(__name__)
+
+# pg_trgm's default word_similarity_threshold, so both backends accept the same typos
+WORD_SIMILARITY_THRESHOLD = 0.6
+# The in-memory index returns at most this many best matches
+MAX_MATCHES = 200
+
+# Must match the indexed expression exactly for Postgres to use the index
+FULL_NAME_SQL = "(coalesce({table}.firstname, '') || ' ' || coalesce({table}.lastname, ''))"
+
+POSTGRES_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS main_cv_full_name_trgm ON main_cv "
+    "USING GIN ((coalesce(firstname, '') || ' ' || coalesce(lastname, '')) gin_trgm_ops)",
+]
+POSTGRES_DROP_SQL = ["DROP INDEX IF EXISTS main_cv_full_name_trgm"]
+
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: lowercased words padded with two leading and one trailing space."""
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def install_trigram_index(connection=default_connection) -> None:
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for statement in POSTGRES_INDEX_SQL:
+            cursor.execute(statement)
+
+
+def uninstall_trigram_index(connection=default_connection) -> None:
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for statement in POSTGRES_DROP_SQL:
+            cursor.execute(statement)
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigram to CV ids, for backends without pg_trgm.
+
+    A name matches when enough of the query's trigrams occur in it (the share of query
+    trigrams found, like pg_trgm's word similarity). Only postings of the query's own
+    trigrams are read, so a lookup costs far less than scanning every name.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[int]] = {}
+        self._sizes: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, pk: int, text: str) -> None:
+        grams = trigrams(text)
+        self._sizes[pk] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(pk)
+
+    def search(self, query: str, threshold: float = WORD_SIMILARITY_THRESHOLD, limit: int = MAX_MATCHES) -> List[Tuple[int, float]]:
+        """
+        Best matching ids with their similarity, best first.
+
+        Ties on similarity go to the name with fewer extra trigrams (closest overall match).
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        matches = []
+        for pk, common in shared.items():
+            similarity = common / len(grams)
+            if similarity >= threshold:
+                jaccard = common / (len(grams) + self._sizes[pk] - common)
+                matches.append((similarity, jaccard, pk))
+        matches.sort(key=lambda m: (m[0], m[1], m[2]), reverse=True)
+        return [(pk, round(similarity, 4)) for similarity, _, pk in matches[:limit]]
+
+
+class NameIndex:
+    """
+    Process-wide trigram index of CV names, rebuilt when the CV table changes.
+
+    Freshness is checked with one aggregate query (row count, newest update, highest id),
+    so edits made by other processes are picked up too. Bulk ``update()`` calls must set
+    ``updated_at`` to be noticed, as they bypass ``auto_now``.
+    """
+
+    def __init__(self) -> None:
+        self._index = TrigramIndex()
+        self._stamp: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def _current_stamp(self) -> tuple:
+        from django.db.models import Count, Max
+
+        from ..models import CV
+
+        stamp = CV.objects.order_by().aggregate(count=Count("id"), updated=Max("updated_at"), last=Max("id"))
+        return stamp["count"], stamp["updated"], stamp["last"]
+
+    def search(self, query: str, threshold: float = WORD_SIMILARITY_THRESHOLD, limit: int = MAX_MATCHES) -> List[Tuple[int, float]]:
+        from ..models import CV
+
+        stamp = self._current_stamp()
+        with self._lock:
+            if stamp != self._stamp:
+                index = TrigramIndex()
+                rows = CV.objects.order_by().values_list("id", "firstname", "lastname")
+                for pk, firstname, lastname in rows.iterator(chunk_size=2000):
+                    index.add(pk, f"{firstname} {lastname}")
+                self._index, self._stamp = index, stamp
+                logger.debug(f"Rebuilt name trigram index with {len(index)} CVs")
+            index = self._index
+        return index.search(query, threshold, limit)
+
+
+_name_index = NameIndex()
+
+
+def get_name_index() -> NameIndex:
+    return _name_index
+
+
+def name_match_filter(query: str) -> TableSQL:
+    """Postgres: names word-similar to ``query``; served by the trigram GIN index."""
+    return TableSQL(f"%s <%% {FULL_NAME_SQL}", (query,), output_field=BooleanField())
+
+
+def name_similarity(query: str) -> TableSQL:
+    """Postgres: word similarity of ``query`` to the full name, 0 to 1."""
+    return TableSQL(f"word_similarity(%s, {FULL_NAME_SQL})", (query,), output_field=FloatField())
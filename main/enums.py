@@ -13,6 +13,11 @@ class TimeOrder(str, Enum):
     DESC = "desc"
 
 
+class SearchMode(str, Enum):
+    TEXT = "text"
+    NAME = "name"
+
+
 class Language(str, Enum):
     # Major world languages
     ENGLISH = "English"
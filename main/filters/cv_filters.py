@@ -1,11 +1,121 @@
-from django.db.models import Q, QuerySet
+from typing import Dict, List, Sequence
 
-from ..models import CV
+from django.db import connection
+from django.db.models import Case, Count, QuerySet, Value, When
+from django.db.models import FloatField, TextField
+
+from ..enums import SearchMode
+from ..models import CV, CVSkill
+from ..common.skills import normalize_skill_filter
+from ..common.search import search_filter, search_rank, search_snippet
+from ..common.trigram import get_name_index, name_match_filter, name_similarity
 
 
 def filter_cvs_by_query(queryset: QuerySet[CV], query: str) -> QuerySet[CV]:
+    """Keep CVs whose name, skills, bio or projects contain every word of ``query``."""
+    condition = search_filter(query)
+    if condition is None:
+        return queryset
+    return queryset.filter(condition)
+
+
+def search_cvs(queryset: QuerySet[CV], query: str, order_by_rank: bool = True) -> QuerySet[CV]:
+    """
+    Full-text search with ``search_rank`` and ``search_snippet`` annotations.
+
+    Args:
+        queryset: CVs to search
+        query: User search text; an empty query returns the queryset unchanged
+        order_by_rank: Order best matches first, replacing the queryset's ordering
+    """
+    queryset = filter_cvs_by_query(queryset, query)
+    rank, snippet = search_rank(query), search_snippet(query)
+    if rank is None and snippet is None:
+        return queryset
+    queryset = queryset.annotate(
+        search_rank=rank if rank is not None else Value(0.0, output_field=FloatField()),
+        search_snippet=snippet if snippet is not None else Value("", output_field=TextField()),
+    )
+    if order_by_rank:
+        queryset = queryset.order_by("-search_rank", "-id")
+    return queryset
+
+
+def search_cvs_by_name(queryset: QuerySet[CV], query: str, order_by_rank: bool = True) -> QuerySet[CV]:
+    """
+    Typo-tolerant name search with a ``name_similarity`` annotation.
+
+    Uses the pg_trgm index on Postgres and the in-memory trigram index elsewhere.
+
+    Args:
+        queryset: CVs to search
+        query: Name or part of a name, possibly misspelt
+        order_by_rank: Order most similar first, replacing the queryset's ordering
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset
+    if connection.vendor == "postgresql":
+        queryset = queryset.filter(name_match_filter(query)).annotate(name_similarity=name_similarity(query))
+    else:
+        matches = get_name_index().search(query)
+        if not matches:
+            return queryset.none()
+        queryset = queryset.filter(id__in=[pk for pk, _ in matches]).annotate(
+            name_similarity=Case(
+                *[When(id=pk, then=Value(similarity)) for pk, similarity in matches],
+                default=Value(0.0), output_field=FloatField(),
+            )
+        )
+    if order_by_rank:
+        queryset = queryset.order_by("-name_similarity", "-id")
+    return queryset
+
+
+def search_cvs_by_mode(queryset: QuerySet[CV], query: str, mode: str = SearchMode.TEXT.value, order_by_rank: bool = True) -> QuerySet[CV]:
+    """Fuzzy name search or full-text search; unknown modes fall back to full text."""
+    if mode == SearchMode.NAME.value:
+        return search_cvs_by_name(queryset, query, order_by_rank)
+    return search_cvs(queryset, query, order_by_rank)
+
+
+def filter_cvs_by_mode(queryset: QuerySet[CV], query: str, mode: str = SearchMode.TEXT.value) -> QuerySet[CV]:
+    """The CVs ``search_cvs_by_mode`` would return, without its rank and snippet annotations."""
+    if mode != SearchMode.NAME.value:
+        return filter_cvs_by_query(queryset, query)
     query = (query or "").strip()
     if not query:
         return queryset
-    return queryset.filter(Q(firstname__icontains=query) | Q(lastname__icontains=query))
+    if connection.vendor == "postgresql":
+        return queryset.filter(name_match_filter(query))
+    return queryset.filter(id__in=[pk for pk, _ in get_name_index().search(query)])
+
+
+def filter_cvs_by_skills(queryset: QuerySet[CV], skills: Sequence[str]) -> QuerySet[CV]:
+    """
+    Keep CVs that list every one of ``skills`` (any spelling the normalizer folds together).
+
+    Resolved on the (skill, cv) index: one grouped subquery instead of a scan of skill texts.
+    """
+    keys = normalize_skill_filter(skills)
+    if not keys:
+        return queryset
+    matching = (
+        CVSkill.objects.filter(skill__name__in=keys)
+        .values("cv_id")
+        .annotate(matched=Count("skill_id"))
+        .filter(matched=len(keys))
+        .values("cv_id")
+    )
+    return queryset.filter(id__in=matching)
+
 
+def skill_facets(queryset: QuerySet[CV], limit: int = 20) -> List[Dict[str, object]]:
+    """Most common skills among the CVs in ``queryset``, as name/label/count dicts."""
+    rows = (
+        CVSkill.objects.filter(cv_id__in=queryset.order_by().values("id"))
+        .values("skill__name", "skill__label")
+        .annotate(count=Count("cv_id"))
+        .order_by("-count", "skill__name")[:limit]
+    )
+    return [{"name": row["skill__name"], "label": row["skill__label"], "count": row["count"]} for row in rows]
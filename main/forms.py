@@ -55,8 +55,25 @@ class CVDeleteForm(forms.Form):
     )
 
 
-
-
-
-
-
+class BulkAnalysisForm(forms.Form):
+    """Form for starting a bulk analysis over a filtered set of CVs."""
+    question = forms.CharField(
+        max_length=1000,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'e.g., Does this CV show Kubernetes production experience?'
+        })
+    )
+    query = forms.CharField(
+        required=False,
+        max_length=255,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Leave empty to analyze all CVs'
+        })
+    )
+    concurrency = forms.IntegerField(
+        required=False,
+        min_value=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
@@ -0,0 +1,97 @@
+"""
+Management command comparing DRF serializers with the .values() fast path of the list endpoints.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from main.api.mixins import plain_row
+from main.api.renderers import FastJSONRenderer, _get_orjson
+from main.api.serializers import CVSerializer, RequestLogSerializer
+from main.models import CV, RequestLog
+
+LOG_COLUMNS = ['id', 'timestamp', 'method', 'path', 'query_string', 'remote_ip', 'user__username']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Time CV and request log list pages rendered by serializers versus the .values() fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Sample CVs and logs to create (rolled back afterwards)')
+        parser.add_argument('--page-size', type=int, default=100, help='Rows per rendered page')
+        parser.add_argument('--repeat', type=int, default=20, help='Pages rendered per measurement')
+
+    def handle(self, *args, **options):
+        self.page_size = options['page_size']
+        self.repeat = options['repeat']
+        self.stdout.write(f"JSON encoder: {'orjson' if _get_orjson() else 'json (orjson not installed)'}")
+        try:
+            with transaction.atomic():
+                self._create_sample(options['rows'])
+                self._compare('CV list', self._cv_serializer, self._cv_values)
+                self._compare('Request log list', self._log_serializer, self._log_values)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _create_sample(self, rows: int) -> None:
+        users = [get_user_model().objects.create_user(username=f'bench-{i}-{time.time_ns()}') for i in range(10)]
+        CV.objects.bulk_create(
+            CV(
+                firstname=f'First{i}', lastname=f'Last{i}', skills='Python, Django, PostgreSQL, Docker',
+                bio='Backend engineer. ' * 40, projects='Built and ran services. ' * 40, contacts=f'user{i}@example.com',
+            )
+            for i in range(rows)
+        )
+        RequestLog.objects.bulk_create(
+            RequestLog(method='GET', path=f'/api/cv/{i}/', query_string='fields=id', remote_ip='127.0.0.1', user=users[i % len(users)])
+            for i in range(rows)
+        )
+
+    # Current path: one serializer instance per row, stdlib JSON
+    def _cv_serializer(self) -> bytes:
+        page = list(CV.objects.order_by('-created_at', '-id')[:self.page_size])
+        return JSONRenderer().render(CVSerializer(page, many=True).data)
+
+    def _log_serializer(self) -> bytes:
+        page = list(RequestLog.objects.all()[:self.page_size])
+        return JSONRenderer().render(RequestLogSerializer(page, many=True).data)
+
+    # Fast path: plain dicts from .values(), username joined in SQL
+    def _cv_values(self) -> bytes:
+        rows = CV.objects.order_by('-created_at', '-id').values(*CVSerializer.Meta.fields)[:self.page_size]
+        return FastJSONRenderer().render([plain_row(row) for row in rows])
+
+    def _log_values(self) -> bytes:
+        rows = []
+        for row in RequestLog.objects.values(*LOG_COLUMNS)[:self.page_size]:
+            row = plain_row(row)
+            row['username'] = row.pop('user__username')
+            rows.append(row)
+        return FastJSONRenderer().render(rows)
+
+    def _measure(self, render):
+        render()  # warm up
+        with CaptureQueriesContext(connection) as queries:
+            size = len(render())
+        started = time.perf_counter()
+        for _ in range(self.repeat):
+            render()
+        per_page = (time.perf_counter() - started) / self.repeat
+        return per_page, len(queries), size
+
+    def _compare(self, label: str, serializer_render, values_render) -> None:
+        before, before_queries, before_size = self._measure(serializer_render)
+        after, after_queries, after_size = self._measure(values_render)
+        self.stdout.write(f'\n{label} ({self.page_size} rows per page)')
+        self.stdout.write(f'  serializers: {before * 1000:8.2f} ms/page  {before_queries:4d} queries  {before_size} bytes')
+        self.stdout.write(f'  values:      {after * 1000:8.2f} ms/page  {after_queries:4d} queries  {after_size} bytes')
+        self.stdout.write(self.style.SUCCESS(f'  speedup:     {before / after:.1f}x'))
@@ -0,0 +1,44 @@
+"""
+Management command to stream every CV to a file or stdout as NDJSON or CSV.
+"""
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.common.export import FORMATS, NDJSON, export_cvs, export_filename
+
+
+class Command(BaseCommand):
+    help = 'Export all CVs as NDJSON or CSV with constant memory use'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default=NDJSON, help='Output format')
+        parser.add_argument('--output', help='File to write, "-" for stdout (default: cvs.<format>[.gz])')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=getattr(settings, 'CV_EXPORT_CHUNK_SIZE', 2000),
+            help='Rows fetched from the database per round trip'
+        )
+
+    def handle(self, *args, **options):
+        fmt, compress = options['format'], options['gzip']
+        output = options['output'] or export_filename(fmt, compress)
+        chunks = export_cvs(fmt, chunk_size=options['chunk_size'], compress=compress)
+        started = time.monotonic()
+        written = 0
+        if output == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+                written += len(chunk)
+            sys.stdout.buffer.flush()
+            return
+        with open(output, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} bytes to {output} in {elapsed:.1f}s'))
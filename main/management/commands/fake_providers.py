@@ -0,0 +1,55 @@
+"""
+Management command to serve fake OpenAI and SendGrid endpoints for load testing.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.common.fake_providers import FakeProviderServer, LatencyModel
+
+
+class Command(BaseCommand):
+    help = 'Serve local stand-ins for the OpenAI Responses and SendGrid Mail Send APIs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+        parser.add_argument(
+            '--p50',
+            type=float,
+            default=getattr(settings, 'FAKE_PROVIDER_LATENCY_P50', 0.0),
+            help='Median response latency in seconds'
+        )
+        parser.add_argument(
+            '--p99',
+            type=float,
+            default=getattr(settings, 'FAKE_PROVIDER_LATENCY_P99', 0.0),
+            help='99th percentile response latency in seconds'
+        )
+        parser.add_argument(
+            '--error-rate',
+            type=float,
+            default=getattr(settings, 'FAKE_PROVIDER_ERROR_RATE', 0.0),
+            help='Share of requests answered with HTTP 500 (0-1)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=getattr(settings, 'FAKE_PROVIDER_SEED', 0),
+            help='Random seed for latencies and injected errors'
+        )
+
+    def handle(self, *args, **options):
+        latency = LatencyModel(
+            p50=options['p50'], p99=options['p99'], error_rate=options['error_rate'], seed=options['seed']
+        )
+        server = FakeProviderServer(options['host'], options['port'], latency)
+        self.stdout.write(self.style.SUCCESS(f'Fake providers listening on {server.url}'))
+        self.stdout.write(f'  OPENAI_BASE_URL={server.url}/v1')
+        self.stdout.write(f'  SENDGRID_API_HOST={server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Requests served: {server.requests}')
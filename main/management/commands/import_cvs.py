@@ -0,0 +1,99 @@
+"""
+Management command to load CVs in bulk from CSV or JSON Lines.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from main.common.importing import IMPORT_FORMATS, CVImporter, detect_format, open_input, read_records
+from main.common.query_cache import bump_generation
+from main.services import CV_CACHE_NAMESPACE, CVBulkService
+
+PROGRESS_SECONDS = 5.0
+
+
+class Command(BaseCommand):
+    help = 'Import CVs from a CSV or JSON Lines file (optionally .gz) at bulk speed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, or "-" for stdin (needs --format)')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Input format (default: from the file extension)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'CV_IMPORT_BATCH_SIZE', 2000),
+            help='Rows validated and inserted per batch and transaction'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help='Validation processes (1 validates in this process)'
+        )
+        parser.add_argument('--owner', help='Username that will own the imported CVs')
+        parser.add_argument(
+            '--defer-index',
+            action='store_true',
+            help='Queue skill indexing as a Celery job instead of running it after the load'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            fmt = options['format'] or detect_format(path)
+        except ValueError as e:
+            raise CommandError(str(e))
+        owner_id = None
+        if options['owner']:
+            owner_id = get_user_model().objects.filter(username=options['owner']).values_list('id', flat=True).first()
+            if owner_id is None:
+                raise CommandError(f"Unknown user: {options['owner']}")
+
+        self._reported_at = time.monotonic()
+        importer = CVImporter(
+            batch_size=max(options['batch_size'], 1),
+            workers=max(options['workers'], 1),
+            owner_id=owner_id,
+            progress=self._progress,
+        )
+        try:
+            with open_input(path) as stream:
+                report = importer.run(read_records(stream, fmt))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self._report_errors(report)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.imported} of {report.read} CVs ({report.rejected} rejected) '
+            f'in {report.seconds:.1f}s: {report.rows_per_second:.0f} rows/sec'
+        ))
+        if report.imported:
+            self._index(report, options)
+
+    def _report_errors(self, report):
+        for number, errors in report.errors:
+            messages = '; '.join(f'{name}: {" ".join(texts)}' for name, texts in errors.items())
+            self.stderr.write(f'  record {number}: {messages}')
+        if report.rejected > len(report.errors):
+            self.stderr.write(f'  ... and {report.rejected - len(report.errors)} more rejected records')
+
+    def _index(self, report, options):
+        # New rows must show up in cached list pages right away, before indexing finishes
+        bump_generation(CV_CACHE_NAMESPACE)
+        if options['defer_index']:
+            from celery_tasks.tasks.indexing import index_imported_cvs_task
+
+            index_imported_cvs_task.delay(report.first_id, report.last_id)
+            self.stdout.write(f'Queued skill indexing for CV ids {report.first_id}-{report.last_id}')
+        else:
+            count = CVBulkService(batch_size=options['batch_size']).index_range(report.first_id, report.last_id)
+            self.stdout.write(f'Indexed skills of {count} CVs')
+
+    def _progress(self, report):
+        if time.monotonic() - self._reported_at < PROGRESS_SECONDS:
+            return
+        self._reported_at = time.monotonic()
+        self.stdout.write(f'  {report.read} read, {report.imported} imported, {report.rows_per_second:.0f} rows/sec')
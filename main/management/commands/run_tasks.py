@@ -35,10 +35,13 @@ class Command(BaseCommand):
             'generate_cv_pdf': generate_cv_pdf_task,
             'email_cv_pdf': email_cv_pdf_task,
             'analyze_cv': analyze_cv_task,
+            'analyze_cv_questions': analyze_cv_questions_task,
+            'run_bulk_analysis': run_bulk_analysis_task,
             'send_notification': send_notification_email,
             'send_cv_created_notification': send_cv_created_notification,
             'send_cv_updated_notification': send_cv_updated_notification,
             'cleanup_old_logs': cleanup_old_logs,
+            'cleanup_old_results': cleanup_old_results,
             'cleanup_old_pdf_files': cleanup_old_pdf_files,
             'cleanup_orphaned_files': cleanup_orphaned_files,
             'generate_daily_stats': generate_daily_stats,
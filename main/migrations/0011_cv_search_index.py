@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from main.common.search import install_search_index, uninstall_search_index
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """Full-text index over CV names, skills, bio and projects (tsvector + GIN on Postgres, FTS5 on SQLite)."""
+
+    dependencies = [
+        ('main', '0010_bulkanalysisjob_bulkanalysisitem'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
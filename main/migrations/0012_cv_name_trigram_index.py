@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from main.common.trigram import install_trigram_index, uninstall_trigram_index
+
+
+def create_trigram_index(apps, schema_editor):
+    install_trigram_index(schema_editor.connection)
+
+
+def drop_trigram_index(apps, schema_editor):
+    uninstall_trigram_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """pg_trgm GIN index over the full CV name for fuzzy name search; other backends search in memory."""
+
+    dependencies = [
+        ('main', '0011_cv_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
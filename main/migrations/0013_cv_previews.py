@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:45
+
+from django.db import migrations, models
+
+from main.common.previews import bio_preview, skills_preview
+
+
+def backfill_previews(apps, schema_editor):
+    CV = apps.get_model('main', 'CV')
+    batch = []
+    for cv in CV.objects.only('bio', 'skills').order_by('pk').iterator(chunk_size=1000):
+        cv.bio_preview = bio_preview(cv.bio)
+        cv.skills_preview = skills_preview(cv.skills)
+        batch.append(cv)
+        if len(batch) >= 1000:
+            CV.objects.bulk_update(batch, ['bio_preview', 'skills_preview'])
+            batch = []
+    if batch:
+        CV.objects.bulk_update(batch, ['bio_preview', 'skills_preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_cv_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cv',
+            name='bio_preview',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='cv',
+            name='skills_preview',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_previews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_cv_previews'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['created_at', 'id'], name='cv_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['updated_at', 'id'], name='cv_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['firstname', 'id'], name='cv_firstname_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['lastname', 'id'], name='cv_lastname_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['lastname', 'firstname'], name='cv_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cv',
+            index=models.Index(fields=['owner', 'created_at'], name='cv_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['timestamp'], name='requestlog_timestamp_idx'),
+        ),
+    ]
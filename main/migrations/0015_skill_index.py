@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from main.common.skills import extract_skills
+
+
+def backfill_skills(apps, schema_editor):
+    CV = apps.get_model('main', 'CV')
+    Skill = apps.get_model('main', 'Skill')
+    CVSkill = apps.get_model('main', 'CVSkill')
+    skill_ids = {}
+    links = []
+    for cv_id, text in CV.objects.order_by('pk').values_list('pk', 'skills').iterator(chunk_size=1000):
+        for key, label in extract_skills(text).items():
+            if key not in skill_ids:
+                skill_ids[key] = Skill.objects.get_or_create(name=key, defaults={'label': label})[0].pk
+            links.append(CVSkill(cv_id=cv_id, skill_id=skill_ids[key]))
+        if len(links) >= 5000:
+            CVSkill.objects.bulk_create(links, ignore_conflicts=True)
+            links = []
+    CVSkill.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_list_and_log_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=60, unique=True)),
+                ('label', models.CharField(max_length=60)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CVSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cv', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='main.cv')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cv_links', to='main.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='cv',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='cvs', through='main.CVSkill', to='main.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='cvskill',
+            index=models.Index(fields=['skill', 'cv'], name='cvskill_skill_cv_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='cvskill',
+            constraint=models.UniqueConstraint(fields=('cv', 'skill'), name='unique_cv_skill'),
+        ),
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
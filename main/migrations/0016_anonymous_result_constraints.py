@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def drop_anonymous_duplicates(apps, schema_editor):
+    """Keep the newest anonymous row per key so the new constraints can be created."""
+    for model_name, key in (('AnalysisResult', 'question_hash'), ('TranslationResult', 'language')):
+        model = apps.get_model('main', model_name)
+        seen = set()
+        stale = []
+        rows = model.objects.filter(user__isnull=True).order_by('-updated_at', '-pk').values_list('pk', 'cv_id', key)
+        for pk, cv_id, value in rows.iterator(chunk_size=1000):
+            if (cv_id, value) in seen:
+                stale.append(pk)
+            else:
+                seen.add((cv_id, value))
+        model.objects.filter(pk__in=stale).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_skill_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_anonymous_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='analysisresult',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('cv', 'question_hash'), name='unique_anonymous_analysis_result'),
+        ),
+        migrations.AddConstraint(
+            model_name='translationresult',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('cv', 'language'), name='unique_anonymous_translation_result'),
+        ),
+    ]
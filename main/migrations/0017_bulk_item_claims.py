@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_anonymous_result_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkanalysisitem',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bulkanalysisitem',
+            name='claimed_by',
+            field=models.CharField(blank=True, help_text='Task run processing the item', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='bulkanalysisitem',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
@@ -1,6 +1,12 @@
+import hashlib
+
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 
+from .common.previews import BIO_PREVIEW_LENGTH, SKILLS_PREVIEW_LENGTH, bio_preview, skills_preview
+from .common.skills import SKILL_NAME_LENGTH
+
 class CV(models.Model):
     firstname = models.CharField(max_length=100)
     lastname = models.CharField(max_length=100)
@@ -11,13 +17,75 @@ class CV(models.Model):
     owner = models.ForeignKey(get_user_model(), null=True, blank=True, on_delete=models.SET_NULL, related_name='cvs')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized card previews so list pages never read the full text fields
+    bio_preview = models.CharField(max_length=BIO_PREVIEW_LENGTH, blank=True, default='', editable=False)
+    skills_preview = models.CharField(max_length=SKILLS_PREVIEW_LENGTH, blank=True, default='', editable=False)
+    # Normalized skills parsed from the free-text field, kept in sync on save
+    skill_tags = models.ManyToManyField('Skill', through='CVSkill', related_name='cvs', blank=True)
 
     class Meta:
         ordering = ["lastname", "firstname"]
+        # One index per list sort: keyset pages read (key, id) ranges, in either direction
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="cv_created_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="cv_updated_id_idx"),
+            models.Index(fields=["firstname", "id"], name="cv_firstname_id_idx"),
+            models.Index(fields=["lastname", "id"], name="cv_lastname_id_idx"),
+            models.Index(fields=["lastname", "firstname"], name="cv_name_idx"),
+            models.Index(fields=["owner", "created_at"], name="cv_owner_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.firstname} {self.lastname}"
 
+    def refresh_previews(self) -> None:
+        self.bio_preview = bio_preview(self.bio)
+        self.skills_preview = skills_preview(self.skills)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.refresh_previews()
+        elif {'bio', 'skills'} & set(update_fields):
+            self.refresh_previews()
+            kwargs['update_fields'] = set(update_fields) | {'bio_preview', 'skills_preview'}
+        super().save(*args, **kwargs)
+
+    def content_hash(self) -> str:
+        """SHA-256 of the CV text fields; changes whenever an edit would change an analysis."""
+        content = "\x1f".join(
+            [self.firstname, self.lastname, self.bio, self.skills, self.projects, self.contacts]
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=SKILL_NAME_LENGTH, unique=True)  # canonical key, e.g. "javascript"
+    label = models.CharField(max_length=SKILL_NAME_LENGTH)  # first spelling seen, e.g. "JavaScript"
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.label
+
+
+class CVSkill(models.Model):
+    cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='cv_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["cv", "skill"], name="unique_cv_skill"),
+        ]
+        # Skill-first, so filters and facet counts read only this index
+        indexes = [
+            models.Index(fields=["skill", "cv"], name="cvskill_skill_cv_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.cv_id}:{self.skill_id}"
+
 
 class RequestLog(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
@@ -29,8 +97,137 @@ class RequestLog(models.Model):
 
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["timestamp"], name="requestlog_timestamp_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.timestamp} {self.method} {self.path}"
 
 
+def question_hash(question: str) -> str:
+    """Stable key for a free-text question: case- and whitespace-insensitive SHA-256."""
+    normalized = " ".join((question or "").lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class AnalysisResult(models.Model):
+    """Completed AI analysis; sessions keep only the id of the result to show."""
+
+    user = models.ForeignKey(get_user_model(), null=True, blank=True, on_delete=models.CASCADE, related_name='analysis_results')
+    cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='analysis_results')
+    question_hash = models.CharField(max_length=64)
+    question = models.TextField()
+    analysis = models.TextField()
+    is_enabled = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "cv", "question_hash"], name="unique_analysis_result"),
+            # NULLs never collide in the constraint above, so anonymous results need their own
+            models.UniqueConstraint(
+                fields=["cv", "question_hash"], condition=Q(user__isnull=True), name="unique_anonymous_analysis_result"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Analysis of CV {self.cv_id}: {self.question[:50]}"
+
+
+class TranslationResult(models.Model):
+    """Completed CV translation; sessions keep only the id of the result to show."""
+
+    user = models.ForeignKey(get_user_model(), null=True, blank=True, on_delete=models.CASCADE, related_name='translation_results')
+    cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='translation_results')
+    language = models.CharField(max_length=50)
+    translations = models.JSONField(default=dict)
+    is_enabled = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "cv", "language"], name="unique_translation_result"),
+            models.UniqueConstraint(
+                fields=["cv", "language"], condition=Q(user__isnull=True), name="unique_anonymous_translation_result"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Translation of CV {self.cv_id} to {self.language}"
+
+
+class BulkAnalysisJob(models.Model):
+    """One question asked of every CV matching a filter, processed in the background."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    owner = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name='bulk_analysis_jobs')
+    question = models.TextField()
+    query = models.CharField(max_length=255, blank=True, help_text="CV search filter the job was created with")
+    concurrency = models.PositiveSmallIntegerField(default=4)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    task_id = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Bulk analysis {self.pk}: {self.question[:50]}"
+
+
+class BulkAnalysisItem(models.Model):
+    """
+    Per-CV result of a bulk analysis job; completed items are skipped when a job resumes.
+
+    A run claims items by moving them from pending to running, so two runs of the same
+    job never analyse the same CV.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job = models.ForeignKey(BulkAnalysisJob, on_delete=models.CASCADE, related_name='items')
+    cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='bulk_analysis_items')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    analysis = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    claimed_by = models.CharField(max_length=255, blank=True, help_text="Task run processing the item")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(fields=["job", "cv"], name="unique_bulk_analysis_item"),
+        ]
+        indexes = [
+            models.Index(fields=["job", "status"], name="bulk_item_job_status_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Bulk analysis {self.job_id} / CV {self.cv_id}"
@@ -1,27 +1,60 @@
 from __future__ import annotations
 
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Optional, Protocol, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple
 
 from django.conf import settings
-from django.db.models import QuerySet
+from django.db import transaction
+from django.db.models import Count, Max, QuerySet
+from django.utils import timezone
 from django.shortcuts import get_object_or_404
 import logging
 
+from .enums import SearchMode
+from .filters.cv_filters import filter_cvs_by_mode, filter_cvs_by_skills, search_cvs_by_mode, skill_facets
 from .models import CV
+from .common.chunking import extract_glossary, join_chunks, split_into_chunks
+from .common.language import PLACEHOLDER_RE, language_code, plan_translation
+from .common.keyset import KeysetPage, paginate_keyset
+from .common.prompts import CVPromptBuilder
+from .common.query_cache import bump_generation, deferred_bumps, get_query_cache
+from .common.resilience import CircuitOpenError, call_with_resilience, get_circuit_breaker, get_latency_tracker, track_stream
+from .common.semaphore import SemaphoreTimeout, get_provider_semaphore
+from .common.skills import normalize_skill_filter, sync_skills
 from celery_tasks.services.pdf_service import PDFService
 
 logger = logging.getLogger(__name__)
 
+NOT_CONFIGURED_MESSAGE = "CV analysis is not available. Please configure OpenAI API key."
+CIRCUIT_OPEN_MESSAGE = "CV analysis is temporarily unavailable. Please try again in a moment."
+BUSY_MESSAGE = "CV analysis is busy right now. Please try again in a moment."
+ANALYSIS_FAILED_PREFIX = "Analysis failed:"
+
+CV_SORT_FIELDS = ('created_at', 'updated_at', 'firstname', 'lastname')
+# Query cache namespace whose generation is bumped on every CV write
+CV_CACHE_NAMESPACE = 'cv'
+# Columns a CV card needs; the full text fields stay on disk until a CV is opened
+LISTING_FIELDS = ('firstname', 'lastname', 'created_at', 'updated_at', 'bio_preview', 'skills_preview', 'owner_id')
+
+
+def cv_sort_field(sort_by: Optional[str], order: Optional[str]) -> str:
+    """Validated ``order_by`` term for a CV sort; unknown fields sort by creation date."""
+    if sort_by not in CV_SORT_FIELDS:
+        sort_by = 'created_at'
+    return sort_by if order == 'asc' else f"-{sort_by}"
+
 
 class CVRepository:
     """Data access layer for CV model."""
 
     def get_all_lightweight(self) -> QuerySet[CV]:
-        return CV.objects.select_related('owner').only(
-            "firstname", "lastname", "created_at", "updated_at", "bio", "skills", "projects", "contacts", "owner_id"
-        ).order_by("-created_at")
+        return CV.objects.only(*LISTING_FIELDS).order_by("-created_at")
     
     def get_all_lightweight_sorted(self, sort_by: str = "created_at", order: str = "desc") -> QuerySet[CV]:
         """
@@ -34,22 +67,18 @@ class CVRepository:
         Returns:
             QuerySet of CVs sorted by specified field
         """
-        valid_sort_fields = ['created_at', 'updated_at', 'firstname', 'lastname']
-        if sort_by not in valid_sort_fields:
-            sort_by = 'created_at'
-        
-        if order == 'asc':
-            sort_field = sort_by
-        else:  # desc
-            sort_field = f"-{sort_by}"
-        
-        return CV.objects.select_related('owner').only(
-            "firstname", "lastname", "created_at", "updated_at", "bio", "skills", "projects", "contacts", "owner_id"
-        ).order_by(sort_field)
+        sort_field = cv_sort_field(sort_by, order)
+        return CV.objects.only(*LISTING_FIELDS).order_by(sort_field)
+
+    def get_listing_by_ids(self, ids: Sequence[int]) -> Dict[int, CV]:
+        return CV.objects.only(*LISTING_FIELDS).in_bulk(ids)
 
     def get_by_id(self, cv_id: int) -> CV:
         return get_object_or_404(CV, pk=cv_id)
 
+    def get_updated_at(self, cv_id: int) -> Optional[datetime]:
+        return CV.objects.filter(pk=cv_id).values_list("updated_at", flat=True).first()
+
 
 @dataclass
 class PDFExportResult:
@@ -96,6 +125,88 @@ class CVService:
         """
         return self.repository.get_all_lightweight_sorted(sort_by, order)
 
+    def list_page(
+        self,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        query: str = "",
+        mode: str = SearchMode.TEXT.value,
+        cursor: Optional[str] = None,
+        page_size: int = 24,
+        order_by_rank: bool = True,
+        skills: Sequence[str] = (),
+    ) -> KeysetPage:
+        """
+        One page of the sorted, optionally searched and skill-filtered CV list.
+
+        The page's CV ids, cursors and search snippets are cached under the CV generation
+        counter, so repeat views skip the sort and search and load the rows by primary key.
+
+        Raises:
+            InvalidCursor: ``cursor`` was issued for a different ordering
+        """
+        query = (query or "").strip()
+        skills = normalize_skill_filter(skills)
+
+        def compute() -> dict:
+            queryset = filter_cvs_by_skills(self.list_cvs_sorted(sort_by, order), skills)
+            queryset = search_cvs_by_mode(queryset, query, mode, order_by_rank)
+            page = paginate_keyset(queryset, page_size, cursor)
+            return {
+                'ids': [cv.pk for cv in page.items],
+                'snippets': {cv.pk: getattr(cv, 'search_snippet', None) for cv in page.items},
+                'next': page.next_cursor,
+                'previous': page.previous_cursor,
+            }
+
+        parts = ('page', sort_by, order, query, mode if query else None, order_by_rank and bool(query), sorted(skills), cursor, page_size)
+        result = self._cached(parts, compute)
+
+        rows = self.repository.get_listing_by_ids(result['ids'])
+        items = []
+        for pk in result['ids']:
+            if pk in rows:
+                rows[pk].search_snippet = result['snippets'].get(pk)
+                items.append(rows[pk])
+        return KeysetPage(items=items, next_cursor=result['next'], previous_cursor=result['previous'])
+
+    def skill_facets(
+        self, query: str = "", mode: str = SearchMode.TEXT.value, skills: Sequence[str] = (), limit: int = 20
+    ) -> List[Dict[str, object]]:
+        """Skill counts over the CVs matching the search and skill filter (cached like list pages)."""
+        query = (query or "").strip()
+        skills = normalize_skill_filter(skills)
+
+        def compute() -> List[Dict[str, object]]:
+            queryset = filter_cvs_by_skills(CV.objects.all(), skills)
+            queryset = search_cvs_by_mode(queryset, query, mode, order_by_rank=False)
+            return skill_facets(queryset, limit)
+
+        return self._cached(('facets', query, mode if query else None, sorted(skills), limit), compute)
+
+    def list_fingerprint(
+        self, query: str = "", mode: str = SearchMode.TEXT.value, skills: Sequence[str] = ()
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Count and newest ``updated_at`` of the CVs a list or search covers.
+
+        One aggregate query, never cached: it is the cheap check that decides whether a
+        client's copy of the list is still current. Any create, edit or delete changes it.
+        """
+        queryset = filter_cvs_by_skills(CV.objects.all(), normalize_skill_filter(skills))
+        queryset = filter_cvs_by_mode(queryset, (query or "").strip(), mode)
+        stamp = queryset.order_by().aggregate(count=Count("id"), updated=Max("updated_at"))
+        return stamp["count"], stamp["updated"]
+
+    def last_modified(self, cv_id: int) -> Optional[datetime]:
+        """When a CV last changed, or None if it does not exist."""
+        return self.repository.get_updated_at(cv_id)
+
+    def _cached(self, parts: Sequence[object], compute):
+        if not getattr(settings, 'CV_LIST_CACHE_ENABLED', False):
+            return compute()
+        return get_query_cache(CV_CACHE_NAMESPACE, settings.CV_LIST_CACHE_TTL).get_or_compute(parts, compute)
+
     def retrieve_cv(self, cv_id: int) -> CV:
         return self.repository.get_by_id(cv_id)
 
@@ -105,16 +216,282 @@ class CVService:
         return result.file_path
 
 
+class CVBulkService:
+    """
+    Many CV writes in a few queries, in batched transactions.
+
+    ``bulk_create``/``bulk_update`` skip ``save()`` and its signals, so this class does
+    their work itself: card previews, ``updated_at``, skill links, and one invalidation of
+    the cached list pages per call instead of one per CV. Deletes still send ``post_delete``
+    per row; their invalidations are deferred into one as well.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        self.batch_size = batch_size or getattr(settings, 'CV_BULK_BATCH_SIZE', 500)
+
+    def _batches(self, items: Sequence) -> Iterator[Sequence]:
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def create(self, rows: Sequence[Dict[str, object]], owner=None) -> List[CV]:
+        """Insert one CV per dict of field values; returns them with primary keys set."""
+        cvs = [CV(owner=owner, **row) for row in rows]
+        for cv in cvs:
+            cv.refresh_previews()
+        for batch in self._batches(cvs):
+            with transaction.atomic():
+                CV.objects.bulk_create(batch)
+                sync_skills(batch)
+        if cvs:
+            bump_generation(CV_CACHE_NAMESPACE)
+        return cvs
+
+    def update(self, changes: Sequence[Tuple[CV, Dict[str, object]]]) -> List[CV]:
+        """Apply field changes to loaded CVs; each distinct set of changed fields is one UPDATE per batch."""
+        now = timezone.now()
+        groups: Dict[Tuple[str, ...], List[CV]] = {}
+        for cv, data in changes:
+            for name, value in data.items():
+                setattr(cv, name, value)
+            fields = set(data) | {'updated_at'}
+            if {'bio', 'skills'} & fields:
+                cv.refresh_previews()
+                fields |= {'bio_preview', 'skills_preview'}
+            # auto_now is not applied by bulk_update
+            cv.updated_at = now
+            groups.setdefault(tuple(sorted(fields)), []).append(cv)
+        for fields, cvs in groups.items():
+            for batch in self._batches(cvs):
+                with transaction.atomic():
+                    CV.objects.bulk_update(batch, fields)
+                    if 'skills' in fields:
+                        sync_skills(batch)
+        if changes:
+            bump_generation(CV_CACHE_NAMESPACE)
+        return [cv for cv, _ in changes]
+
+    def index_range(self, first_id: int, last_id: int) -> int:
+        """
+        Derived data for CVs loaded without it (see ``CVImporter``): skill links for ids in
+        ``first_id..last_id``, read and written one batch per transaction.
+        """
+        queryset = CV.objects.filter(id__gte=first_id, id__lte=last_id).order_by('id').only('id', 'skills')
+        batch: List[CV] = []
+        count = 0
+        for cv in queryset.iterator(chunk_size=self.batch_size):
+            batch.append(cv)
+            if len(batch) >= self.batch_size:
+                count += self._index_batch(batch)
+                batch = []
+        count += self._index_batch(batch)
+        if count:
+            bump_generation(CV_CACHE_NAMESPACE)
+        return count
+
+    def _index_batch(self, batch: List[CV]) -> int:
+        if batch:
+            with transaction.atomic():
+                sync_skills(batch)
+        return len(batch)
+
+    def delete(self, ids: Sequence[int]) -> int:
+        """Delete CVs (and their dependent rows) by id; returns how many CVs were removed."""
+        deleted = 0
+        # QuerySet.delete() sends post_delete per row; invalidate once for the whole call
+        with deferred_bumps(CV_CACHE_NAMESPACE):
+            for batch in self._batches(list(ids)):
+                with transaction.atomic():
+                    _, counts = CV.objects.filter(id__in=batch).delete()
+                deleted += counts.get(CV._meta.label, 0)
+        return deleted
+
+
+def _openai_configured(api_key: Optional[str]) -> bool:
+    return bool(api_key) or getattr(settings, 'OPENAI_FAKE', False)
+
+
+def _build_openai_client(api_key: Optional[str], project: Optional[str] = None):
+    """OpenAI client with an explicit request timeout instead of the SDK's 10 minute default."""
+    if getattr(settings, 'OPENAI_FAKE', False):
+        from .common.fake_providers import FakeOpenAIClient
+
+        logger.info("Using the in-process fake OpenAI client")
+        return FakeOpenAIClient()
+
+    from openai import OpenAI  # type: ignore
+
+    options = {
+        'api_key': api_key,
+        'timeout': getattr(settings, 'OPENAI_TIMEOUT_SECONDS', 30.0),
+        'max_retries': getattr(settings, 'OPENAI_MAX_RETRIES', 1),
+    }
+    if project:
+        options['project'] = project
+    base_url = getattr(settings, 'OPENAI_BASE_URL', None)
+    if base_url:
+        options['base_url'] = base_url
+    return OpenAI(**options)
+
+
+def openai_semaphore():
+    """The OPENAI_CONCURRENCY_LIMIT slots shared by all workers."""
+    return get_provider_semaphore(
+        'openai',
+        limit=getattr(settings, 'OPENAI_CONCURRENCY_LIMIT', 8),
+        backend=getattr(settings, 'OPENAI_CONCURRENCY_BACKEND', 'redis'),
+        lease_seconds=getattr(settings, 'OPENAI_CONCURRENCY_LEASE_SECONDS', 120.0),
+    )
+
+
+def _create_openai_response(client, purpose: str, allow_hedge: bool = True, **kwargs):
+    """
+    Call ``client.responses.create`` under the shared OpenAI circuit breaker and deadline.
+
+    Every attempt holds its own concurrency slot until its request really ends, even after
+    the deadline has given up on it, and a stream holds it (renewing the lease) until it
+    has been read. The first slot is taken before the deadline starts, so queueing for a
+    slot never counts as a provider timeout; a hedged attempt only runs if a slot is free.
+
+    Args:
+        client: OpenAI client
+        purpose: Latency bucket for hedging ('translate', 'analysis')
+        allow_hedge: Set False for calls whose losing attempt cannot be discarded (streams)
+        **kwargs: Arguments for ``responses.create``
+
+    Raises:
+        CircuitOpenError: The breaker is open; no slot was taken
+        SemaphoreTimeout: No slot became free within OPENAI_CONCURRENCY_WAIT_SECONDS
+    """
+    breaker = get_circuit_breaker(
+        'openai',
+        failure_threshold=getattr(settings, 'OPENAI_CIRCUIT_FAILURE_THRESHOLD', 5),
+        reset_timeout=getattr(settings, 'OPENAI_CIRCUIT_RESET_SECONDS', 30.0),
+    )
+    if breaker.state == breaker.OPEN:
+        raise CircuitOpenError(f"Circuit {breaker.name} is open")
+    semaphore = openai_semaphore()
+    first_lease = semaphore.acquire(getattr(settings, 'OPENAI_CONCURRENCY_WAIT_SECONDS', 60.0))
+    deadline = getattr(settings, 'OPENAI_TIMEOUT_SECONDS', 30.0)
+    streaming = bool(kwargs.get('stream'))
+    attempts = _LeasedAttempts(client, semaphore, first_lease, deadline, kwargs)
+    try:
+        response = call_with_resilience(
+            attempts,
+            breaker=breaker,
+            latency=get_latency_tracker(f'openai:{purpose}'),
+            deadline=deadline,
+            hedge=allow_hedge and not streaming and getattr(settings, 'OPENAI_HEDGE_ENABLED', False),
+            hedge_min_samples=getattr(settings, 'OPENAI_HEDGE_MIN_SAMPLES', 20),
+            defer_success=streaming,
+        )
+    except BaseException:
+        attempts.abandon()
+        raise
+    finally:
+        # Still held when no attempt started (e.g. the breaker refused the call)
+        attempts.release_unused()
+    # A stream is only known to be healthy once it has been read to the end
+    return track_stream(response, breaker) if streaming else response
+
+
+class _LeasedStream:
+    """Provider stream that keeps its attempt's slot leased while it is read and frees it at the end."""
+
+    def __init__(self, stream, lease) -> None:
+        self._stream = stream
+        self._lease = lease
+
+    def __iter__(self) -> Iterator:
+        try:
+            for event in self._stream:
+                self._lease.keep_alive()
+                yield event
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._lease.release()
+        close = getattr(self._stream, 'close', None)
+        if close is not None:
+            close()
+
+
+class _LeasedAttempts:
+    """
+    The attempts of one ``responses.create`` call, each holding its own concurrency slot.
+
+    The first attempt uses the lease taken before the deadline started; hedged attempts
+    only run if a slot is free right away. Streams opened after the caller gave up are
+    closed at once, and ``abandon`` closes those it was still waiting on.
+    """
+
+    def __init__(self, client, semaphore, first_lease, deadline: float, kwargs: Dict[str, object]) -> None:
+        self._client = client
+        self._semaphore = semaphore
+        self._leases = [first_lease]
+        self._deadline = deadline
+        self._kwargs = kwargs
+        self._streaming = bool(kwargs.get('stream'))
+        self._opened: List[_LeasedStream] = []
+        self._gave_up = False
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        lease = self._take_lease()
+        try:
+            # The request timeout ends attempts the deadline has abandoned, freeing their slot
+            response = self._client.responses.create(timeout=self._deadline, **self._kwargs)
+        except BaseException:
+            lease.release()
+            raise
+        if not self._streaming:
+            lease.release()
+            return response
+        stream = _LeasedStream(response, lease)
+        with self._lock:
+            if not self._gave_up:
+                self._opened.append(stream)
+                return stream
+        stream.close()
+        raise TimeoutError("OpenAI stream opened after the caller gave up")
+
+    def _take_lease(self):
+        with self._lock:
+            if self._leases:
+                return self._leases.pop()
+        return self._semaphore.acquire(0)
+
+    def abandon(self) -> None:
+        """The caller gave up: close the streams attempts have opened so far."""
+        with self._lock:
+            self._gave_up = True
+            stale, self._opened = self._opened, []
+        for stream in stale:
+            stream.close()
+
+    def release_unused(self) -> None:
+        with self._lock:
+            leases, self._leases = self._leases, []
+        for lease in leases:
+            lease.release()
+
+
+class TranslationFailed(Exception):
+    """Raised by a provider created with ``raise_errors`` instead of returning the source text."""
+
+
 class TranslationProvider(Protocol):
     def translate(self, text: str, target_language: str) -> str: ...
     def is_enabled(self) -> bool: ...
 
 
 class OpenAITranslationProvider:
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, raise_errors: bool = False) -> None:
         self.api_key = api_key or getattr(settings, 'OPENAI_API_KEY', None)
         self.model = model or getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini-translator')
         self.project = getattr(settings, 'OPENAI_PROJECT', None)
+        # Callers that route between providers need failures raised, not the source text back
+        self.raise_errors = raise_errors
         self._client = None
         
         # Debug logging
@@ -123,16 +500,12 @@ class OpenAITranslationProvider:
         logger.info(f"OpenAI model: {self.model}")
         logger.info(f"OpenAI project: {self.project}")
         
-        if not self.api_key:
+        if not _openai_configured(self.api_key):
             logger.info("OpenAI API key not configured; translation will be a no-op")
             return
         try:
-            from openai import OpenAI  # type: ignore
             # 2025 pattern: pass project if present
-            if self.project:
-                self._client = OpenAI(api_key=self.api_key, project=self.project)
-            else:
-                self._client = OpenAI(api_key=self.api_key)
+            self._client = _build_openai_client(self.api_key, self.project)
             logger.info("OpenAI client initialized successfully")
         except Exception as err:
             logger.exception("Failed to initialize OpenAI client: %s", err)
@@ -144,10 +517,37 @@ class OpenAITranslationProvider:
     def translate(self, text: str, target_language: str) -> str:
         if not self._client:
             return text  # fallback: no-op if OpenAI not configured
+        # Long fields would be cut off at max_output_tokens: translate them in chunks, in parallel
+        chunks = split_into_chunks(text, getattr(settings, 'TRANSLATION_CHUNK_TOKENS', 500), self.model)
+        if len(chunks) == 1:
+            return self._translate_chunk(text, target_language)
+
+        glossary = extract_glossary(text)
+        workers = min(len(chunks), getattr(settings, 'TRANSLATION_CHUNK_CONCURRENCY', 4))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate-chunk') as pool:
+            translated = list(pool.map(
+                lambda chunk: self._translate_chunk(chunk.text, target_language, glossary), chunks
+            ))
+        logger.info(f"Translated {len(chunks)} chunks into {target_language} with {workers} workers")
+        return join_chunks(translated, chunks)
+
+    def _translate_chunk(self, text: str, target_language: str, glossary: Sequence[str] = ()) -> str:
+        if not text.strip():
+            return text
         try:
             # 2025: Responses API supports text instruction with JSON output if needed.
             instruction = f"Translate into {target_language}. Return only the translated text without quotes."
-            resp = self._client.responses.create(
+            if glossary:
+                # Chunks are translated independently; pin shared terms so they read the same everywhere
+                instruction += (
+                    " This is one part of a longer text. Keep these terms unchanged: "
+                    + ", ".join(glossary) + "."
+                )
+            if PLACEHOLDER_RE.search(text):
+                instruction += " Copy placeholders such as ⟦0⟧ exactly and keep the line breaks."
+            resp = _create_openai_response(
+                self._client,
+                'translate',
                 model=self.model,
                 input=[
                     {
@@ -162,8 +562,15 @@ class OpenAITranslationProvider:
             # responses API: text lives at output_text
             out = getattr(resp, 'output_text', None)
             return out or text
+        except (CircuitOpenError, SemaphoreTimeout) as err:
+            logger.warning("OpenAI translate skipped: %s", err)
+            if self.raise_errors:
+                raise TranslationFailed(str(err)) from err
+            return text
         except Exception as err:
             logger.exception("OpenAI translate failed: %s", err)
+            if self.raise_errors:
+                raise TranslationFailed(str(err)) from err
             return text
 
 
@@ -179,9 +586,40 @@ class TranslationService:
             'projects': cv.projects or '',
             'contacts': cv.contacts or '',
         }
-        result = {k: self.provider.translate(v, target_language) for k, v in fields.items()}
+        result = {k: self._translate_field(k, v, target_language) for k, v in fields.items()}
         return result, self.provider.is_enabled()
 
+    def _translate_field(self, name: str, text: str, target_language: str) -> str:
+        """
+        Send only the lines that need it to the provider.
+
+        Names are never translated. Emails, URLs, phone numbers (and code identifiers in
+        skills) are masked, and lines already in the target language are left alone.
+        """
+        if name == 'name' or not text.strip():
+            return text
+        plan = plan_translation(text, language_code(target_language), identifiers=(name == 'skills'))
+        pending = plan.pending()
+        if not pending:
+            return text
+        logger.info(f"Translating {len(pending)}/{len(plan.lines)} lines of {name}")
+
+        translated = self.provider.translate("\n".join(plan.lines[i] for i in pending), target_language).split("\n")
+        if len(translated) != len(pending):
+            # The provider merged or split lines; translate them one by one instead
+            translated = [self.provider.translate(plan.lines[i], target_language) for i in pending]
+        assembled = plan.assemble(dict(zip(pending, translated)))
+        if assembled is None:
+            logger.warning(f"Translation of {name} dropped placeholders; translating it unmasked")
+            return self.provider.translate(text, target_language)
+        return assembled
+
+
+def is_failed_analysis(text: str) -> bool:
+    """True for the messages providers return instead of an answer when they could not produce one."""
+    text = (text or '').strip()
+    return text in (NOT_CONFIGURED_MESSAGE, CIRCUIT_OPEN_MESSAGE, BUSY_MESSAGE) or text.startswith(ANALYSIS_FAILED_PREFIX)
+
 
 class CVAnalysisProvider(Protocol):
     """Protocol for CV analysis providers."""
@@ -190,6 +628,36 @@ class CVAnalysisProvider(Protocol):
         """Analyze CV content and answer a specific question."""
         ...
 
+    def stream_analyze_cv(self, content: str, question: str) -> Iterator[str]:
+        """Analyze CV content, yielding the answer in text chunks as they are produced."""
+        ...
+
+    def analyze_cv_questions(self, content: str, questions: Sequence[str]) -> List[str]:
+        """Answer several questions about the same CV content, in question order."""
+        ...
+
+
+# Structured output for multi-question analysis: one answer per question index
+MULTI_ANSWER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "answers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "answer": {"type": "string"},
+                },
+                "required": ["index", "answer"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["answers"],
+    "additionalProperties": False,
+}
+
 
 class OpenAICVAnalysisProvider:
     """OpenAI-based CV analysis provider."""
@@ -206,16 +674,12 @@ class OpenAICVAnalysisProvider:
         logger.info(f"CV Analysis - OpenAI model: {self.model}")
         logger.info(f"CV Analysis - OpenAI project: {self.project}")
         
-        if not self.api_key:
+        if not _openai_configured(self.api_key):
             logger.info("OpenAI API key not configured; CV analysis will be a no-op")
             return
             
         try:
-            from openai import OpenAI  # type: ignore
-            if self.project:
-                self._client = OpenAI(api_key=self.api_key, project=self.project)
-            else:
-                self._client = OpenAI(api_key=self.api_key)
+            self._client = _build_openai_client(self.api_key, self.project)
             logger.info("CV Analysis - OpenAI client initialized successfully")
         except Exception as err:
             logger.exception("Failed to initialize OpenAI client for CV analysis: %s", err)
@@ -224,25 +688,103 @@ class OpenAICVAnalysisProvider:
     def is_enabled(self) -> bool:
         return self._client is not None
 
+    def _build_input(self, content: str, question: str) -> list:
+        prompt = (
+            f"CV Content:\n{content}\n\n"
+            f"Question/Request: {question}\n\n"
+            "Provide specific, actionable and professional feedback, "
+            "focused on practical improvements the candidate can make."
+        )
+        return [
+            {
+                "role": "system",
+                "content": "You are a professional CV reviewer and career advisor. Provide constructive, actionable feedback."
+            },
+            {"role": "user", "content": prompt}
+        ]
+
     def analyze_cv(self, content: str, question: str) -> str:
         if not self._client:
-            return "CV analysis is not available. Please configure OpenAI API key."
+            return NOT_CONFIGURED_MESSAGE
             
         try:
-            prompt = f"""
-            You are a professional CV reviewer and career advisor. 
-            
-            CV Content:
-            {content}
-            
-            Question/Request: {question}
+            resp = _create_openai_response(
+                self._client,
+                'analysis',
+                model=self.model,
+                input=self._build_input(content, question),
+                temperature=0.7,
+                max_output_tokens=1500,
+            )
+            self._log_usage(getattr(resp, 'usage', None))
             
-            Please provide helpful, constructive feedback and suggestions. 
-            Be specific, actionable, and professional in your response.
-            Focus on practical improvements the candidate can make.
-            """
+            return getattr(resp, 'output_text', 'Analysis not available.')
             
-            resp = self._client.responses.create(
+        except CircuitOpenError:
+            logger.warning("OpenAI CV analysis skipped: circuit open")
+            return CIRCUIT_OPEN_MESSAGE
+        except SemaphoreTimeout as err:
+            logger.warning("OpenAI CV analysis skipped: %s", err)
+            return BUSY_MESSAGE
+        except Exception as err:
+            logger.exception("OpenAI CV analysis failed: %s", err)
+            return f"{ANALYSIS_FAILED_PREFIX} {err}"
+
+    def stream_analyze_cv(self, content: str, question: str) -> Iterator[str]:
+        if not self._client:
+            yield NOT_CONFIGURED_MESSAGE
+            return
+
+        produced = False
+        try:
+            # Streaming Responses API: text arrives as response.output_text.delta events.
+            # The concurrency slot stays held until the stream has been read
+            stream = _create_openai_response(
+                self._client,
+                'analysis-stream',
+                allow_hedge=False,
+                model=self.model,
+                input=self._build_input(content, question),
+                temperature=0.7,
+                max_output_tokens=1500,
+                stream=True,
+            )
+            with closing(stream):
+                for event in stream:
+                    event_type = getattr(event, 'type', None)
+                    if event_type == 'response.output_text.delta' and event.delta:
+                        produced = True
+                        yield event.delta
+                    elif event_type == 'response.completed':
+                        self._log_usage(getattr(event.response, 'usage', None))
+        except CircuitOpenError:
+            logger.warning("OpenAI CV analysis stream skipped: circuit open")
+            yield CIRCUIT_OPEN_MESSAGE
+        except SemaphoreTimeout as err:
+            logger.warning("OpenAI CV analysis stream skipped: %s", err)
+            yield BUSY_MESSAGE
+        except Exception as err:
+            logger.exception("OpenAI CV analysis stream failed: %s", err)
+            if produced:
+                # Part of the answer is already out; ending quietly would pass it off as complete
+                raise
+            yield f"{ANALYSIS_FAILED_PREFIX} {err}"
+
+    def analyze_cv_questions(self, content: str, questions: Sequence[str]) -> List[str]:
+        if not self._client:
+            return [NOT_CONFIGURED_MESSAGE] * len(questions)
+
+        numbered = "\n".join(f"{index}. {question}" for index, question in enumerate(questions))
+        prompt = (
+            f"CV Content:\n{content}\n\n"
+            f"Answer each of these questions about the CV separately:\n{numbered}\n\n"
+            "For every question give specific, actionable and professional feedback. "
+            "Return one answer per question index."
+        )
+        try:
+            resp = _create_openai_response(
+                self._client,
+                'analysis',
                 model=self.model,
                 input=[
                     {
@@ -251,42 +793,112 @@ class OpenAICVAnalysisProvider:
                     },
                     {"role": "user", "content": prompt}
                 ],
+                text={"format": {"type": "json_schema", "name": "cv_answers", "schema": MULTI_ANSWER_SCHEMA, "strict": True}},
                 temperature=0.7,
-                max_output_tokens=1500,
+                max_output_tokens=min(1500 * len(questions), 6000),
             )
-            
-            return getattr(resp, 'output_text', 'Analysis not available.')
-            
+            self._log_usage(getattr(resp, 'usage', None))
+            answers = {item['index']: item['answer'] for item in json.loads(resp.output_text)['answers']}
+        except CircuitOpenError:
+            logger.warning("OpenAI CV analysis skipped: circuit open")
+            return [CIRCUIT_OPEN_MESSAGE] * len(questions)
+        except SemaphoreTimeout as err:
+            logger.warning("OpenAI CV analysis skipped: %s", err)
+            return [BUSY_MESSAGE] * len(questions)
         except Exception as err:
-            logger.exception("OpenAI CV analysis failed: %s", err)
-            return f"Analysis failed: {str(err)}"
+            logger.exception("OpenAI multi-question CV analysis failed: %s", err)
+            return [f"{ANALYSIS_FAILED_PREFIX} {err}"] * len(questions)
+
+        # An answer the model skipped is asked again on its own
+        return [
+            answers.get(index) or self.analyze_cv(content, question)
+            for index, question in enumerate(questions)
+        ]
+
+    def _log_usage(self, usage) -> None:
+        if usage is None:
+            return
+        logger.info(
+            "CV Analysis - tokens in: %s, tokens out: %s (model %s)",
+            getattr(usage, 'input_tokens', None), getattr(usage, 'output_tokens', None), self.model,
+        )
 
 
 class CVAnalysisService:
     """Service for analyzing CV content using OpenAI."""
     
-    def __init__(self, provider: Optional[CVAnalysisProvider] = None) -> None:
+    def __init__(self, provider: Optional[CVAnalysisProvider] = None, prompt_builder: Optional[CVPromptBuilder] = None) -> None:
         self.provider = provider or OpenAICVAnalysisProvider()
+        self.prompt_builder = prompt_builder or CVPromptBuilder(
+            total_budget=getattr(settings, 'OPENAI_PROMPT_TOKEN_BUDGET', 1500),
+            model=getattr(self.provider, 'model', None),
+        )
 
     def analyze_cv(self, cv: CV, question: str) -> Tuple[str, bool]:
-        """Analyze CV content and answer a specific question."""
+        """
+        Analyze CV content and answer a specific question.
+
+        Returns:
+            Tuple of (answer, enabled flag); the flag is False when the provider could not
+            answer and the text is an error message rather than an analysis
+        """
         try:
-            # Get CV content as text
-            content = f"""
-            Name: {cv.firstname} {cv.lastname}
-            Bio: {cv.bio or 'Not provided'}
-            Skills: {cv.skills or 'Not provided'}
-            Projects: {cv.projects or 'Not provided'}
-            Contacts: {cv.contacts or 'Not provided'}
-            """
+            # Get CV content as compact, token-budgeted text
+            content = self._build_content(cv, question)
             
             # Analyze using provider
             analysis = self.provider.analyze_cv(content, question)
-            is_enabled = self.provider.is_enabled()
+            is_enabled = self.provider.is_enabled() and not is_failed_analysis(analysis)
             
             logger.info(f"Successfully analyzed CV {cv.id}")
             return analysis, is_enabled
             
         except Exception as e:
             logger.error(f"CV analysis failed for CV {cv.id}: {e}")
-            return f"Analysis failed: {str(e)}", False
+            return f"{ANALYSIS_FAILED_PREFIX} {e}", False
+
+    def stream_analysis(self, cv: CV, question: str) -> Iterator[str]:
+        """Analyze CV content, yielding the answer in chunks as the provider produces them."""
+        content = self._build_content(cv, question)
+        stream = getattr(self.provider, 'stream_analyze_cv', None)
+        if stream is None:
+            # Providers without streaming support deliver the whole answer as one chunk
+            yield self.provider.analyze_cv(content, question)
+            return
+        yield from stream(content, question)
+
+    def analyze_cv_questions(self, cv: CV, questions: Sequence[str]) -> Tuple[Dict[str, str], bool]:
+        """
+        Answer several questions about a CV with the CV text sent once.
+
+        Returns:
+            Tuple of ({question: answer}, enabled flag)
+        """
+        questions = list(dict.fromkeys(q.strip() for q in questions if q.strip()))
+        try:
+            # Relevance for prompt trimming is judged against all questions together
+            content = self._build_content(cv, " ".join(questions))
+            multi = getattr(self.provider, 'analyze_cv_questions', None)
+            if multi is not None:
+                answers = multi(content, questions)
+            else:
+                answers = [self.provider.analyze_cv(content, question) for question in questions]
+            logger.info(f"Answered {len(questions)} questions about CV {cv.id} in one request")
+            return dict(zip(questions, answers)), self.provider.is_enabled()
+        except Exception as e:
+            logger.error(f"Multi-question analysis failed for CV {cv.id}: {e}")
+            return {question: f"{ANALYSIS_FAILED_PREFIX} {e}" for question in questions}, False
+
+    def _build_content(self, cv: CV, question: str) -> str:
+        prompt = self.prompt_builder.build({
+            'name': f"{cv.firstname} {cv.lastname}",
+            'bio': cv.bio,
+            'skills': cv.skills,
+            'projects': cv.projects,
+            'contacts': cv.contacts,
+        }, question)
+        logger.info(
+            f"CV {cv.id} prompt: ~{prompt.tokens} tokens"
+            + (f", trimmed {', '.join(prompt.truncated_fields)}" if prompt.truncated_fields else "")
+        )
+        return prompt.content
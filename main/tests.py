@@ -1,9 +1,68 @@
 """
 Main tests module - imports all test modules for easy discovery.
 """
-from django.test import TestCase
+import csv
+import gc
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from .models import CV
+from django.utils import timezone
+from .models import AnalysisResult, BulkAnalysisJob, CV, RequestLog, TranslationResult, question_hash
+from .common.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, call_with_resilience, track_stream
+from .common.chunking import join_chunks, split_into_chunks
+from .common.fake_providers import FakeProviderServer, LatencyModel
+from .common.export import export_cvs
+from .common.keyset import InvalidCursor, paginate_keyset
+from .common.language import detect_language, mask_untranslatable
+from .common.previews import bio_preview, skills_preview
+from .common.query_cache import deferred_bumps, get_generation, get_query_cache
+from .common.routing import ProviderRouter
+from .common.search import ensure_search_triggers, search_terms
+from .common.semaphore import ProviderSemaphore, RedisSemaphore, SemaphoreTimeout
+from .common.skills import extract_skills
+from .common.trigram import TrigramIndex
+from .common.prompts import CVPromptBuilder, compact_whitespace
+from .common.time import filter_queryset_by_time
+from .common.tokens import _get_encoding, count_tokens
+from .api.renderers import FastJSONRenderer
+from .api.serializers import CVListSerializer, RequestLogSerializer
+from .filters.cv_filters import filter_cvs_by_skills, search_cvs, search_cvs_by_name
+from .web.views import CVDetailView
+from .services import (
+    CIRCUIT_OPEN_MESSAGE, CV_CACHE_NAMESPACE, CVAnalysisService, CVBulkService, CVRepository, CVService, OpenAICVAnalysisProvider,
+    OpenAITranslationProvider, TranslationService, _create_openai_response, openai_semaphore,
+)
+from celery_tasks.services.analysis_service import AnalysisService
+from celery_tasks.services.bulk_analysis_service import BulkAnalysisService
+from celery_tasks.services.sendgrid_service import SendGridService
+from celery_tasks.services.translation_service import TranslationService as RoutedTranslationService
+from celery_tasks.services.stream_service import (
+    CHUNK_EVENT,
+    DONE_EVENT,
+    FAILED_EVENT,
+    InMemoryStreamBroker,
+    analysis_channel,
+    bulk_analysis_channel,
+    get_stream_broker,
+)
+from celery_tasks.tasks.analysis import _claim_batch, analyze_cv_task, run_bulk_analysis_task
 
 
 class BasicCVTests(TestCase):
@@ -36,3 +95,1184 @@ class BasicCVTests(TestCase):
         response = self.client.get(reverse("home"))
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "CV Project")
+
+
+@override_settings(ANALYSIS_STREAM_BACKEND='memory')
+class AnalysisStreamTests(TestCase):
+    """Streaming of analysis chunks through the broker and the SSE endpoint."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="reviewer", password="secret")
+        cls.cv = CV.objects.create(firstname="Ada", lastname="Lovelace", owner=cls.user)
+
+    def test_subscriber_receives_events_published_before_it_connected(self):
+        broker = InMemoryStreamBroker()
+        broker.publish("channel", CHUNK_EVENT, "Hello ")
+        broker.publish("channel", CHUNK_EVENT, "world")
+        broker.publish("channel", DONE_EVENT)
+        events = list(broker.subscribe("channel", timeout=1))
+        self.assertEqual([e.data for e in events], ["Hello ", "world", ""])
+        self.assertEqual(events[-1].event, DONE_EVENT)
+
+    def test_stream_view_relays_session_task_events(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session['analysis_task_id'] = 'task-123'
+        session['analysis_cv_id'] = self.cv.pk
+        session.save()
+        broker = get_stream_broker()
+        broker.publish(analysis_channel('task-123'), CHUNK_EVENT, "Strong profile")
+        broker.publish(analysis_channel('task-123'), DONE_EVENT)
+
+        response = self.client.get(reverse("cv_analysis_stream", args=[self.cv.pk]))
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn('event: chunk\ndata: "Strong profile"', body)
+        self.assertIn("event: done", body)
+
+    def test_stream_view_ignores_analysis_of_another_cv(self):
+        other = CV.objects.create(firstname="Alan", lastname="Turing", owner=self.user)
+        self.client.force_login(self.user)
+        session = self.client.session
+        session['analysis_task_id'] = 'task-456'
+        session['analysis_cv_id'] = self.cv.pk
+        session.save()
+        get_stream_broker().publish(analysis_channel('task-456'), CHUNK_EVENT, "About Ada")
+
+        response = self.client.get(reverse("cv_analysis_stream", args=[other.pk]))
+        self.assertEqual(response.status_code, 204)
+
+    def test_stream_cut_off_mid_answer_fails_instead_of_completing(self):
+        def events(*args, **kwargs):
+            yield SimpleNamespace(type="response.output_text.delta", delta="Strong ")
+            raise ConnectionError("stream reset")
+
+        provider = OpenAICVAnalysisProvider(api_key="sk-test")
+        provider._client = object()
+        with mock.patch("main.services._create_openai_response", side_effect=events):
+            with self.assertRaises(ConnectionError):
+                list(provider.stream_analyze_cv("CV", "Strengths?"))
+            with mock.patch("celery_tasks.tasks.analysis.CVAnalysisService", return_value=CVAnalysisService(provider)), \
+                    mock.patch.object(analyze_cv_task, "update_state"):
+                result = analyze_cv_task.apply(args=(self.cv.pk, "Strengths?", True), task_id="task-cut").get()
+
+        published = list(get_stream_broker().subscribe(analysis_channel("task-cut"), timeout=1))
+        self.assertEqual([e.event for e in published], [CHUNK_EVENT, FAILED_EVENT])
+        self.assertFalse(result["is_enabled"])
+        record = AnalysisService()._store_answer(self.cv.pk, "Strengths?", result["analysis"], result["is_enabled"])
+        self.assertFalse(record.is_enabled)
+
+
+class PromptBudgetTests(TestCase):
+    """Token budgeting of CV prompts."""
+
+    def test_whitespace_is_compacted(self):
+        self.assertEqual(compact_whitespace("    Skills:   Python\n\n\n\n    Django   "), "Skills: Python\n\nDjango")
+
+    def test_long_fields_are_cut_to_budget_keeping_relevant_sentences(self):
+        projects = " ".join(f"Built internal tool number {i} for reporting." for i in range(400))
+        projects += " Ran Kubernetes clusters in production."
+        prompt = CVPromptBuilder(total_budget=500).build(
+            {"name": "Ada Lovelace", "projects": projects, "skills": "Python"},
+            question="Does the candidate have Kubernetes production experience?",
+        )
+        self.assertLessEqual(prompt.tokens, 500)
+        self.assertLessEqual(count_tokens(prompt.content), 500)
+        self.assertIn("projects", prompt.truncated_fields)
+        self.assertIn("Kubernetes", prompt.content)
+        self.assertIn("Name: Ada Lovelace", prompt.content)
+
+    def test_contacts_are_kept_while_long_fields_are_trimmed(self):
+        prompt = CVPromptBuilder(total_budget=120).build({
+            "name": "Ada Lovelace",
+            "contacts": "ada@example.com, +44 20 7946 0000",
+            "bio": " ".join(f"Wrote analytical note {i}." for i in range(100)),
+        })
+        self.assertLessEqual(prompt.tokens, 120)
+        self.assertIn("Contacts: ada@example.com, +44 20 7946 0000", prompt.content)
+        self.assertNotIn("contacts", prompt.truncated_fields)
+
+    def test_token_counts_are_estimated_when_the_encoding_cannot_load(self):
+        offline = SimpleNamespace(
+            encoding_for_model=mock.Mock(side_effect=KeyError("unknown-model")),
+            get_encoding=mock.Mock(side_effect=OSError("BPE download failed")),
+        )
+        _get_encoding.cache_clear()
+        self.addCleanup(_get_encoding.cache_clear)
+        with mock.patch.dict(sys.modules, {"tiktoken": offline}):
+            self.assertEqual(count_tokens("Senior Python developer, 10 years.", "unknown-model"), 9)
+        offline.get_encoding.assert_called_once_with("o200k_base")
+
+
+class ProviderResilienceTests(TestCase):
+    """Deadlines, circuit breaking and hedging of provider calls."""
+
+    def test_circuit_opens_after_consecutive_timeouts_and_fails_fast(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        latency = LatencyTracker()
+        for _ in range(2):
+            with self.assertRaises(TimeoutError):
+                call_with_resilience(lambda: time.sleep(0.2), breaker, latency, deadline=0.05)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            call_with_resilience(lambda: "never called", breaker, latency, deadline=1)
+
+    def test_hedged_call_returns_the_faster_attempt(self):
+        breaker = CircuitBreaker("test-hedge")
+        latency = LatencyTracker()
+        for _ in range(20):
+            latency.record(0.01)
+        delays = iter([0.5, 0.0])
+
+        def call():
+            time.sleep(next(delays))
+            return "ok"
+
+        started = time.monotonic()
+        result = call_with_resilience(call, breaker, latency, deadline=2, hedge=True)
+        self.assertEqual(result, "ok")
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    def test_stream_errors_while_reading_count_as_failures(self):
+        breaker = CircuitBreaker("test-stream", failure_threshold=1, reset_timeout=60)
+
+        def broken_stream():
+            yield "partial"
+            raise ConnectionError("stream reset")
+
+        stream = call_with_resilience(broken_stream, breaker, LatencyTracker(), deadline=1, defer_success=True)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        with self.assertRaises(ConnectionError):
+            list(track_stream(stream, breaker))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    @override_settings(OPENAI_CONCURRENCY_BACKEND="local", OPENAI_CONCURRENCY_LIMIT=1)
+    def test_stream_dropped_unread_resolves_the_trial_and_frees_its_slot(self):
+        breaker = CircuitBreaker("test-dropped", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())  # the half-open trial
+        stream = track_stream(iter(["delta"]), breaker)
+        del stream
+        gc.collect()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+        client = SimpleNamespace(responses=SimpleNamespace(create=lambda **kwargs: iter(["delta"])))
+        with _create_openai_response(client, "test", allow_hedge=False, model="m", input="hi", stream=True):
+            self.assertEqual(openai_semaphore().stats()["in_use"], 1)
+        self.assertEqual(openai_semaphore().stats()["in_use"], 0)
+        abandoned = _create_openai_response(client, "test", allow_hedge=False, model="m", input="hi", stream=True)
+        self.assertEqual(openai_semaphore().stats()["in_use"], 1)
+        del abandoned
+        gc.collect()
+        self.assertEqual(openai_semaphore().stats()["in_use"], 0)
+
+
+class ResultStorageTests(TestCase):
+    """Analysis and translation results live in the database, not in the session."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="hr", password="secret")
+        cls.cv = CV.objects.create(firstname="Grace", lastname="Hopper", bio="Compilers", owner=cls.user)
+
+    def test_translation_result_is_stored_and_session_keeps_pointer(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("cv_detail", args=[self.cv.pk]), {"lang": "Spanish"})
+        self.assertEqual(response.status_code, 200)
+        result = TranslationResult.objects.get(user=self.user, cv=self.cv, language="Spanish")
+        self.assertEqual(result.translations["bio"], "Compilers")
+        self.assertNotIn("cv_translations", self.client.session)
+        self.assertContains(response, "Translated to: <strong>Spanish</strong>", html=False)
+
+    def test_completed_analysis_is_stored_once_per_question(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        service = AnalysisService()
+        for answer in ("First answer", "Second answer"):
+            session["analysis_question"] = "How to improve?"
+            service._store_completed_analysis(
+                session, {"cv_id": self.cv.pk, "analysis": answer, "is_enabled": True}, self.user
+            )
+        self.assertEqual(AnalysisResult.objects.filter(cv=self.cv, user=self.user).count(), 1)
+        self.assertNotIn("analysis_complete", session)
+        context = service.get_analysis_context(session, self.user)
+        self.assertEqual(context["analysis_complete"].analysis, "Second answer")
+
+    def test_completed_analysis_is_only_shown_for_its_cv(self):
+        other = CV.objects.create(firstname="Alan", lastname="Turing", owner=self.user)
+        session = self.client.session
+        service = AnalysisService()
+        session["analysis_question"] = "How to improve?"
+        service._store_completed_analysis(session, {"cv_id": self.cv.pk, "analysis": "About Grace", "is_enabled": True}, self.user)
+        self.assertIsNone(service.get_analysis_context(session, self.user, other.pk)["analysis_complete"])
+        self.assertEqual(service.get_analysis_context(session, self.user, self.cv.pk)["analysis_complete"].analysis, "About Grace")
+
+    def test_anonymous_results_are_unique_per_cv_and_question(self):
+        AnalysisResult.objects.create(cv=self.cv, question="Q", question_hash=question_hash("Q"), analysis="A")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AnalysisResult.objects.create(cv=self.cv, question="Q", question_hash=question_hash("Q"), analysis="B")
+
+
+class BulkAnalysisTests(TestCase):
+    """Bulk jobs fan one question out over the CVs matching a filter."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="lead", password="secret")
+        cls.other = get_user_model().objects.create_user(username="other", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace", owner=cls.user)
+        CV.objects.create(firstname="Alan", lastname="Turing", owner=cls.user)
+
+    @mock.patch.object(BulkAnalysisService, "enqueue")
+    def test_job_has_one_item_per_matching_cv_and_is_queued_on_commit(self, enqueue):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = BulkAnalysisService().create_job(self.user, "Strongest skill?", query="Ada", concurrency=50)
+        self.assertEqual(list(job.items.values_list("cv__firstname", flat=True)), ["Ada"])
+        self.assertEqual(job.concurrency, 8)
+        enqueue.assert_called_once_with(job)
+
+    def test_job_is_visible_to_its_owner_only(self):
+        job = BulkAnalysisJob.objects.create(owner=self.user, question="Strongest skill?")
+        url = reverse("bulk_analysis_detail", args=[job.pk])
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(url), "Strongest skill?")
+
+
+@override_settings(ANALYSIS_STREAM_BACKEND='memory')
+class BulkAnalysisRunTests(TransactionTestCase):
+    """Provider failures leave bulk items failed, so resuming the job retries them."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="lead", password="secret")
+        self.job = BulkAnalysisJob.objects.create(owner=self.user, question="Strongest skill?")
+        cv = CV.objects.create(firstname="Ada", lastname="Lovelace", owner=self.user)
+        self.job.items.create(cv=cv)
+
+    @mock.patch.object(CVAnalysisService, "analyze_cv", return_value=(CIRCUIT_OPEN_MESSAGE, False))
+    def test_unavailable_provider_marks_items_failed_and_resume_starts_a_fresh_stream(self, _analyze):
+        result = run_bulk_analysis_task.apply(args=(self.job.pk,)).get()
+        self.assertEqual(result["failed"], 1)
+        item = self.job.items.get()
+        self.assertEqual((item.status, item.error), ("failed", CIRCUIT_OPEN_MESSAGE))
+
+        channel = bulk_analysis_channel(self.job.pk)
+        self.assertEqual([e.event for e in get_stream_broker().subscribe(channel, timeout=0.1)], ["row", "done"])
+        self.job.refresh_from_db()
+        with mock.patch.object(BulkAnalysisService, "enqueue") as enqueue:
+            self.assertTrue(BulkAnalysisService().resume_job(self.job))
+        enqueue.assert_called_once()
+        self.assertEqual(self.job.items.get().status, "pending")
+        self.assertEqual(list(get_stream_broker().subscribe(channel, timeout=0.1)), [])
+
+    def test_runs_claim_disjoint_items_and_resume_waits_for_a_live_run(self):
+        cv = CV.objects.create(firstname="Alan", lastname="Turing", owner=self.user)
+        self.job.items.create(cv=cv)
+        first = _claim_batch(self.job, "run-a", 1)
+        second = _claim_batch(self.job, "run-b", 10)
+        self.assertEqual((len(first), len(second)), (1, 1))
+        self.assertNotEqual(first, second)
+        self.assertEqual(_claim_batch(self.job, "run-c", 10), [])
+
+        service = BulkAnalysisService()
+        with mock.patch.object(BulkAnalysisService, "enqueue") as enqueue:
+            self.assertFalse(service.resume_job(self.job))
+            # The runs died: their claims and the job heartbeat go stale
+            stale = timezone.now() - timedelta(hours=1)
+            self.job.items.update(claimed_at=stale)
+            BulkAnalysisJob.objects.filter(pk=self.job.pk).update(status="running", updated_at=stale)
+            self.assertTrue(service.resume_job(self.job))
+            self.assertFalse(service.resume_job(self.job))
+        enqueue.assert_called_once()
+        self.assertEqual(set(self.job.items.values_list("status", "claimed_by")), {("pending", "")})
+
+
+@override_settings(ANALYSIS_COALESCE_BACKEND='cache')
+class AnalysisCoalescingTests(TestCase):
+    """Identical in-flight analysis requests share a single provider call."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.cv = CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Mathematics")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    @mock.patch.object(AnalysisService, "_is_failed", return_value=False)
+    @mock.patch.object(AnalysisService, "_get_task")
+    def test_duplicate_request_joins_in_flight_task(self, get_task, _is_failed):
+        service = AnalysisService()
+        first = service.start_analysis(self.cv.pk, "How to improve?", SessionStore())
+        second = service.start_analysis(self.cv.pk, "  how to IMPROVE? ", SessionStore())
+        self.assertEqual(first["task_id"], second["task_id"])
+        self.assertTrue(second["coalesced"])
+        get_task.return_value.apply_async.assert_called_once()
+
+    @mock.patch.object(AnalysisService, "_get_task")
+    def test_edited_cv_gets_its_own_task(self, get_task):
+        service = AnalysisService()
+        first = service.start_analysis(self.cv.pk, "How to improve?", SessionStore())
+        self.cv.skills = "Mathematics, Poetry"
+        self.cv.save()
+        second = service.start_analysis(self.cv.pk, "How to improve?", SessionStore())
+        self.assertNotEqual(first["task_id"], second["task_id"])
+        self.assertEqual(get_task.return_value.apply_async.call_count, 2)
+
+
+class ProviderSemaphoreTests(TestCase):
+    """Provider calls queue for a bounded number of slots."""
+
+    def test_caller_times_out_while_all_slots_are_held_and_wait_is_recorded(self):
+        semaphore = ProviderSemaphore("test-provider", limit=1, backend="local")
+        with semaphore.slot(timeout=1):
+            with self.assertRaises(SemaphoreTimeout):
+                with semaphore.slot(timeout=0.05):
+                    pass
+        with semaphore.slot(timeout=1):
+            pass
+        stats = semaphore.stats()
+        self.assertEqual((stats["acquired"], stats["timeouts"], stats["in_use"]), (2, 1, 0))
+        self.assertIsNotNone(stats["wait_p95"])
+
+    @override_settings(OPENAI_CONCURRENCY_BACKEND="local", OPENAI_CONCURRENCY_LIMIT=1, OPENAI_TIMEOUT_SECONDS=0.05)
+    def test_abandoned_and_streaming_calls_keep_their_slot_until_they_end(self):
+        def create(timeout=None, **kwargs):
+            if kwargs.get("stream"):
+                return iter(["delta"])
+            time.sleep(0.3)
+            return SimpleNamespace(output_text="late")
+
+        client = SimpleNamespace(responses=SimpleNamespace(create=create))
+        with self.assertRaises(TimeoutError):
+            _create_openai_response(client, "test", model="m", input="hi")
+        # The deadline gave up, but the request is still running and still counts
+        self.assertEqual(openai_semaphore().stats()["in_use"], 1)
+        time.sleep(0.4)
+        self.assertEqual(openai_semaphore().stats()["in_use"], 0)
+
+        stream = _create_openai_response(client, "test", allow_hedge=False, model="m", input="hi", stream=True)
+        self.assertEqual(openai_semaphore().stats()["in_use"], 1)
+        self.assertEqual(list(stream), ["delta"])
+        self.assertEqual(openai_semaphore().stats()["in_use"], 0)
+
+    def test_redis_slots_in_use_are_counted_on_the_redis_clock(self):
+        semaphore = RedisSemaphore("test-clock", limit=2, url="redis://localhost:6379/0")
+        semaphore._redis = mock.Mock()
+        semaphore._redis.time.return_value = (1000, 500000)
+        semaphore._redis.zcount.return_value = 1
+        self.assertEqual(semaphore.in_use(), 1)
+        semaphore._redis.zcount.assert_called_once_with(semaphore.key, 1000.5, "+inf")
+
+
+class ProviderRoutingTests(TestCase):
+    """Providers are tried in order of observed latency and health."""
+
+    def test_router_prefers_the_fastest_healthy_provider(self):
+        router = ProviderRouter("test", ["slow", "broken", "fast"], explore_rate=0)
+        providers = {
+            "slow": lambda text: time.sleep(0.03) or text.upper(),
+            "broken": lambda text: None,
+            "fast": lambda text: text.upper(),
+        }
+        served = [router.call(providers, "hola")[0] for _ in range(5)]
+        self.assertEqual(served[-1], "fast")
+        self.assertEqual(router.order(), ["fast", "slow", "broken"])
+        self.assertEqual(router.snapshot()["broken"]["error_rate"], 1.0)
+
+    @override_settings(OPENAI_CONCURRENCY_BACKEND="local")
+    def test_openai_errors_reach_the_router_and_stubs_are_off_by_default(self):
+        def create(**kwargs):
+            raise ConnectionError("upstream reset")
+
+        service = RoutedTranslationService()
+        self.assertEqual(list(service._translation_providers), ["openai"])
+        cv = CV(firstname="Ana", lastname="Ruiz", bio="Led the data team.")
+        with mock.patch("main.services._build_openai_client") as build:
+            build.return_value = SimpleNamespace(responses=SimpleNamespace(create=create))
+            with self.settings(OPENAI_API_KEY="sk-test"):
+                self.assertEqual(service.translate_cv(cv, "Spanish"), ({}, False))
+        self.assertGreater(service.router.snapshot()["openai"]["error_rate"], 0)
+
+    def test_race_returns_first_result(self):
+        router = ProviderRouter("test-race", ["slow", "fast"], explore_rate=0, race=2)
+        providers = {"slow": lambda: time.sleep(0.2) or "slow", "fast": lambda: "fast"}
+        self.assertEqual(router.call(providers), ("fast", "fast"))
+
+
+@override_settings(TRANSLATION_CHUNK_TOKENS=40, OPENAI_CONCURRENCY_BACKEND='local')
+class ChunkedTranslationTests(TestCase):
+    """Long fields are translated in chunks and reassembled in order."""
+
+    def test_chunks_respect_budget_and_rejoin_to_the_source(self):
+        text = "\n\n".join(f"Paragraph {i}. Built services with Django and Redis at Acme." for i in range(12))
+        chunks = split_into_chunks(text, 40)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(count_tokens(chunk.text) <= 40 for chunk in chunks))
+        self.assertEqual(join_chunks([chunk.text for chunk in chunks], chunks), text)
+
+    def test_long_field_is_translated_fully_with_a_shared_glossary(self):
+        prompts = []
+
+        def create(**kwargs):
+            prompt = kwargs["input"][1]["content"]
+            prompts.append(prompt)
+            return SimpleNamespace(output_text=prompt.split("\n\n", 1)[1].upper())
+
+        provider = OpenAITranslationProvider(api_key="sk-test")
+        provider._client = SimpleNamespace(responses=SimpleNamespace(create=create))
+        text = " ".join(f"Sentence {i} mentions Kubernetes." for i in range(40))
+        self.assertEqual(provider.translate(text, "Spanish"), text.upper())
+        self.assertGreater(len(prompts), 1)
+        self.assertTrue(all("Kubernetes" in prompt.split("\n\n", 1)[0] for prompt in prompts))
+
+
+class TranslationPlanningTests(TestCase):
+    """Only text that needs translating reaches the provider."""
+
+    def test_contacts_and_identifiers_are_masked(self):
+        masked = mask_untranslatable("Mail ana@example.com or https://ana.dev, uses node.js", identifiers=True)
+        self.assertEqual(masked.values, ["https://ana.dev", "ana@example.com", "node.js"])
+        self.assertNotIn("@", masked.text)
+        self.assertEqual(masked.unmask(masked.text.replace("Mail", "Correo")),
+                         "Correo ana@example.com or https://ana.dev, uses node.js")
+
+    def test_year_ranges_are_not_masked_as_phone_numbers(self):
+        self.assertEqual(mask_untranslatable("Acme 2019 - 2023, Initech 2015-2019").values, [])
+        self.assertEqual(mask_untranslatable("Call (020) 7946 0000 or 600 123 456").values, ["(020) 7946 0000", "600 123 456"])
+
+    def test_language_is_detected_offline(self):
+        self.assertEqual(detect_language("Desarrolladora con experiencia en la nube y en el diseño de sistemas"), "es")
+        self.assertEqual(detect_language("I lead the platform team and own the build pipeline"), "en")
+        self.assertIsNone(detect_language("Python, Django"))
+
+    def test_only_lines_needing_translation_are_sent(self):
+        provider = mock.Mock()
+        provider.translate.side_effect = lambda text, lang: text.replace("Led", "Dirigí")
+        cv = CV(firstname="Ana", lastname="Ruiz", contacts="ana@example.com\n+34 600 123 456",
+                bio="Ya hablo español y trabajo en la nube.\nLed the data team.")
+        translations, _ = TranslationService(provider=provider).translate_cv(cv, "Spanish")
+        provider.translate.assert_called_once_with("Led the data team.", "Spanish")
+        self.assertEqual(translations["bio"], "Ya hablo español y trabajo en la nube.\nDirigí the data team.")
+        self.assertEqual(translations["contacts"], cv.contacts)
+        self.assertEqual(translations["name"], "Ana Ruiz")
+
+
+@override_settings(OPENAI_CONCURRENCY_BACKEND='local')
+class MultiQuestionAnalysisTests(TestCase):
+    """A checklist of questions costs one provider request and is cached per question."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="reviewer", password="secret")
+        cls.cv = CV.objects.create(firstname="Ada", lastname="Lovelace", bio="Analytical engines")
+
+    def test_questions_are_answered_in_one_structured_request(self):
+        requests = []
+
+        def create(**kwargs):
+            requests.append(kwargs)
+            answers = [{"index": 1, "answer": "Add metrics."}, {"index": 0, "answer": "Mathematics."}]
+            return SimpleNamespace(output_text=json.dumps({"answers": answers}), usage=None)
+
+        provider = OpenAICVAnalysisProvider(api_key="sk-test")
+        provider._client = SimpleNamespace(responses=SimpleNamespace(create=create))
+        answers, _ = CVAnalysisService(provider=provider).analyze_cv_questions(
+            self.cv, ["Strengths?", "Improvements?"]
+        )
+        self.assertEqual(answers, {"Strengths?": "Mathematics.", "Improvements?": "Add metrics."})
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0]["text"]["format"]["type"], "json_schema")
+
+    @mock.patch.object(AnalysisService, "_get_task")
+    def test_checklist_reuses_fresh_answers_and_sends_only_the_rest(self, get_task):
+        AnalysisResult.objects.create(cv=self.cv, question="Strengths?", question_hash=question_hash("Strengths?"),
+                                      analysis="Mathematics.")
+        get_task.return_value.delay.return_value.id = "checklist-task"
+        session = SessionStore()
+        service = AnalysisService()
+        result = service.start_checklist(self.cv.pk, ["Strengths?", "Improvements?"], session, self.user)
+        self.assertEqual(result["cached"], 1)
+        get_task.assert_called_once_with("analyze_cv_questions_task")
+        get_task.return_value.delay.assert_called_once_with(self.cv.pk, ["Improvements?"])
+        self.assertTrue(AnalysisResult.objects.filter(user=self.user, question="Strengths?").exists())
+
+    @mock.patch.object(AnalysisService, "_get_task")
+    def test_provider_errors_are_stored_disabled_and_never_reused(self, get_task):
+        service = AnalysisService()
+        service._store_answer(self.cv.pk, "Strengths?", CIRCUIT_OPEN_MESSAGE, True, self.user)
+        self.assertFalse(AnalysisResult.objects.get(question="Strengths?").is_enabled)
+
+        get_task.return_value.delay.return_value.id = "checklist-task"
+        other = get_user_model().objects.create_user(username="second-reviewer", password="secret")
+        result = service.start_checklist(self.cv.pk, ["Strengths?"], SessionStore(), other)
+        self.assertEqual(result["cached"], 0)
+        get_task.return_value.delay.assert_called_once_with(self.cv.pk, ["Strengths?"])
+
+
+class FakeProviderServerTests(TestCase):
+    """The real SDK code paths run against the local fake provider server."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.server = FakeProviderServer(latency=LatencyModel(p50=0.01, p99=0.05, seed=1))
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_analysis_plain_and_streamed_through_the_openai_sdk(self):
+        with self.settings(OPENAI_BASE_URL=f"{self.server.url}/v1", OPENAI_CONCURRENCY_BACKEND="local"):
+            provider = OpenAICVAnalysisProvider(api_key="sk-test")
+            answer = provider.analyze_cv("Name: Ada", "Strengths?")
+            streamed = "".join(provider.stream_analyze_cv("Name: Ada", "Strengths?"))
+        self.assertTrue(answer.startswith("Fake analysis:"))
+        self.assertEqual(streamed, answer)
+
+    def test_mail_send_is_accepted(self):
+        with self.settings(SENDGRID_API_HOST=self.server.url):
+            result = SendGridService(api_key="SG.test").send_email_with_attachment(
+                "ada@example.com", "CV", "Attached", pdf_content=b"%PDF", pdf_filename="cv.pdf"
+            )
+        self.assertEqual((result["status"], result["status_code"]), ("success", 202))
+        self.assertEqual(self.server.requests["/v3/mail/send"], 1)
+
+
+class FullTextSearchTests(TestCase):
+    """CV search runs on the full-text index over names, skills, bio and projects."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python, Django", bio="Analyst", projects="Engine")
+        CV.objects.create(firstname="Grace", lastname="Hopper", skills="COBOL", bio="Admiral who loved Python scripting <b>", projects="")
+        CV.objects.create(firstname="Alan", lastname="Turing", skills="Cryptography", bio="Codebreaker", projects="Bombe")
+
+    def test_matches_any_column_ranks_skills_above_bio_and_highlights(self):
+        results = list(search_cvs(CV.objects.all(), "pyth"))
+        self.assertEqual([cv.lastname for cv in results], ["Lovelace", "Hopper"])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+        self.assertIn("Python", results[1].search_snippet)
+
+    def test_index_follows_updates_and_deletes(self):
+        cv = CV.objects.get(lastname="Turing")
+        cv.skills = "Rust"
+        cv.save()
+        self.assertEqual(list(search_cvs(CV.objects.all(), "rust").values_list("lastname", flat=True)), ["Turing"])
+        self.assertFalse(search_cvs(CV.objects.all(), "cryptography").exists())
+        cv.delete()
+        self.assertFalse(search_cvs(CV.objects.all(), "rust").exists())
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(search_terms('python" OR *NEAR(-'), ["python", "or", "near"])
+        self.assertFalse(search_cvs(CV.objects.all(), 'python" OR *NEAR(-').exists())
+
+    def test_dropped_triggers_are_recreated(self):
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER main_cv_fts_ai")
+        self.assertTrue(ensure_search_triggers(connection))
+        CV.objects.create(firstname="Katherine", lastname="Johnson", skills="Orbital mechanics")
+        self.assertTrue(search_cvs(CV.objects.all(), "orbital").exists())
+
+    def test_list_page_and_api_return_ranked_highlighted_matches(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("cv_list"), {"q": "python"})
+        self.assertEqual([cv.lastname for cv in response.context["cvs"]], ["Lovelace", "Hopper"])
+        self.assertContains(response, "<mark>Python</mark> scripting &lt;b&gt;")
+
+        data = self.client.get("/api/cv/", {"q": "python"}).json()
+        rows = data["results"] if isinstance(data, dict) else data
+        self.assertEqual([row["lastname"] for row in rows], ["Lovelace", "Hopper"])
+        self.assertIn("<mark>Python</mark>", rows[1]["highlight"])
+
+
+class FuzzyNameSearchTests(TestCase):
+    """Name search tolerates typos and ranks by trigram similarity."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace")
+        CV.objects.create(firstname="Grace", lastname="Hopper")
+        CV.objects.create(firstname="Lovell", lastname="Adams")
+
+    def test_index_scores_share_of_query_trigrams(self):
+        index = TrigramIndex()
+        index.add(1, "Ada Lovelace")
+        index.add(2, "Grace Hopper")
+        [(pk, similarity)] = index.search("Lovelase")
+        self.assertEqual(pk, 1)
+        self.assertAlmostEqual(similarity, 6 / 9, places=3)
+        self.assertEqual(index.search("xyz"), [])
+
+    def test_misspelt_names_match_and_closest_ranks_first(self):
+        self.assertEqual(list(search_cvs_by_name(CV.objects.all(), "Lovelase").values_list("lastname", flat=True)), ["Lovelace"])
+        self.assertEqual(list(search_cvs_by_name(CV.objects.all(), "grase hoper").values_list("lastname", flat=True)), ["Hopper"])
+        self.assertFalse(search_cvs_by_name(CV.objects.all(), "Turing").exists())
+
+    def test_index_picks_up_edits(self):
+        self.assertFalse(search_cvs_by_name(CV.objects.all(), "Turing").exists())
+        CV.objects.filter(lastname="Hopper").update(lastname="Turing", updated_at=timezone.now())
+        self.assertEqual(search_cvs_by_name(CV.objects.all(), "Turring").count(), 1)
+        CV.objects.create(firstname="Alan", lastname="Turing")
+        self.assertEqual(search_cvs_by_name(CV.objects.all(), "Turring").count(), 2)
+
+    def test_list_page_name_mode(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("cv_list"), {"q": "lovelase", "mode": "name"})
+        self.assertEqual([cv.lastname for cv in response.context["cvs"]], ["Lovelace"])
+
+
+class KeysetPaginationTests(TestCase):
+    """CV lists page by cursor on the sort key with an id tiebreak, never by OFFSET."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        # Repeated first names force the id tiebreak
+        for index in range(7):
+            CV.objects.create(firstname=["Ada", "Alan", "Grace"][index % 3], lastname=f"Person{index}")
+
+    def _walk(self, queryset, size):
+        pages, cursor = [], None
+        while True:
+            page = paginate_keyset(queryset, size, cursor)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_forward_and_backward_walks_cover_every_row_once(self):
+        queryset = CV.objects.order_by("firstname")
+        pages = self._walk(queryset, 3)
+        forward = [cv.pk for page in pages for cv in page.items]
+        self.assertEqual(forward, list(queryset.order_by("firstname", "id").values_list("id", flat=True)))
+        self.assertFalse(pages[0].has_previous)
+
+        back = paginate_keyset(queryset, 3, pages[-1].previous_cursor)
+        self.assertEqual([cv.pk for cv in back.items], [cv.pk for cv in pages[-2].items])
+
+        newest_first = [cv.pk for page in self._walk(CV.objects.order_by("-created_at"), 2) for cv in page.items]
+        self.assertEqual(newest_first, list(CV.objects.order_by("-created_at", "-id").values_list("id", flat=True)))
+
+    def test_deep_pages_seek_instead_of_offset(self):
+        cursor = self._walk(CV.objects.order_by("lastname"), 2)[-2].next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            paginate_keyset(CV.objects.order_by("lastname"), 2, cursor)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("OFFSET", queries[0]["sql"].upper())
+        with self.assertRaises(InvalidCursor):
+            paginate_keyset(CV.objects.order_by("firstname"), 2, cursor)
+
+    def test_list_page_and_api_follow_cursor_links(self):
+        self.client.force_login(self.user)
+        url, seen = f"{reverse('cv_list')}?sort=firstname&order=asc", []
+        with self.settings(CV_LIST_PAGE_SIZE=3):
+            while url:
+                response = self.client.get(url if url.startswith("/") else reverse("cv_list") + url)
+                seen += [cv.pk for cv in response.context["cvs"]]
+                url = response.context["next_page_url"]
+        self.assertEqual(seen, list(CV.objects.order_by("firstname", "id").values_list("id", flat=True)))
+        self.assertIsNotNone(response.context["previous_page_url"])
+
+        data = self.client.get("/api/cv/", {"sort": "lastname", "order": "asc", "page_size": 3}).json()
+        names = [row["lastname"] for row in data["results"]]
+        while data["next"]:
+            data = self.client.get(data["next"]).json()
+            names += [row["lastname"] for row in data["results"]]
+        self.assertEqual(names, [f"Person{index}" for index in range(7)])
+        self.assertEqual(self.client.get("/api/cv/", {"cursor": "garbage"}).status_code, 404)
+
+
+class ListingPreviewTests(TestCase):
+    """CV cards are rendered from precomputed previews, not the full text fields."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        cls.cv = CV.objects.create(
+            firstname="Ada", lastname="Lovelace", owner=cls.user,
+            bio=" ".join(f"word{i}" for i in range(500)),
+            skills="Python, Django; SQL\n- Celery, python, Redis, Docker, Go, Rust, Kotlin, Swift",
+            projects="x" * 20000,
+        )
+
+    def test_previews_are_short_and_deduplicated(self):
+        self.assertEqual(bio_preview("one two three", words=2), "one two…")
+        self.assertEqual(bio_preview("short bio"), "short bio")
+        self.assertEqual(skills_preview("Python, Django; SQL\n- Celery, python", count=3), "Python, Django, SQL, …")
+        self.assertEqual(len(bio_preview("x" * 1000)), 300)
+
+    def test_previews_follow_saves(self):
+        self.assertTrue(self.cv.bio_preview.startswith("word0 word1"))
+        self.assertEqual(self.cv.skills_preview, "Python, Django, SQL, Celery, Redis, Docker, Go, Rust, …")
+        self.cv.skills = "Haskell"
+        self.cv.save(update_fields=["skills"])
+        self.cv.refresh_from_db()
+        self.assertEqual(self.cv.skills_preview, "Haskell")
+
+    def test_list_page_does_not_read_full_text_columns(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("cv_list"))
+        self.assertContains(response, "Python, Django, SQL")
+        self.assertContains(response, reverse("cv_update", args=[self.cv.pk]))
+        cv_queries = [q["sql"] for q in queries if '"main_cv"' in q["sql"]]
+        self.assertTrue(cv_queries)
+        for sql in cv_queries:
+            for column in ("bio", "skills", "projects", "contacts"):
+                self.assertNotIn(f'"main_cv"."{column}"', sql)
+
+
+@override_settings(CV_LIST_CACHE_ENABLED=True)
+class QueryCacheTests(TestCase):
+    """CV list pages are served from a cache invalidated by a generation counter."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python")
+        CV.objects.create(firstname="Grace", lastname="Hopper", skills="COBOL")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_repeat_views_hit_the_cache_until_a_cv_changes(self):
+        service, stats = CVService(), get_query_cache(CV_CACHE_NAMESPACE, 300)
+        before = stats.stats()
+        first = service.list_page("lastname", "asc", page_size=10)
+        with CaptureQueriesContext(connection) as queries:
+            second = service.list_page("lastname", "asc", page_size=10)
+        self.assertEqual([cv.pk for cv in first.items], [cv.pk for cv in second.items])
+        # Only the primary-key lookup for the cached ids runs
+        self.assertEqual(len(queries), 1)
+        self.assertIn("IN (", queries[0]["sql"])
+        after = stats.stats()
+        self.assertEqual((after["hits"] - before["hits"], after["misses"] - before["misses"]), (1, 1))
+
+        CV.objects.create(firstname="Alan", lastname="Turing")
+        self.assertEqual([cv.lastname for cv in service.list_page("lastname", "asc", page_size=10).items], ["Hopper", "Lovelace", "Turing"])
+        CV.objects.get(lastname="Hopper").delete()
+        self.assertEqual([cv.lastname for cv in service.list_page("lastname", "asc", page_size=10).items], ["Lovelace", "Turing"])
+
+    def test_concurrent_miss_waits_for_the_first_computation(self):
+        query_cache = get_query_cache("test-stampede", 60)
+        cache.add(f"{query_cache.key(['page'])}:lock", 1)
+        calls = []
+
+        def fill():
+            time.sleep(0.1)
+            cache.set(query_cache.key(["page"]), [1, 2])
+
+        threading.Thread(target=fill).start()
+        self.assertEqual(query_cache.get_or_compute(["page"], lambda: calls.append(1) or [9]), [1, 2])
+        self.assertEqual(calls, [])
+        self.assertEqual(query_cache.stats()["waits"], 1)
+
+    def test_cached_search_keeps_snippets(self):
+        self.client.force_login(self.user)
+        for _ in range(2):
+            response = self.client.get(reverse("cv_list"), {"q": "python"})
+            self.assertContains(response, "<mark>Python</mark>")
+
+
+class IndexUsageTests(TestCase):
+    """Every list sort, owner-scoped lookup and log time filter is served by an index (SQLite plans)."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="owner", password="secret")
+        for index in range(5):
+            CV.objects.create(firstname=f"First{index}", lastname=f"Last{index}", owner=cls.user)
+
+    def assertIndexed(self, plan: str, index: str) -> None:
+        self.assertIn(f"USING INDEX {index}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_list_sorts_and_keyset_pages_use_sort_indexes(self):
+        repository = CVRepository()
+        for sort_by in ("created_at", "updated_at", "firstname", "lastname"):
+            index = {"created_at": "cv_created_id_idx", "updated_at": "cv_updated_id_idx"}.get(sort_by, f"cv_{sort_by}_id_idx")
+            for order in ("asc", "desc"):
+                queryset = repository.get_all_lightweight_sorted(sort_by, order)
+                first = paginate_keyset(queryset, 2)
+                with CaptureQueriesContext(connection) as queries:
+                    paginate_keyset(queryset, 2, first.next_cursor)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+                    plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+                with self.subTest(sort_by=sort_by, order=order):
+                    self.assertIndexed(plan, index)
+                    self.assertIn("SEARCH", plan)
+        self.assertIndexed(CV.objects.all()[:10].explain(), "cv_name_idx")
+
+    def test_owner_scoped_and_log_time_filters_use_indexes(self):
+        self.assertIndexed(CV.objects.filter(owner=self.user).order_by("-created_at")[:10].explain(), "cv_owner_created_idx")
+        for since, preset, order in (("2024-01-01T00:00:00", None, "desc"), (None, "last_hour", "asc")):
+            queryset = filter_queryset_by_time(RequestLog.objects.all(), "timestamp", since, None, preset, order)
+            self.assertIndexed(queryset[:10].explain(), "requestlog_timestamp_idx")
+
+
+class SkillIndexTests(TestCase):
+    """Skills are normalized into a join table for AND filters and facet counts."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python, Django, PostgreSQL")
+        CV.objects.create(firstname="Grace", lastname="Hopper", skills="python (5 years); JS / React.js")
+        CV.objects.create(firstname="Alan", lastname="Turing", skills="Python\n- Django\n- k8s")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_extraction_normalizes_and_folds_aliases(self):
+        self.assertEqual(
+            extract_skills("Python (5 years), JS / ReactJS; C++, c#, k8s, Led a team of twelve engineers across teams"),
+            {"python": "Python", "javascript": "JS", "react": "ReactJS", "c++": "C++", "c#": "c#", "kubernetes": "k8s"},
+        )
+
+    def test_links_follow_skill_edits(self):
+        cv = CV.objects.get(lastname="Turing")
+        self.assertEqual(set(cv.skill_tags.values_list("name", flat=True)), {"python", "django", "kubernetes"})
+        cv.skills = "Python, Rust"
+        cv.save()
+        self.assertEqual(set(cv.skill_tags.values_list("name", flat=True)), {"python", "rust"})
+
+    def test_filter_requires_every_skill_and_facets_count_matches(self):
+        both = filter_cvs_by_skills(CV.objects.all(), ["python", "Django"])
+        self.assertEqual(set(both.values_list("lastname", flat=True)), {"Lovelace", "Turing"})
+        self.assertEqual(list(filter_cvs_by_skills(CV.objects.all(), ["javascript"]).values_list("lastname", flat=True)), ["Hopper"])
+
+        with CaptureQueriesContext(connection) as queries:
+            facets = CVService().skill_facets(skills=["python"])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(facets[0], {"name": "python", "label": "Python", "count": 3})
+        self.assertEqual({f["name"]: f["count"] for f in facets}["django"], 2)
+
+    def test_list_page_and_api_filter_by_skill(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("cv_list"), {"skill": ["python", "django"], "sort": "lastname", "order": "asc"})
+        self.assertEqual([cv.lastname for cv in response.context["cvs"]], ["Lovelace", "Turing"])
+        self.assertEqual([f["name"] for f in response.context["selected_skills"]], ["python", "django"])
+        self.assertIn("kubernetes", [f["name"] for f in response.context["skill_facets"]])
+
+        data = self.client.get("/api/cv/", {"skill": "js"}).json()
+        self.assertEqual([row["lastname"] for row in data["results"]], ["Hopper"])
+        facets = self.client.get("/api/cv/facets/", {"q": "django"}).json()["skills"]
+        self.assertEqual({f["name"]: f["count"] for f in facets}["python"], 2)
+
+
+class SparseFieldsetTests(TestCase):
+    """The CV list returns a compact index by default and loads only the columns it shows."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python", bio="Analyst " * 200, projects="Engine " * 200)
+
+    def _cv_selects(self, queries) -> list:
+        return [q["sql"] for q in queries.captured_queries if 'FROM "main_cv"' in q["sql"] and "main_cv_fts" not in q["sql"]]
+
+    def test_default_list_is_compact_and_skips_text_columns(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get("/api/cv/").json()
+        self.assertEqual(set(data["results"][0]), {"id", "firstname", "lastname"})
+        for sql in self._cv_selects(queries):
+            self.assertNotIn('"bio"', sql)
+            self.assertNotIn('"projects"', sql)
+
+    def test_fields_param_selects_output_and_projection(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get("/api/cv/", {"fields": "lastname,skills_preview"}).json()
+        self.assertEqual(data["results"][0], {"id": data["results"][0]["id"], "lastname": "Lovelace", "skills_preview": "Python"})
+        for sql in self._cv_selects(queries):
+            self.assertNotIn('"firstname"', sql)
+            self.assertNotIn('"bio"', sql)
+
+        search = self.client.get("/api/cv/", {"q": "python", "fields": "bio"}).json()["results"][0]
+        self.assertEqual(set(search), {"id", "bio"})
+        self.assertEqual(self.client.get("/api/cv/", {"fields": "password"}).status_code, 400)
+        self.assertIn("bio", self.client.get(f"/api/cv/{search['id']}/").json())
+
+
+class FastListTests(TestCase):
+    """List endpoints build rows from .values() and must match the serializers exactly."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python", bio="Analyst")
+        CV.objects.create(firstname="Grace", lastname="Hopper", skills="COBOL", bio="Admiral")
+        for i in range(8):
+            RequestLog.objects.create(method="GET", path=f"/cv/{i}/", user=cls.user if i % 2 else None)
+
+    def test_cv_rows_match_the_serializer(self):
+        self.client.force_login(self.user)
+        fields = "id,firstname,lastname,bio,skills_preview,created_at,updated_at"
+        rows = self.client.get("/api/cv/", {"fields": fields, "sort": "lastname", "order": "asc"}).json()["results"]
+        expected = CVListSerializer(CV.objects.order_by("lastname"), many=True, context={"fields": fields.split(",")}).data
+        self.assertEqual(rows, json.loads(FastJSONRenderer().render(expected)))
+
+    def test_log_rows_join_username_in_one_query(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get("/api/logs/").json()["results"]
+        log_queries = [q["sql"] for q in queries.captured_queries if 'FROM "main_requestlog"' in q["sql"]]
+        self.assertEqual(len(log_queries), 2)  # page count and page rows
+        expected = RequestLogSerializer(RequestLog.objects.filter(id__in=[row["id"] for row in rows]), many=True).data
+        self.assertEqual(rows, json.loads(FastJSONRenderer().render(expected)))
+        self.assertIn("recruiter", [row["username"] for row in rows])
+
+    def test_renderer_falls_back_without_orjson(self):
+        data = {"name": "Ada", "when": timezone.now()}
+        with mock.patch("main.api.renderers._get_orjson", return_value=None):
+            fallback = FastJSONRenderer().render(data)
+        self.assertEqual(json.loads(fallback)["name"], "Ada")
+        self.assertEqual(json.loads(FastJSONRenderer().render({"name": "Ada"})), {"name": "Ada"})
+
+
+class ConditionalGetTests(TestCase):
+    """Unchanged CV pages and API responses are answered with 304 before any rendering."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        cls.cv = CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python", bio="Analyst")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _revalidate(self, url, params=None):
+        first = self.client.get(url, params or {})
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("no-cache", first["Cache-Control"])
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get(url, params or {}, HTTP_IF_NONE_MATCH=first["ETag"])
+        return first, again, queries
+
+    def test_detail_page_and_api_object(self):
+        for url in (reverse("cv_detail", args=[self.cv.pk]), f"/api/cv/{self.cv.pk}/"):
+            first, again, queries = self._revalidate(url)
+            self.assertEqual(again.status_code, 304)
+            self.assertEqual(again["ETag"], first["ETag"])
+            self.assertFalse([q for q in queries.captured_queries if '"bio"' in q["sql"]])
+            since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+            self.assertEqual(since.status_code, 304)
+
+        self.cv.bio = "Mathematician"
+        self.cv.save()
+        self.assertEqual(self.client.get(f"/api/cv/{self.cv.pk}/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+    def test_list_page_and_api_list_change_with_any_write(self):
+        for url, params in ((reverse("cv_list"), {"q": "python"}), ("/api/cv/", {"fields": "bio"})):
+            first, again, queries = self._revalidate(url, params)
+            self.assertEqual(again.status_code, 304)
+            self.assertEqual(len([q for q in queries.captured_queries if '"main_' in q["sql"]]), 1)
+        CV.objects.create(firstname="Grace", lastname="Hopper", skills="Python")
+        self.assertEqual(self.client.get("/api/cv/", {"fields": "bio"}, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+    def test_pages_with_session_state_are_rendered_in_full(self):
+        session = self.client.session
+        session["pdf_task_id"] = "task-1"
+        session.save()
+        with mock.patch.object(CVDetailView, "_get_pdf_progress_context", return_value={}):
+            response = self.client.get(reverse("cv_detail", args=[self.cv.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_completed_analysis_is_part_of_the_detail_etag(self):
+        other = CV.objects.create(firstname="Alan", lastname="Turing")
+        url, other_url = reverse("cv_detail", args=[self.cv.pk]), reverse("cv_detail", args=[other.pk])
+        before = self.client.get(other_url)["ETag"]
+        record = AnalysisResult.objects.create(user=self.user, cv=self.cv, question="Strengths?", analysis="Rigour")
+        session = self.client.session
+        session["analysis_result_id"] = record.pk
+        session.save()
+
+        first, again, _ = self._revalidate(url)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(self.client.get(other_url, HTTP_IF_NONE_MATCH=before).status_code, 304)
+        record.analysis = "Rigour and vision"
+        record.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+
+class BulkCVTests(TestCase):
+    """Bulk endpoints write many CVs per request and keep the side effects of single saves."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="hr-sync", password="secret")
+        cls.other = User.objects.create_user(username="someone", password="secret")
+        cls.own = CV.objects.create(firstname="Ada", lastname="Lovelace", skills="Python", owner=cls.user)
+        cls.foreign = CV.objects.create(firstname="Grace", lastname="Hopper", skills="COBOL", owner=cls.other)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def _send(self, method, items):
+        return getattr(self.client, method)("/api/cv/bulk/", json.dumps(items), content_type="application/json")
+
+    def test_create_validates_each_item_and_writes_in_few_queries(self):
+        items = [
+            {"firstname": f"First{i}", "lastname": f"Last{i}", "skills": "Python, k8s", "bio": "Engineer"}
+            for i in range(30)
+        ] + [{"lastname": "Nameless"}]
+        with CaptureQueriesContext(connection) as queries:
+            data = self._send("post", items).json()
+        self.assertLess(len(queries), 20)
+        self.assertEqual((data["succeeded"], data["failed"]), (30, 1))
+        self.assertIn("firstname", data["results"][30]["errors"])
+
+        cv = CV.objects.get(pk=data["results"][0]["id"])
+        self.assertEqual((cv.owner, cv.bio_preview), (self.user, "Engineer"))
+        self.assertEqual(set(cv.skill_tags.values_list("name", flat=True)), {"python", "kubernetes"})
+        self.assertEqual(filter_cvs_by_skills(CV.objects.all(), ["kubernetes"]).count(), 30)
+
+    def test_update_checks_owners_and_refreshes_derived_fields(self):
+        before = self.own.updated_at
+        data = self._send("patch", [
+            {"id": self.own.pk, "skills": "Rust", "bio": "Mathematician"},
+            {"id": self.foreign.pk, "bio": "Hacked"},
+            {"id": 999999, "bio": "Missing"},
+            {"bio": "No id"},
+            {"id": self.own.pk, "bio": "Duplicate"},
+        ]).json()
+        self.assertEqual([r["status"] for r in data["results"]], [200, 403, 404, 400, 400])
+
+        self.own.refresh_from_db()
+        self.assertEqual((self.own.bio, self.own.bio_preview, self.own.skills_preview), ("Mathematician", "Mathematician", "Rust"))
+        self.assertGreater(self.own.updated_at, before)
+        self.assertEqual(list(self.own.skill_tags.values_list("name", flat=True)), ["rust"])
+        self.assertEqual(CV.objects.get(pk=self.foreign.pk).bio, "")
+
+    def test_delete_only_own_cvs_and_limit_items(self):
+        data = self._send("delete", [self.own.pk, self.foreign.pk]).json()
+        self.assertEqual([r["status"] for r in data["results"]], [204, 403])
+        self.assertFalse(CV.objects.filter(pk=self.own.pk).exists())
+        self.assertTrue(CV.objects.filter(pk=self.foreign.pk).exists())
+
+        with override_settings(CV_BULK_MAX_ITEMS=2):
+            self.assertEqual(self._send("post", [{}, {}, {}]).status_code, 400)
+        self.assertEqual(self._send("post", {"firstname": "Ada"}).status_code, 400)
+
+    def test_delete_invalidates_cached_pages_once_per_call(self):
+        ids = [CV.objects.create(firstname=f"Temp{i}", lastname="Row").pk for i in range(5)]
+        before = get_generation(CV_CACHE_NAMESPACE)
+        self.assertEqual(CVBulkService(batch_size=2).delete(ids), 5)
+        self.assertEqual(get_generation(CV_CACHE_NAMESPACE), before + 1)
+
+        # Nested blocks leave the bump to the outermost one
+        with deferred_bumps(CV_CACHE_NAMESPACE):
+            with deferred_bumps(CV_CACHE_NAMESPACE):
+                self.own.delete()
+            self.assertEqual(get_generation(CV_CACHE_NAMESPACE), before + 1)
+        self.assertEqual(get_generation(CV_CACHE_NAMESPACE), before + 2)
+
+
+class CVExportTests(TestCase):
+    """The export streams every CV as NDJSON or CSV, gzip-compressed on request."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="recruiter", password="secret")
+        for i in range(5):
+            CV.objects.create(firstname=f"Ada{i}", lastname="Lovelace", bio="Line one\nLine two, \"quoted\"", skills="Python")
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_export_is_lazy(self):
+        with self.assertNumQueries(0):
+            chunks = export_cvs(chunk_size=2)
+        with self.assertNumQueries(1):
+            lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual([json.loads(line)["firstname"] for line in lines], [f"Ada{i}" for i in range(5)])
+
+    def test_api_streams_ndjson_and_csv(self):
+        response = self.client.get("/api/cv/export/")
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["bio"], "Line one\nLine two, \"quoted\"")
+
+        response = self.client.get("/api/cv/export/", {"format": "csv"})
+        reader = csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode()))
+        rows = list(reader)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[4]["bio"], "Line one\nLine two, \"quoted\"")
+
+    def test_gzip_on_the_fly_and_command(self):
+        response = self.client.get("/api/cv/export/", HTTP_ACCEPT="text/csv", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        text = gzip.decompress(b"".join(response.streaming_content)).decode()
+        for header in ("gzip;q=0, deflate", "br, *;q=0", "identity"):
+            plain = self.client.get("/api/cv/export/", HTTP_ACCEPT="text/csv", HTTP_ACCEPT_ENCODING=header)
+            self.assertFalse(plain.has_header("Content-Encoding"), header)
+        starred = self.client.get("/api/cv/export/", HTTP_ACCEPT="text/csv", HTTP_ACCEPT_ENCODING="br;q=1, *;q=0.5")
+        self.assertEqual(starred["Content-Encoding"], "gzip")
+        self.assertTrue(text.startswith("id,firstname,lastname"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cvs.ndjson.gz")
+            call_command("export_cvs", "--gzip", "--chunk-size", "2", "--output", path, stdout=io.StringIO())
+            with gzip.open(path, "rt") as f:
+                self.assertEqual(len(f.read().splitlines()), 5)
+
+
+class CVImportTests(TestCase):
+    """import_cvs validates in batches, bulk inserts, then indexes the new id range."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(username="onboarding", password="secret")
+
+    def _write(self, tmp, name, lines):
+        path = os.path.join(tmp, name)
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8", newline="") as f:
+            f.write(lines)
+        return path
+
+    def test_jsonl_import_reports_rejects_and_indexes_skills(self):
+        records = [{"firstname": f"Ada{i}", "lastname": "Lovelace", "skills": "Python, k8s", "bio": "Analyst"} for i in range(7)]
+        lines = "\n".join(json.dumps(r) for r in records) + '\n{"lastname": "Nameless"}\nnot json\n'
+        out, err = io.StringIO(), io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self._write(tmp, "cvs.jsonl", lines)
+            call_command("import_cvs", path, "--batch-size", "3", "--workers", "2", "--owner", "onboarding", stdout=out, stderr=err)
+
+        self.assertIn("Imported 7 of 9 CVs (2 rejected)", out.getvalue())
+        self.assertIn("rows/sec", out.getvalue())
+        self.assertIn("record 8: firstname", err.getvalue())
+        self.assertIn("record 9: __all__: Invalid JSON", err.getvalue())
+        cv = CV.objects.get(firstname="Ada3")
+        self.assertEqual((cv.owner, cv.bio_preview, cv.skills_preview), (self.user, "Analyst", "Python, k8s"))
+        self.assertEqual(filter_cvs_by_skills(CV.objects.all(), ["kubernetes"]).count(), 7)
+        self.assertTrue(search_cvs(CV.objects.all(), "analyst").exists())
+
+    def test_csv_round_trips_an_export(self):
+        CV.objects.create(firstname="Grace", lastname="Hopper", bio="Line one\nLine two, \"quoted\"", skills="COBOL")
+        exported = b"".join(export_cvs("csv", compress=True))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cvs.csv.gz")
+            with open(path, "wb") as f:
+                f.write(exported)
+            call_command("import_cvs", path, "--workers", "1", stdout=io.StringIO(), stderr=io.StringIO())
+        copies = CV.objects.filter(lastname="Hopper").order_by("id")
+        self.assertEqual(copies.count(), 2)
+        self.assertEqual(copies[1].bio, "Line one\nLine two, \"quoted\"")
+        self.assertEqual(list(copies[1].skill_tags.values_list("name", flat=True)), ["cobol"])
@@ -3,7 +3,7 @@ View handlers for separating business logic from view classes.
 """
 from typing import Dict, Any, Optional
 from django.http import HttpRequest
-from ..models import CV
+from ..models import CV, TranslationResult
 from ..enums import Language
 from ..services import TranslationService
 from celery_tasks.services.analysis_service import AnalysisService
@@ -84,7 +84,15 @@ class CVDetailHandler:
             return None
         
         translations, enabled = self.translation_service.translate_cv(cv, lang_enum.value)
+        user = request.user if request.user.is_authenticated else None
+        result, _ = TranslationResult.objects.update_or_create(
+            user=user,
+            cv=cv,
+            language=lang,
+            defaults={'translations': translations, 'is_enabled': enabled},
+        )
         return {
+            'id': result.pk,
             'lang': lang,
             'enabled': enabled,
             **translations
@@ -98,20 +106,34 @@ class CVDetailHandler:
         
         return self.analysis_service.start_analysis(cv_id, question, request.session)
     
+    def handle_checklist_request(self, request: HttpRequest, cv_id: int) -> Optional[Dict[str, str]]:
+        """Handle review checklist request."""
+        return self.analysis_service.start_checklist(
+            cv_id, self.analysis_service.checklist_questions(), request.session, request.user
+        )
+    
     def handle_clear_analysis_request(self, request: HttpRequest) -> Optional[Dict[str, str]]:
         """Handle clear analysis request."""
         return self.analysis_service.clear_analysis(request.session)
     
-    def get_analysis_context(self, request: HttpRequest) -> Dict[str, Any]:
+    def get_analysis_context(self, request: HttpRequest, cv_id: Optional[int] = None) -> Dict[str, Any]:
         """Get analysis context for template."""
-        return self.analysis_service.get_analysis_context(request.session)
+        context = self.analysis_service.get_analysis_context(request.session, request.user, cv_id)
+        context.update(self.analysis_service.get_checklist_context(request.session, request.user, cv_id))
+        context['checklist_questions'] = self.analysis_service.checklist_questions()
+        return context
     
     def get_translation_context(self, request: HttpRequest) -> Dict[str, Any]:
         """Get translation context for template."""
-        context_trans = request.session.pop('cv_translations', None)
-        if not context_trans:
+        translation_id = request.session.pop('cv_translation_id', None)
+        if not translation_id:
+            return {}
+        user = request.user if request.user.is_authenticated else None
+        result = TranslationResult.objects.filter(pk=translation_id, user=user).first()
+        if result is None:
             return {}
         
+        context_trans = {'lang': result.language, 'enabled': result.is_enabled, **result.translations}
         return {
             'translated': context_trans,
             'translation_warning': context_trans.get('warning', '') if not context_trans.get('enabled') else ''
@@ -1,20 +1,47 @@
-from django.http import HttpResponseRedirect
-from typing import Optional
+import json
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from datetime import datetime
+from typing import Optional, Tuple
+from django.views import View
 from django.views.generic import DetailView, ListView, FormView, RedirectView, TemplateView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth import login, logout, authenticate, get_user_model
 from django import forms
-from django.urls import reverse_lazy
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
+from django.middleware.csrf import get_token
 
-from ..models import CV
+from ..models import AnalysisResult, BulkAnalysisJob, CV
 from ..services import CVService
-from ..enums import Language
-from ..filters.cv_filters import filter_cvs_by_query
-from ..forms import CVForm
+from ..enums import Language, SearchMode
+from ..common.conditional import make_etag, not_modified, set_validators
+from ..common.keyset import InvalidCursor
+from ..common.search import highlight_html
+from ..common.skills import normalize_skill_filter
+from ..forms import BulkAnalysisForm, CVForm
 from .view_handlers import CVDetailHandler
 
 
+def event_stream_response(channel: str) -> StreamingHttpResponse:
+    """Relay a stream broker channel to the client as Server-Sent Events."""
+    from celery_tasks.services.stream_service import get_stream_broker
+
+    broker = get_stream_broker()
+    timeout = getattr(settings, 'ANALYSIS_STREAM_TIMEOUT', 120)
+
+    def event_stream():
+        for event in broker.subscribe(channel, timeout=timeout):
+            yield f"id: {event.seq}\nevent: {event.event}\ndata: {json.dumps(event.data)}\n\n"
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 class HomeView(TemplateView):
     template_name = "main/home.html"
 
@@ -75,7 +102,49 @@ class RegisterView(FormView):
         return "/cvs/"
 
 
-class CVListView(LoginRequiredMixin, ListView):
+class ConditionalPageMixin:
+    """
+    Answer repeat GETs with 304 Not Modified when the page's data has not changed.
+
+    ``get_validators()`` returns a version of the page's data and its Last-Modified from a
+    cheap query, checked before the page is fetched or rendered. The ETag also covers the
+    viewer, since pages show owner links and embed the CSRF token. Pages carrying one-off
+    state (flash messages, running tasks kept in the session) are always rendered in full.
+    """
+
+    session_state_keys: Tuple[str, ...] = ()
+
+    def get_validators(self) -> Optional[Tuple[str, Optional[datetime]]]:
+        raise NotImplementedError
+
+    def _validators(self) -> Optional[Tuple[str, Optional[datetime]]]:
+        request = self.request
+        if request.method not in ("GET", "HEAD") or not getattr(settings, "CONDITIONAL_GET_ENABLED", True):
+            return None
+        if len(messages.get_messages(request)) or any(key in request.session for key in self.session_state_keys):
+            return None
+        validators = self.get_validators()
+        if validators is None:
+            return None
+        version, last_modified = validators
+        user = request.user
+        # Issue the CSRF secret now if the page would, so the ETag is stable from the first visit
+        get_token(request)
+        return make_etag(version, user.pk, user.is_superuser, request.META.get("CSRF_COOKIE", "")), last_modified
+
+    def get(self, request, *args, **kwargs):
+        validators = self._validators()
+        if validators is not None:
+            response = not_modified(request, *validators)
+            if response is not None:
+                return response
+        response = super().get(request, *args, **kwargs)
+        if validators is not None:
+            set_validators(response, *validators)
+        return response
+
+
+class CVListView(LoginRequiredMixin, ConditionalPageMixin, ListView):
     model = CV
     template_name = "main/cv_list.html"
     context_object_name = "cvs"
@@ -91,37 +160,107 @@ class CVListView(LoginRequiredMixin, ListView):
             self._service = CVService()
         return self._service
 
+    def get_validators(self):
+        params = self.request.GET
+        count, updated = self.service.list_fingerprint(params.get("q", ""), params.get("mode", SearchMode.TEXT.value), params.getlist("skill"))
+        # The URL already distinguishes sort, search and cursor
+        return make_etag("cv-list", count, updated), updated
+
     def get_queryset(self):
-        # Get sorting parameters from URL
-        sort_by = self.request.GET.get("sort", "created_at")
-        order = self.request.GET.get("order", "desc")
-        
-        # Get sorted queryset
-        queryset = self.service.list_cvs_sorted(sort_by, order)
-        
-        # Apply search filter
-        query = self.request.GET.get("q", "")
-        return filter_cvs_by_query(queryset, query)
+        # Sorting, search and page position from the URL
+        params = self.request.GET
+        options = {
+            "sort_by": params.get("sort", "created_at"),
+            "order": params.get("order", "desc"),
+            "query": params.get("q", ""),
+            "mode": params.get("mode", SearchMode.TEXT.value),
+            "page_size": settings.CV_LIST_PAGE_SIZE,
+            # Best matches first unless a sort was picked explicitly
+            "order_by_rank": "sort" not in params,
+            "skills": params.getlist("skill"),
+        }
+        try:
+            self.page = self.service.list_page(cursor=params.get("cursor"), **options)
+        except InvalidCursor:
+            # Stale link from before the sort changed: start from the first page
+            self.page = self.service.list_page(**options)
+        return self.page.items
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        page = self.page
+        context["next_page_url"] = self._cursor_url(page.next_cursor)
+        context["previous_page_url"] = self._cursor_url(page.previous_cursor)
+        for cv in context["cvs"]:
+            cv.search_highlight = highlight_html(getattr(cv, "search_snippet", None))
         context["q"] = self.request.GET.get("q", "").strip()
+        context["mode"] = self.request.GET.get("mode", SearchMode.TEXT.value)
+        context["skill_facets"], context["selected_skills"] = self._skill_facets()
         context["sort_by"] = self.request.GET.get("sort", "created_at")
         context["order"] = self.request.GET.get("order", "desc")
         return context
 
-
-class CVDetailView(LoginRequiredMixin, DetailView):
+    def _skill_facets(self):
+        """Facet entries with links that add or remove the skill, keeping the other filters."""
+        selected = normalize_skill_filter(self.request.GET.getlist("skill"))
+        facets = self.service.skill_facets(
+            self.request.GET.get("q", ""), self.request.GET.get("mode", SearchMode.TEXT.value), selected
+        )
+        for facet in facets:
+            facet["selected"] = facet["name"] in selected
+        labels = {facet["name"]: facet["label"] for facet in facets}
+        # Selected skills stay listed even when the filter leaves no other facets
+        selected_facets = [
+            {"name": name, "label": labels.get(name, name), "url": self._skills_url([s for s in selected if s != name])}
+            for name in selected
+        ]
+        for facet in facets:
+            facet["url"] = self._skills_url(selected if facet["selected"] else selected + [facet["name"]])
+        return [f for f in facets if not f["selected"]], selected_facets
+
+    def _skills_url(self, skills) -> str:
+        params = self.request.GET.copy()
+        params.pop("cursor", None)
+        params.setlist("skill", skills)
+        return f"?{params.urlencode()}"
+
+    def _cursor_url(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params["cursor"] = cursor
+        return f"?{params.urlencode()}"
+
+
+class CVDetailView(LoginRequiredMixin, ConditionalPageMixin, DetailView):
     """View for displaying CV details with analysis and translation capabilities."""
     
     model = CV
     template_name = "main/cv_detail.html"
     context_object_name = "cv"
+    # Running or finished PDF, translation and analysis tasks are shown from the session.
+    # A completed analysis is kept there for good, so it is folded into the ETag instead
+    session_state_keys = ('pdf_task_id', 'cv_translation_id', 'analysis_task_id', 'analysis_checklist')
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.handler = CVDetailHandler()
 
+    def get_validators(self):
+        pk = self.kwargs["pk"]
+        updated = CVService().last_modified(pk)
+        if updated is None:
+            return None
+        parts = ["cv", pk, updated]
+        result_id = self.request.session.get('analysis_result_id')
+        if result_id:
+            record = AnalysisResult.objects.filter(pk=result_id, user=self.request.user).only('cv_id', 'updated_at').first()
+            # Only the analysis of this CV is shown on its page
+            if record is not None and record.cv_id == pk:
+                parts += [record.pk, record.updated_at]
+                updated = max(updated, record.updated_at)
+        return make_etag(*parts), updated
+
     def post(self, request, *args, **kwargs):
         """Handle POST requests for various CV operations."""
         cv = self.get_object()
@@ -134,6 +273,7 @@ class CVDetailView(LoginRequiredMixin, DetailView):
         self._handle_email_request(request, cv.pk)
         self._handle_translation_request(request, cv)
         self._handle_analysis_request(request, cv.pk)
+        self._handle_checklist_request(request, cv.pk)
         self._handle_clear_analysis_request(request)
         
         return self.get(request, *args, **kwargs)
@@ -167,7 +307,8 @@ class CVDetailView(LoginRequiredMixin, DetailView):
         if 'lang' in request.POST:
             result = self.handler.handle_translation_request(request, cv)
             if result:
-                request.session['cv_translations'] = result
+                # Only a pointer goes into the session; the translation lives in TranslationResult
+                request.session['cv_translation_id'] = result['id']
     
     def _handle_analysis_request(self, request, cv_id: int) -> None:
         """Handle analysis request."""
@@ -176,6 +317,13 @@ class CVDetailView(LoginRequiredMixin, DetailView):
             if result and 'error' in result:
                 messages.error(request, result['error'])
     
+    def _handle_checklist_request(self, request, cv_id: int) -> None:
+        """Handle review checklist request."""
+        if 'start_checklist' in request.POST:
+            result = self.handler.handle_checklist_request(request, cv_id)
+            if result and 'error' in result:
+                messages.error(request, result['error'])
+    
     def _handle_clear_analysis_request(self, request) -> None:
         """Handle clear analysis request."""
         if 'clear_analysis' in request.POST:
@@ -189,7 +337,7 @@ class CVDetailView(LoginRequiredMixin, DetailView):
         context.update(self.handler.get_translation_context(self.request))
         
         # Add analysis context
-        context.update(self.handler.get_analysis_context(self.request))
+        context.update(self.handler.get_analysis_context(self.request, self.object.pk))
         
         # Add PDF progress context
         context.update(self._get_pdf_progress_context())
@@ -258,6 +406,112 @@ class CVDetailView(LoginRequiredMixin, DetailView):
 
 
 
+class AnalysisStreamView(LoginRequiredMixin, View):
+    """Relay the running analysis of the current session to the browser as Server-Sent Events."""
+
+    def get(self, request, *args, **kwargs):
+        from celery_tasks.services.stream_service import analysis_channel
+
+        task_id = request.session.get('analysis_task_id')
+        # The session runs one analysis at a time; other CV pages must not show it
+        if not task_id or request.session.get('analysis_cv_id') != kwargs['pk']:
+            # 204 tells EventSource to stop reconnecting
+            return HttpResponse(status=204)
+        return event_stream_response(analysis_channel(task_id))
+
+
+class BulkAnalysisJobMixin:
+    """Restrict bulk analysis jobs to their owner (or superusers)."""
+
+    def get_queryset(self):
+        if self.request.user.is_superuser:
+            return BulkAnalysisJob.objects.all()
+        return BulkAnalysisJob.objects.filter(owner=self.request.user)
+
+
+class BulkAnalysisCreateView(LoginRequiredMixin, FormView):
+    """Ask one question about every CV matching a search filter."""
+    template_name = "main/bulk_analysis_form.html"
+    form_class = BulkAnalysisForm
+
+    def get_initial(self):
+        return {
+            'query': self.request.GET.get('q', '').strip(),
+            'concurrency': getattr(settings, 'BULK_ANALYSIS_CONCURRENCY', 4),
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['jobs'] = BulkAnalysisJobMixin.get_queryset(self)[:10]
+        return context
+
+    def form_valid(self, form):
+        from celery_tasks.services.bulk_analysis_service import BulkAnalysisService
+
+        try:
+            job = BulkAnalysisService().create_job(
+                self.request.user,
+                form.cleaned_data['question'],
+                form.cleaned_data['query'],
+                form.cleaned_data['concurrency'],
+            )
+        except Exception as e:
+            messages.error(self.request, f"Failed to start bulk analysis: {e}")
+            return self.form_invalid(form)
+        messages.success(self.request, f"Bulk analysis started for {job.items.count()} CVs.")
+        return HttpResponseRedirect(reverse('bulk_analysis_detail', args=[job.pk]))
+
+
+class BulkAnalysisDetailView(LoginRequiredMixin, BulkAnalysisJobMixin, DetailView):
+    """Results table of a bulk analysis job, filled in live while it runs."""
+    template_name = "main/bulk_analysis_detail.html"
+    context_object_name = "job"
+
+    def get_context_data(self, **kwargs):
+        from celery_tasks.services.bulk_analysis_service import BulkAnalysisService
+
+        context = super().get_context_data(**kwargs)
+        items = list(
+            self.object.items.select_related('cv').only(
+                'status', 'analysis', 'error', 'completed_at', 'cv__firstname', 'cv__lastname'
+            )
+        )
+        context['items'] = items
+        context['completed_count'] = sum(1 for item in items if item.status in ('completed', 'failed'))
+        context['failed_count'] = sum(1 for item in items if item.status == 'failed')
+        context['streaming'] = self.object.status != BulkAnalysisJob.STATUS_COMPLETED
+        context['can_resume'] = not BulkAnalysisService().is_active(self.object) and (
+            self.object.status != BulkAnalysisJob.STATUS_COMPLETED or context['failed_count'] > 0
+        )
+        return context
+
+    def post(self, request, *args, **kwargs):
+        from celery_tasks.services.bulk_analysis_service import BulkAnalysisService
+
+        job = self.get_object()
+        if 'resume' in request.POST:
+            try:
+                if BulkAnalysisService().resume_job(job):
+                    messages.success(request, "Bulk analysis resumed.")
+                else:
+                    messages.info(request, "Nothing to resume: the job is still running or has no failed items.")
+            except Exception as e:
+                messages.error(request, f"Failed to resume bulk analysis: {e}")
+        return HttpResponseRedirect(request.path)
+
+
+class BulkAnalysisStreamView(LoginRequiredMixin, BulkAnalysisJobMixin, View):
+    """Relay bulk analysis results to the results table as Server-Sent Events."""
+
+    def get(self, request, *args, **kwargs):
+        from celery_tasks.services.stream_service import bulk_analysis_channel
+
+        job = get_object_or_404(self.get_queryset(), pk=kwargs['pk'])
+        if job.status == BulkAnalysisJob.STATUS_COMPLETED:
+            return HttpResponse(status=204)
+        return event_stream_response(bulk_analysis_channel(job.pk))
+
+
 class CVCreateView(LoginRequiredMixin, CreateView):
     """Create a new CV."""
     model = CV
@@ -13,6 +13,8 @@ python manage.py collectstatic --noinput
 exec gunicorn CVProject.wsgi:application \
     --bind 0.0.0.0:${PORT:-8000} \
     --workers 2 \
+    --worker-class gthread \
+    --threads 8 \
     --timeout 120 \
     --keep-alive 2 \
     --max-requests 1000 \